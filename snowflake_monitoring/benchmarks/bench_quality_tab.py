@@ -0,0 +1,93 @@
+"""Render-time benchmark for the Quality tab as the number of models grows.
+
+Compares the vectorized freshness status column with the previous row-wise
+Styler.apply highlighting. Run from snowflake_monitoring/:
+
+    python benchmarks/bench_quality_tab.py --models 100 1000 10000 50000
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def make_quality_data(n_models, n_sources=20, seed=0):
+    """Synthetic freshness data for n_models models spread over n_sources source systems."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'Data Model': [f'model_{i}' for i in range(n_models)],
+        'Last Refreshed': datetime.now() - pd.to_timedelta(rng.integers(1, 48 * 60, n_models), unit='min'),
+        'Source System': [f'source_{i}' for i in rng.integers(0, n_sources, n_models)],
+    })
+
+
+def render_vectorized(quality_data, root):
+    import sys
+    sys.path.insert(0, root)
+    from tabs.quality_tab import display_quality_tab
+    display_quality_tab(quality_data, "BENCHMARK")
+
+
+def render_row_wise(quality_data, root):
+    # The Quality tab before the status column: one Python call and CSS list per row
+    from datetime import datetime
+    import pandas as pd
+    import streamlit as st
+
+    quality_data['Last Refreshed'] = pd.to_datetime(quality_data['Last Refreshed'])
+    quality_data['Hours Since Last Refresh'] = ((datetime.now() - quality_data['Last Refreshed']).dt.total_seconds() / 3600).round(1)
+
+    def highlight_stale(row):
+        hours = row['Hours Since Last Refresh']
+        if hours > 24:
+            return ['background-color: #FFCCCB'] * len(row)
+        elif hours > 12:
+            return ['background-color: #FFFFE0'] * len(row)
+        return [''] * len(row)
+
+    st.dataframe(
+        quality_data[['Data Model', 'Last Refreshed', 'Hours Since Last Refresh', 'Source System']]
+        .sort_values(by='Hours Since Last Refresh', ascending=False)
+        .style.apply(highlight_stale, axis=1),
+        height=350
+    )
+
+
+def time_render(render, quality_data):
+    """Runs the renderer headless; returns (seconds, serialized dataframe bytes)."""
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_function(render, args=(quality_data, ROOT), default_timeout=600)
+    start = time.perf_counter()
+    at.run()
+    elapsed = time.perf_counter() - start
+    if at.exception:
+        raise RuntimeError(at.exception[0].value)
+    return elapsed, sum(df.proto.ByteSize() for df in at.dataframe)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--models", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--skip-row-wise-above", type=int, default=20000,
+                        help="Skip the row-wise Styler renderer for larger model counts (it gets very slow)")
+    args = parser.parse_args(argv)
+
+    print(f"{'models':>8} {'renderer':>11} {'seconds':>9} {'payload KB':>11}")
+    for n_models in args.models:
+        renderers = [('vectorized', render_vectorized)]
+        if n_models <= args.skip_row_wise_above:
+            renderers.append(('row-wise', render_row_wise))
+        for name, render in renderers:
+            seconds, payload = time_render(render, make_quality_data(n_models))
+            print(f"{n_models:>8} {name:>11} {seconds:>9.3f} {payload / 1024:>11.1f}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,264 @@
+"""Benchmarks every display_*_tab function on synthetic data of growing size.
+
+Each tab is rendered headless with Streamlit's AppTest. Every (tab, rows)
+pair records wall time, peak Python memory (tracemalloc, measured in a
+separate run so it doesn't inflate the timing) and the serialized size of
+the rendered elements. Results are appended as JSON lines tagged with the
+git revision, so runs from different versions can be compared. Run from
+snowflake_monitoring/:
+
+    python benchmarks/bench_tabs.py --rows 1000 100000 --output bench.jsonl
+    python benchmarks/bench_tabs.py --rows 1000 100000 --compare bench.jsonl
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from dashboard_data import (  # noqa: E402
+    compute_cost_daily,
+    compute_cost_monthly,
+    compute_recent_queries,
+    compute_top_models,
+    compute_usage_by_model,
+    compute_usage_daily,
+    compute_usage_totals,
+)
+from recommendations import compute_recommendations  # noqa: E402
+
+TABS = ['cost', 'usage', 'governance', 'performance', 'quality', 'summary']
+DEFAULT_ROWS = [1000, 10000, 100000]
+
+
+# --- Synthetic Data ---
+# Same columns as the data sources return, vectorized so 10M rows stay practical.
+
+def make_cost_data(rows, rng):
+    return pd.DataFrame({
+        'Data Model': pd.Categorical.from_codes(rng.integers(0, max(rows // 20, 1), rows), [f'model_{i}' for i in range(max(rows // 20, 1))]).astype(str),
+        'Materialization Cost (Credits)': rng.uniform(5, 50, rows).round(2),
+        'Last Run': datetime.now() - pd.to_timedelta(rng.integers(0, 24 * 365, rows), unit='h'),
+    })
+
+
+def make_usage_data(rows, rng):
+    return pd.DataFrame({
+        'Timestamp': datetime.now() - pd.to_timedelta(rng.integers(1, 60 * 24 * 7, rows), unit='min'),
+        'User': pd.Categorical.from_codes(rng.integers(0, 500, rows), [f'user_{i}' for i in range(500)]).astype(str),
+        'Data Model Queried': pd.Categorical.from_codes(rng.integers(0, 1000, rows), [f'model_{i}' for i in range(1000)]).astype(str),
+        'Query Type': pd.Categorical.from_codes(rng.integers(0, 4, rows), ['SELECT', 'INSERT', 'UPDATE', 'DELETE']).astype(str),
+    })
+
+
+def make_governance_data(rows, rng):
+    return pd.DataFrame({
+        'Data Model': [f'model_{i}' for i in range(rows)],
+        'Has Documentation': rng.random(rows) < 0.6,
+        'Owner': [f'owner_{i}' for i in rng.integers(0, 200, rows)],
+    })
+
+
+def make_performance_data(rows, rng):
+    return pd.DataFrame({
+        'Data Model': [f'model_{i}' for i in range(rows)],
+        'Poor Partition Pruning': rng.random(rows) < 0.3,
+        'Disk Spilling Occurrences (Last 24h)': rng.integers(0, 5, rows),
+        'Avg Query Duration (s)': rng.uniform(1, 60, rows).round(1),
+    })
+
+
+def make_quality_data(rows, rng):
+    return pd.DataFrame({
+        'Data Model': [f'model_{i}' for i in range(rows)],
+        'Last Refreshed': datetime.now() - pd.to_timedelta(rng.integers(1, 48 * 60, rows), unit='min'),
+        'Source System': [f'source_{i}' for i in rng.integers(0, 20, rows)],
+    })
+
+
+def make_usage_inputs(rows, rng):
+    usage_data = make_usage_data(rows, rng)
+    return {
+        'usage_totals': compute_usage_totals(usage_data),
+        'queries_by_day': compute_usage_daily(usage_data),
+        'top_models': compute_top_models(usage_data),
+        'recent_queries': compute_recent_queries(usage_data),
+    }
+
+
+def make_inputs(tab, rows, seed=0):
+    """Returns the keyword arguments for the tab's display function."""
+    rng = np.random.default_rng(seed)
+    if tab == 'cost':
+        cost_data = make_cost_data(rows, rng)
+        return {'cost_monthly': compute_cost_monthly(cost_data), 'cost_daily': compute_cost_daily(cost_data)}
+    if tab == 'usage':
+        return make_usage_inputs(rows, rng)
+    if tab == 'governance':
+        return {'governance_data': make_governance_data(rows, rng)}
+    if tab == 'performance':
+        return {'performance_data': make_performance_data(rows, rng)}
+    if tab == 'quality':
+        return {'quality_data': make_quality_data(rows, rng)}
+    cost_data = make_cost_data(rows, rng)
+    usage_data = make_usage_data(rows, rng)
+    governance_data = make_governance_data(rows, rng)
+    quality_data = make_quality_data(rows, rng)
+    recommendations = compute_recommendations(
+        compute_cost_daily(cost_data), compute_usage_by_model(usage_data), governance_data,
+        make_performance_data(rows, rng), quality_data,
+    )
+    return {
+        'cost_monthly': compute_cost_monthly(cost_data),
+        'usage_totals': compute_usage_totals(usage_data),
+        'governance_data': governance_data,
+        'quality_data': quality_data,
+        'top_models': compute_top_models(usage_data),
+        'recommendations': recommendations,
+    }
+
+
+# --- Headless Rendering ---
+
+def render_tab(tab, inputs, root, trace_memory):
+    # Runs as a standalone AppTest script, so it does its own imports
+    import sys
+    import time
+    import tracemalloc
+
+    import streamlit as st
+
+    sys.path.insert(0, root)
+    from tabs.cost_tab import display_cost_tab
+    from tabs.usage_tab import display_usage_tab
+    from tabs.governance_tab import display_governance_tab
+    from tabs.performance_tab import display_performance_tab
+    from tabs.quality_tab import display_quality_tab
+    from tabs.summary_tab import display_summary_tab
+
+    display = {
+        'cost': display_cost_tab,
+        'usage': display_usage_tab,
+        'governance': display_governance_tab,
+        'performance': display_performance_tab,
+        'quality': display_quality_tab,
+        'summary': display_summary_tab,
+    }[tab]
+    if tab == 'performance':
+        # The tab reads through a pager; paging the frame in memory stands in for the warehouse
+        from tabs.pagination import FramePager
+        inputs = {'pager': FramePager(inputs['performance_data'])}
+
+    if trace_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    display(**inputs, selected_schema="BENCHMARK")
+    seconds = time.perf_counter() - start
+    peak_bytes = tracemalloc.get_traced_memory()[1] if trace_memory else None
+    if trace_memory:
+        tracemalloc.stop()
+    st.session_state['_bench'] = {'seconds': seconds, 'peak_bytes': peak_bytes}
+
+
+def payload_bytes(node):
+    """Serialized size of every element proto under a node of the AppTest tree."""
+    proto = getattr(node, 'proto', None)
+    size = proto.ByteSize() if proto is not None else 0
+    return size + sum(payload_bytes(child) for child in getattr(node, 'children', {}).values())
+
+
+def run_once(tab, inputs, trace_memory):
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_function(render_tab, args=(tab, inputs, ROOT, trace_memory), default_timeout=3600)
+    at.run()
+    if at.exception:
+        raise RuntimeError(at.exception[0].value)
+    return at.session_state['_bench'], payload_bytes(at._tree)
+
+
+def benchmark(tab, rows, seed=0):
+    inputs = make_inputs(tab, rows, seed)
+    record = {'tab': tab, 'rows': rows}
+    try:
+        # Warm-up so module imports and first-use setup aren't counted
+        run_once(tab, make_inputs(tab, 10, seed), trace_memory=False)
+        timing, payload = run_once(tab, inputs, trace_memory=False)
+        memory, _ = run_once(tab, inputs, trace_memory=True)
+    except Exception as e:
+        record['error'] = str(e).splitlines()[0]
+        return record
+    record.update({
+        'seconds': round(timing['seconds'], 4),
+        'peak_mb': round(memory['peak_bytes'] / 2**20, 2),
+        'payload_kb': round(payload / 1024, 1),
+    })
+    return record
+
+
+# --- Results ---
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "describe", "--always", "--dirty"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def load_results(path):
+    """Returns the latest record per (tab, rows) from a JSON-lines results file."""
+    latest = {}
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                latest[(record['tab'], record['rows'])] = record
+    return latest
+
+
+def format_change(new, old, field):
+    if field not in new or field not in old or not old[field]:
+        return "-"
+    return f"{new[field] / old[field]:.2f}x"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tabs", nargs="+", choices=TABS, default=TABS)
+    parser.add_argument("--rows", type=int, nargs="+", default=DEFAULT_ROWS,
+                        help="Input sizes to benchmark (e.g. 1000 100000 10000000)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Append JSON-lines results to this file")
+    parser.add_argument("--compare", help="Earlier results file to compare against")
+    args = parser.parse_args(argv)
+
+    baseline = load_results(args.compare) if args.compare else {}
+    revision = git_revision()
+    run_at = datetime.now().isoformat(timespec='seconds')
+
+    print(f"{'tab':<12} {'rows':>10} {'seconds':>9} {'peak MB':>9} {'payload KB':>11}  vs baseline (time/mem/payload)")
+    for tab in args.tabs:
+        for rows in args.rows:
+            record = {'revision': revision, 'run_at': run_at, **benchmark(tab, rows, args.seed)}
+            if args.output:
+                with open(args.output, "a") as f:
+                    f.write(json.dumps(record) + "\n")
+            if 'error' in record:
+                print(f"{tab:<12} {rows:>10} error: {record['error']}")
+                continue
+            old = baseline.get((tab, rows), {})
+            changes = "/".join(format_change(record, old, field) for field in ['seconds', 'peak_mb', 'payload_kb'])
+            print(f"{tab:<12} {rows:>10} {record['seconds']:>9.3f} {record['peak_mb']:>9.2f} {record['payload_kb']:>11.1f}  {changes}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
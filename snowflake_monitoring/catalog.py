@@ -0,0 +1,272 @@
+import bisect
+import difflib
+import json
+import os
+import tempfile
+import threading
+import time
+from datetime import timedelta
+from functools import partial
+
+import pandas as pd
+
+# Directory of the persisted index; defaults to a folder in the system temp dir
+CATALOG_DIR_ENV = "SNOWFLAKE_MONITORING_CATALOG_DIR"
+
+CATALOG_COLUMNS = ['Database', 'Schema', 'Data Model', 'Comment', 'Owner', 'Last Altered', 'Source System']
+CATALOG_KEY = ['Database', 'Schema', 'Data Model']
+# Schema names repeat across databases (PUBLIC, RAW, ...), so schemas are
+# identified by their qualified DATABASE.SCHEMA name
+QUALIFIED_SCHEMA = 'Qualified Schema'
+
+# Incremental refreshes more often than this are skipped
+DEFAULT_MIN_REFRESH_INTERVAL = 15 * 60
+# A full reload this often catches anything incremental refreshes missed
+DEFAULT_FULL_REFRESH_INTERVAL = timedelta(days=1)
+# ACCOUNT_USAGE views lag behind by up to a couple of hours, so incremental
+# refreshes re-read this much before the watermark; upserts make that harmless
+CHANGE_OVERLAP = timedelta(hours=3)
+
+# Fuzzy matches must be at least this similar (difflib ratio)
+FUZZY_CUTOFF = 0.6
+
+
+def qualified_name(database, schema):
+    return f"{database}.{schema}"
+
+
+def split_qualified(name):
+    """Splits 'DATABASE.SCHEMA' into (database, schema)."""
+    database, _, schema = name.partition('.')
+    if not database or not schema:
+        raise ValueError(f"Expected a DATABASE.SCHEMA name, got {name!r}")
+    return database, schema
+
+
+class CatalogIndex:
+    """Local index of every table in the account, with its comment, owner and last change.
+
+    The index is persisted as <root>/tables.parquet plus a state.json holding
+    the change watermark. After the first full load, a refresh only fetches
+    tables altered or dropped since the watermark. Schemas are keyed on their
+    qualified DATABASE.SCHEMA name; schema lists and searches are served from
+    sorted in-memory keys, and the governance and quality datasets for a
+    schema are lookups into the index.
+    """
+
+    def __init__(self, root, min_refresh_interval=DEFAULT_MIN_REFRESH_INTERVAL,
+                 full_refresh_interval=DEFAULT_FULL_REFRESH_INTERVAL):
+        self.root = root
+        self.min_refresh_interval = min_refresh_interval
+        self.full_refresh_interval = full_refresh_interval
+        self._lock = threading.Lock()
+        self._last_refresh = None
+        os.makedirs(root, exist_ok=True)
+        self._state = self._read_state()
+        self._set_tables(self._read_tables())
+
+    # --- Persistence ---
+
+    def _tables_path(self):
+        return os.path.join(self.root, "tables.parquet")
+
+    def _state_path(self):
+        return os.path.join(self.root, "state.json")
+
+    def _read_tables(self):
+        tables_path = self._tables_path()
+        return pd.read_parquet(tables_path) if os.path.exists(tables_path) else pd.DataFrame(columns=CATALOG_COLUMNS)
+
+    def _read_state(self):
+        try:
+            with open(self._state_path()) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def _save(self, tables, state):
+        tmp_path = self._tables_path() + ".tmp"
+        tables.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, self._tables_path())
+        with open(self._state_path(), "w") as f:
+            json.dump(state, f)
+
+    def _set_tables(self, tables):
+        """Swaps in a new index; readers keep whichever version they already hold."""
+        qualified = (tables['Database'].astype(str) + '.' + tables['Schema'].astype(str)).rename(QUALIFIED_SCHEMA)
+        by_schema = tables.set_index(qualified).sort_index()
+        names = sorted(by_schema.index.unique(), key=str.lower)
+        # Bare schema names, sorted with the position of their qualified name,
+        # so typing a schema name finds it in every database
+        bare = sorted((split_qualified(name)[1].lower(), i) for i, name in enumerate(names))
+        self._tables = tables
+        self._by_schema = by_schema
+        # One attribute, so a concurrent search never pairs old names with new keys
+        self._schema_index = (names, [name.lower() for name in names], bare)
+
+    @property
+    def refreshed_at(self):
+        return self._state.get('refreshed_at')
+
+    # --- Refresh ---
+
+    def refresh(self, source, force=False, throttle=True):
+        """Brings the index up to date with `source`. Returns the number of changed rows fetched.
+
+        force reloads every table; throttle=False only skips the
+        min_refresh_interval wait, so the refresh is still incremental.
+        """
+        with self._lock:
+            now = pd.Timestamp.now()
+            if throttle and not force and self._last_refresh is not None and time.monotonic() - self._last_refresh < self.min_refresh_interval:
+                return 0
+
+            full_refresh_at = self._state.get('full_refresh_at')
+            watermark = self._state.get('watermark')
+            if force or watermark is None or full_refresh_at is None or \
+                    now - pd.Timestamp(full_refresh_at) > self.full_refresh_interval:
+                changes = source.fetch_catalog()
+                tables = changes
+                state = {'full_refresh_at': now.isoformat()}
+            else:
+                changes = source.fetch_catalog(since=pd.Timestamp(watermark).to_pydatetime() - CHANGE_OVERLAP)
+                combined = pd.concat([self._tables, changes], ignore_index=True)
+                tables = combined.drop_duplicates(CATALOG_KEY, keep='last')
+                state = {'full_refresh_at': full_refresh_at}
+            if 'Deleted' in tables.columns:
+                tables = tables[tables['Deleted'].isna()].drop(columns='Deleted')
+            tables = tables[CATALOG_COLUMNS].sort_values(CATALOG_KEY).reset_index(drop=True)
+
+            change_times = [changes[column].max() for column in ['Last Altered', 'Deleted'] if column in changes]
+            change_times = [value for value in change_times if pd.notna(value)]
+            latest = max(change_times) if change_times else None
+            if watermark is not None and (latest is None or latest < pd.Timestamp(watermark)):
+                latest = pd.Timestamp(watermark)
+            state.update({'watermark': None if latest is None else latest.isoformat(), 'refreshed_at': now.isoformat()})
+
+            self._save(tables, state)
+            self._state = state
+            self._set_tables(tables)
+            self._last_refresh = time.monotonic()
+            return len(changes)
+
+    def reload(self):
+        """Picks up an index another process (refresh.py) has saved since. Returns True if it changed.
+
+        Only state.json is read unless it changed; it is written after the
+        tables, so a new state always comes with its tables.
+        """
+        with self._lock:
+            state = self._read_state()
+            if state == self._state:
+                return False
+            self._set_tables(self._read_tables())
+            self._state = state
+            return True
+
+    # --- Discovery ---
+
+    def is_empty(self):
+        return self._tables.empty
+
+    def databases(self):
+        return sorted(self._tables['Database'].unique())
+
+    def schemas(self):
+        return list(self._schema_index[0])
+
+    def search(self, text, limit=50):
+        """Returns up to `limit` qualified schema names matching `text`.
+
+        Prefix matches come first (binary searches over the sorted qualified
+        names, then over the bare schema names), then names containing the
+        text. Only if none of these finds anything are close fuzzy matches
+        tried, so typos still find their schema.
+        """
+        names, keys, bare = self._schema_index
+        text = text.strip().lower()
+        if not text:
+            return names[:limit]
+
+        # A dict keeps the order matches were found in, without duplicates
+        matches = {}
+        for i in range(bisect.bisect_left(keys, text), len(keys)):
+            if len(matches) >= limit or not keys[i].startswith(text):
+                break
+            matches[i] = None
+        for schema, i in bare[bisect.bisect_left(bare, (text,)):]:
+            if len(matches) >= limit or not schema.startswith(text):
+                break
+            matches.setdefault(i)
+        for i, key in enumerate(keys):
+            if len(matches) >= limit:
+                break
+            if text in key:
+                matches.setdefault(i)
+        if not matches:
+            bare_keys = [schema for schema, _ in bare]
+            close = set(difflib.get_close_matches(text, keys + bare_keys, n=limit, cutoff=FUZZY_CUTOFF))
+            matches = dict.fromkeys(i for i, key in enumerate(keys) if key in close or key.partition('.')[2] in close)
+        return [names[i] for i in list(matches)[:limit]]
+
+    # --- Per-Table Metadata ---
+
+    def tables(self, schemas):
+        """Index rows for the given qualified schemas, with a QUALIFIED_SCHEMA column."""
+        present = [schema for schema in schemas if schema in self._by_schema.index]
+        if not present:
+            return pd.DataFrame(columns=[QUALIFIED_SCHEMA, *CATALOG_COLUMNS])
+        return self._by_schema.loc[present].reset_index()
+
+    def governance(self, selected_schema):
+        """Same columns as the governance dataset query."""
+        tables = self.tables([selected_schema]).sort_values('Data Model')
+        return pd.DataFrame({
+            'Data Model': tables['Data Model'],
+            'Has Documentation': tables['Comment'].notna(),
+            'Owner': tables['Owner'],
+        }).reset_index(drop=True)
+
+    def quality(self, selected_schema):
+        """Same columns as the quality dataset query."""
+        tables = self.tables([selected_schema]).sort_values('Data Model')
+        tables = tables[tables['Last Altered'].notna()]
+        return pd.DataFrame({
+            'Data Model': tables['Data Model'],
+            'Last Refreshed': pd.to_datetime(tables['Last Altered']),
+            'Source System': tables['Source System'],
+        }).reset_index(drop=True)
+
+    def compare_tables(self, schemas):
+        """Same columns as the compare_tables comparison query."""
+        tables = self.tables(schemas)
+        return pd.DataFrame({
+            'Schema': tables[QUALIFIED_SCHEMA],
+            'Data Model': tables['Data Model'],
+            'Has Documentation': tables['Comment'].notna(),
+            'Last Refreshed': pd.to_datetime(tables['Last Altered']),
+            'Source System': tables['Source System'],
+        }).reset_index(drop=True)
+
+    def _load(self, source, lookup, key):
+        if source is not None:
+            self.refresh(source)
+        return lookup(key)
+
+    def loaders(self, source):
+        """Returns DashboardData loaders for the governance and quality datasets, refreshed from `source`.
+
+        With source None the index is read as it is, e.g. when refresh.py keeps it current.
+        """
+        return {
+            'governance': partial(self._load, source, self.governance),
+            'quality': partial(self._load, source, self.quality),
+        }
+
+    def comparison_loaders(self, source):
+        return {'compare_tables': partial(self._load, source, self.compare_tables)}
+
+
+def create_catalog_index(**kwargs):
+    root = os.environ.get(CATALOG_DIR_ENV) or os.path.join(tempfile.gettempdir(), "snowflake_monitoring", "catalog")
+    return CatalogIndex(root, **kwargs)
@@ -0,0 +1,204 @@
+import json
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+import pandas as pd
+
+# Directory of the store; defaults to a folder in the system temp dir
+COST_HISTORY_DIR_ENV = "SNOWFLAKE_MONITORING_COST_HISTORY_DIR"
+
+COST_COLUMN = 'Materialization Cost (Credits)'
+
+# Months of history kept; older months are dropped from every resolution
+DEFAULT_RETENTION_MONTHS = 24
+
+# Re-fetching new days more often than this is skipped
+DEFAULT_MIN_UPDATE_INTERVAL = 10 * 60
+
+# A period is flagged when it exceeds the trailing mean by this many standard
+# deviations, measured over the model's previous ANOMALY_WINDOW periods
+ANOMALY_SIGMAS = 3
+ANOMALY_WINDOW = 6
+
+# Trend ranges up to these many months are served at the given resolution, so
+# a chart never needs more than roughly 100 points per model
+RESOLUTIONS = [(2, 'day'), (12, 'week'), (DEFAULT_RETENTION_MONTHS, 'month')]
+
+
+def flag_anomalies(series, period_column):
+    """Adds an 'Anomaly' column comparing each period to the model's trailing window."""
+    series = series.sort_values(['Data Model', period_column]).reset_index(drop=True)
+    trailing = series.groupby('Data Model')[COST_COLUMN].shift(1).groupby(series['Data Model'])
+    mean = trailing.rolling(ANOMALY_WINDOW, min_periods=3).mean().reset_index(level=0, drop=True)
+    std = trailing.rolling(ANOMALY_WINDOW, min_periods=3).std().reset_index(level=0, drop=True)
+    series['Anomaly'] = (series[COST_COLUMN] > mean + ANOMALY_SIGMAS * std.fillna(0)) & mean.notna()
+    return series
+
+
+class CostHistoryStore:
+    """Persisted per-model cost time series, updated incrementally.
+
+    Layout per schema (<root>/schema=<SCHEMA>/):
+      daily/month=<YYYY-MM>.parquet   per-model credits per day, one file per month
+      weekly.parquet, monthly.parquet per-model credits per week / month, with anomaly flags
+      state.json                      the newest day ingested
+
+    An update refetches only from the newest stored day (which may have been
+    partial) onwards and rebuilds only the weeks and months it touched. Trends
+    are read from the coarsest resolution that fits the requested range, so
+    serving them costs the same however many raw runs lie behind them.
+    """
+
+    def __init__(self, root, retention_months=DEFAULT_RETENTION_MONTHS,
+                 min_update_interval=DEFAULT_MIN_UPDATE_INTERVAL):
+        self.root = root
+        self.retention_months = retention_months
+        self.min_update_interval = min_update_interval
+        self._lock = threading.Lock()
+        self._last_update = {}
+        os.makedirs(root, exist_ok=True)
+
+    # --- Layout ---
+
+    def _schema_dir(self, selected_schema):
+        return os.path.join(self.root, f"schema={selected_schema}")
+
+    def _daily_path(self, selected_schema, month):
+        return os.path.join(self._schema_dir(selected_schema), "daily", f"month={month:%Y-%m}.parquet")
+
+    def _series_path(self, selected_schema, resolution):
+        return os.path.join(self._schema_dir(selected_schema), f"{resolution}ly.parquet")
+
+    def _state_path(self, selected_schema):
+        return os.path.join(self._schema_dir(selected_schema), "state.json")
+
+    def watermark(self, selected_schema):
+        """Returns the newest day stored for the schema, or None."""
+        try:
+            with open(self._state_path(selected_schema)) as f:
+                return pd.Timestamp(json.load(f)['watermark'])
+        except FileNotFoundError:
+            return None
+
+    @staticmethod
+    def _read(path, columns):
+        if os.path.exists(path):
+            return pd.read_parquet(path)
+        return pd.DataFrame(columns=columns)
+
+    @staticmethod
+    def _write(path, df):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + ".tmp"
+        df.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, path)
+
+    def _read_daily(self, selected_schema, months):
+        frames = [
+            self._read(self._daily_path(selected_schema, month), ['Date', 'Data Model', COST_COLUMN])
+            for month in months
+        ]
+        frames = [frame for frame in frames if not frame.empty]
+        if not frames:
+            return pd.DataFrame(columns=['Date', 'Data Model', COST_COLUMN])
+        return pd.concat(frames, ignore_index=True)
+
+    # --- Updates ---
+
+    def update(self, source, selected_schema, force=False):
+        """Pulls per-model daily credits newer than the watermark and refreshes the rollups.
+
+        Returns the number of (day, model) rows fetched.
+        """
+        with self._lock:
+            last_update = self._last_update.get(selected_schema)
+            if not force and last_update is not None and time.monotonic() - last_update < self.min_update_interval:
+                return 0
+
+            today = pd.Timestamp(datetime.now()).normalize()
+            oldest_month = (today - pd.DateOffset(months=self.retention_months - 1)).to_period('M').start_time
+            watermark = self.watermark(selected_schema)
+            since = oldest_month if watermark is None else max(watermark, oldest_month)
+            new_days = source.fetch_daily_costs_since(selected_schema, since.to_pydatetime())
+            if not new_days.empty:
+                self._merge_days(selected_schema, since, new_days)
+                with open(self._state_path(selected_schema), "w") as f:
+                    json.dump({'watermark': new_days['Date'].max().isoformat()}, f)
+            self._prune(selected_schema, oldest_month)
+            self._last_update[selected_schema] = time.monotonic()
+            return len(new_days)
+
+    def _merge_days(self, selected_schema, since, new_days):
+        new_days = new_days.assign(Date=pd.to_datetime(new_days['Date']).dt.normalize())
+        touched_months = sorted(new_days['Date'].dt.to_period('M').dt.start_time.unique())
+
+        # Days on or after `since` are replaced wholesale by the fresh fetch
+        for month in touched_months:
+            path = self._daily_path(selected_schema, month)
+            existing = self._read(path, new_days.columns)
+            month_rows = new_days[new_days['Date'].dt.to_period('M').dt.start_time == month]
+            kept = existing[existing['Date'] < since] if not existing.empty else existing
+            merged = pd.concat([frame for frame in [kept, month_rows] if not frame.empty], ignore_index=True)
+            self._write(path, merged.sort_values(['Date', 'Data Model']))
+
+        # Weeks can start in the previous month, so rebuild from one month earlier
+        rebuild_months = [touched_months[0] - pd.DateOffset(months=1)] + touched_months
+        daily = self._read_daily(selected_schema, rebuild_months)
+        for resolution, freq in [('week', 'W-SUN'), ('month', 'M')]:
+            first_period = since.to_period(freq).start_time
+            daily_in_range = daily[daily['Date'] >= first_period]
+            rebuilt = (
+                daily_in_range.assign(Period=daily_in_range['Date'].dt.to_period(freq).dt.start_time)
+                .groupby(['Period', 'Data Model'], as_index=False)[COST_COLUMN].sum()
+            )
+            path = self._series_path(selected_schema, resolution)
+            series = self._read(path, ['Period', 'Data Model', COST_COLUMN, 'Anomaly'])
+            series = series[series['Period'] < first_period] if not series.empty else series
+            series = pd.concat(
+                [frame[['Period', 'Data Model', COST_COLUMN]] for frame in [series, rebuilt] if not frame.empty],
+                ignore_index=True,
+            )
+            self._write(path, flag_anomalies(series, 'Period'))
+
+    def _prune(self, selected_schema, oldest_month):
+        daily_dir = os.path.join(self._schema_dir(selected_schema), "daily")
+        if os.path.isdir(daily_dir):
+            for name in os.listdir(daily_dir):
+                if name.endswith(".parquet") and pd.Timestamp(name[len("month="):-len(".parquet")]) < oldest_month:
+                    os.remove(os.path.join(daily_dir, name))
+        for resolution in ['week', 'month']:
+            path = self._series_path(selected_schema, resolution)
+            if os.path.exists(path):
+                series = pd.read_parquet(path)
+                if (series['Period'] < oldest_month).any():
+                    self._write(path, series[series['Period'] >= oldest_month])
+
+    # --- Reads ---
+
+    def trend(self, selected_schema, months=12):
+        """Returns (frame, resolution) of per-model credits over the last `months` months.
+
+        The frame has 'Period', 'Data Model', credits and 'Anomaly' columns.
+        """
+        resolution = next((res for limit, res in RESOLUTIONS if months <= limit), 'month')
+        start = (pd.Timestamp(datetime.now()) - pd.DateOffset(months=months)).normalize()
+        if resolution == 'day':
+            month_starts = pd.date_range(start.to_period('M').start_time, datetime.now(), freq='MS')
+            daily = self._read_daily(selected_schema, month_starts).rename(columns={'Date': 'Period'})
+            series = flag_anomalies(daily, 'Period') if not daily.empty else daily.assign(Anomaly=False)
+        else:
+            series = self._read(self._series_path(selected_schema, resolution),
+                                ['Period', 'Data Model', COST_COLUMN, 'Anomaly'])
+        if series.empty:
+            return series, resolution
+        return series[series['Period'] >= start].reset_index(drop=True), resolution
+
+
+def create_cost_history_store():
+    root = os.environ.get(COST_HISTORY_DIR_ENV) or os.path.join(
+        tempfile.gettempdir(), "snowflake_monitoring", "cost_history"
+    )
+    return CostHistoryStore(root)
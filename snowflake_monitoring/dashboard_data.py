@@ -0,0 +1,389 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+import pandas as pd
+import numpy as np
+from datetime import datetime, timedelta
+
+from recommendations import compute_recommendations
+
+# In a real app, you'd query Snowflake for available schemas. Names are
+# qualified by database, since schema names repeat across databases.
+AVAILABLE_SCHEMAS = [
+    "ANALYTICS.SALES_RAW", "ANALYTICS.MARKETING_DM", "ANALYTICS.FINANCE_PROD", "ANALYTICS.HR_ANALYTICS",
+    "STAGING.SALES_RAW",
+]
+
+# --- Mock Data Generation ---
+
+def get_mock_cost_data(selected_schema=None, history_days=730):
+    """Generates mock data for materialization costs: one run per model per day."""
+    models = [f'model_{chr(65+i)}' for i in range(5)]
+    data = {
+        'Data Model': np.repeat(models, history_days),
+        'Materialization Cost (Credits)': np.random.uniform(5, 50, 5 * history_days).round(2),
+        'Last Run': [datetime.now() - timedelta(days=day, hours=i*2) for i in range(5) for day in range(history_days)]
+    }
+    df = pd.DataFrame(data)
+    # A few cost spikes so the trend view has anomalies to flag
+    spikes = np.random.choice(len(df), max(len(df) // 200, 1), replace=False)
+    df.loc[spikes, 'Materialization Cost (Credits)'] *= 10
+    return df
+
+def get_mock_usage_data(selected_schema=None):
+    """Generates mock data for schema usage."""
+    users = [f'user_{i}' for i in range(10)]
+    data_models = [f'model_{chr(65+i)}' for i in range(5)]
+    
+    query_log = []
+    for _ in range(100):
+        query_log.append({
+            'Timestamp': datetime.now() - timedelta(minutes=np.random.randint(1, 60*24*7)),
+            'User': np.random.choice(users),
+            'Data Model Queried': np.random.choice(data_models),
+            'Query Type': np.random.choice(['SELECT', 'INSERT', 'UPDATE', 'DELETE'])
+        })
+    return pd.DataFrame(query_log)
+
+def get_mock_governance_data(selected_schema=None):
+    """Generates mock data for governance metrics."""
+    data = {
+        'Data Model': [f'model_{chr(65+i)}' for i in range(10)],
+        'Has Documentation': np.random.choice([True, False], 10, p=[0.6, 0.4]),
+        'Owner': [f'owner_{chr(97+i)}' for i in range(10)]
+    }
+    return pd.DataFrame(data)
+
+def get_mock_performance_data(selected_schema=None):
+    """Generates mock data for performance issues."""
+    data = {
+        'Data Model': [f'model_{chr(65+i)}' for i in range(7)],
+        'Poor Partition Pruning': np.random.choice([True, False], 7, p=[0.3, 0.7]),
+        'Disk Spilling Occurrences (Last 24h)': np.random.randint(0, 5, 7),
+        'Avg Query Duration (s)': np.random.uniform(1, 60, 7).round(1)
+    }
+    df = pd.DataFrame(data)
+    # Ensure at least one model has issues for demonstration
+    if not df['Poor Partition Pruning'].any():
+        df.loc[0, 'Poor Partition Pruning'] = True
+    if df['Disk Spilling Occurrences (Last 24h)'].sum() == 0:
+        df.loc[1, 'Disk Spilling Occurrences (Last 24h)'] = np.random.randint(1,5)
+    return df
+
+def get_mock_quality_data(selected_schema=None):
+    """Generates mock data for data quality/freshness."""
+    data = {
+        'Data Model': [f'model_{chr(65+i)}' for i in range(8)],
+        'Last Refreshed': [datetime.now() - timedelta(hours=np.random.randint(1, 48)) for i in range(8)],
+        'Source System': [f'source_{chr(88+i)}' for i in range(8)]
+    }
+    return pd.DataFrame(data)
+
+
+# --- Cost Rollups ---
+# Per-model credits by month and by day. The data sources compute these in
+# SQL; the pandas versions back the mock loaders.
+
+def compute_cost_rollup(cost_data, freq, period_column):
+    if cost_data.empty:
+        return pd.DataFrame(columns=[period_column, 'Data Model', 'Materialization Cost (Credits)', 'Runs', 'Last Run'])
+    runs = cost_data.assign(**{period_column: cost_data['Last Run'].dt.to_period(freq).dt.start_time})
+    rollup = runs.groupby([period_column, 'Data Model'], as_index=False).agg(**{
+        'Materialization Cost (Credits)': ('Materialization Cost (Credits)', 'sum'),
+        'Runs': ('Materialization Cost (Credits)', 'size'),
+        'Last Run': ('Last Run', 'max'),
+    })
+    rollup['Materialization Cost (Credits)'] = rollup['Materialization Cost (Credits)'].round(2)
+    return rollup
+
+
+def compute_cost_monthly(cost_data):
+    return compute_cost_rollup(cost_data, 'M', 'Month')
+
+
+def compute_cost_daily(cost_data):
+    return compute_cost_rollup(cost_data, 'D', 'Date')[['Date', 'Data Model', 'Materialization Cost (Credits)']]
+
+
+# --- Usage Aggregates ---
+# The data sources compute these in SQL; the pandas versions below back the
+# mock loaders and match the same columns.
+
+def compute_usage_totals(usage_data):
+    """Returns a one-row frame with the query and distinct-user counts."""
+    return pd.DataFrame({
+        'Total Queries': [len(usage_data)],
+        'Unique Users': [usage_data['User'].nunique() if not usage_data.empty else 0],
+    })
+
+
+def compute_usage_daily(usage_data):
+    """Returns the number of queries per day."""
+    if usage_data.empty:
+        return pd.DataFrame(columns=['Date', 'Number of Queries'])
+    queries_by_day = usage_data.groupby(usage_data['Timestamp'].dt.floor('D')).size().reset_index()
+    queries_by_day.columns = ['Date', 'Number of Queries']
+    return queries_by_day
+
+
+def compute_usage_by_model(usage_data):
+    """Returns the query count of every data model in the raw query log, busiest first."""
+    if usage_data.empty:
+        return pd.DataFrame(columns=['Data Model', 'Query Count'])
+    by_model = usage_data['Data Model Queried'].value_counts().reset_index()
+    by_model.columns = ['Data Model', 'Query Count']
+    return by_model
+
+
+def compute_top_models(usage_data, n=5):
+    """Returns the n most queried data models from the raw query log."""
+    if usage_data.empty:
+        return pd.DataFrame(columns=['Data Model', 'Query Count'])
+    top_models = usage_data['Data Model Queried'].value_counts().nlargest(n).reset_index()
+    top_models.columns = ['Data Model', 'Query Count']
+    return top_models
+
+
+def compute_recent_queries(usage_data, n=10):
+    """Returns the n most recent rows of the query log."""
+    return usage_data.sort_values('Timestamp', ascending=False).head(n)
+
+
+# --- Per-Rerun Data Layer ---
+
+# Loaders take the selected schema and return a DataFrame. The dashboard
+# swaps these for the loaders of its data source (see data_sources.py).
+DATASET_LOADERS = {
+    'cost_monthly': lambda selected_schema: compute_cost_monthly(get_mock_cost_data(selected_schema)),
+    'cost_daily': lambda selected_schema: compute_cost_daily(get_mock_cost_data(selected_schema)),
+    'cost': get_mock_cost_data,
+    'usage_totals': lambda selected_schema: compute_usage_totals(get_mock_usage_data(selected_schema)),
+    'usage_daily': lambda selected_schema: compute_usage_daily(get_mock_usage_data(selected_schema)),
+    'usage_top_models': lambda selected_schema: compute_top_models(get_mock_usage_data(selected_schema)),
+    'usage_by_model': lambda selected_schema: compute_usage_by_model(get_mock_usage_data(selected_schema)),
+    'usage_recent': lambda selected_schema: compute_recent_queries(get_mock_usage_data(selected_schema)),
+    'governance': get_mock_governance_data,
+    'performance': get_mock_performance_data,
+    'quality': get_mock_quality_data,
+}
+
+# Datasets computed from other datasets rather than loaded: name -> (inputs, function).
+# They go through the result cache like loaded datasets, and a loader with the
+# same name (e.g. from a snapshot) takes precedence.
+DERIVED_DATASETS = {
+    'recommendations': (
+        ['cost_daily', 'usage_by_model', 'governance', 'performance', 'quality'], compute_recommendations
+    ),
+}
+
+# Datasets only fetched on demand (drill-downs), never by prefetch()
+LAZY_DATASETS = {'cost'}
+
+# Version of the data read straight from the source; a snapshot's version
+# replaces it. Part of the cache key, so a new snapshot never serves stale entries.
+# (Each dataset's lookback is fixed by its query, so it needn't be in the key.)
+LIVE_VERSION = 'live'
+
+# Entries in the separate cache for pages and row counts
+PAGE_CACHE_ENTRIES = 512
+
+# Seconds a concurrent prefetch waits for each round of loads
+DEFAULT_LOAD_TIMEOUT = 30
+
+
+class Pager:
+    """Fetches pages and row counts of one dataset from a backend with fetch_page/count_rows.
+
+    Pages and counts go through a ResultCache when one is given, keyed on
+    the sort, filters and row range, so paging back and forth doesn't
+    requery and the row count is computed once per filter. It should be a
+    cache of its own (see DashboardData's page_cache): one user paging
+    through a large table would otherwise evict everyone's datasets.
+    """
+
+    def __init__(self, backend, dataset, selected_schema, cache=None, version=LIVE_VERSION):
+        self.backend = backend
+        self.dataset = dataset
+        self.selected_schema = selected_schema
+        self.cache = cache
+        self.version = version
+
+    def _cached(self, kind, params, load):
+        if self.cache is None:
+            return load()
+        return self.cache.get_or_load(f"{self.dataset}_{kind}", self.selected_schema, (self.version, *params), load)
+
+    def count(self, filters=None):
+        filters = dict(filters or {})
+        return self._cached('count', tuple(sorted(filters.items())), lambda: self.backend.count_rows(
+            self.dataset, self.selected_schema, filters
+        ))
+
+    def page(self, sort, descending=False, filters=None, offset=0, limit=50):
+        filters = dict(filters or {})
+        params = (sort, descending, tuple(sorted(filters.items())), offset, limit)
+        return self._cached('page', params, lambda: self.backend.fetch_page(
+            self.dataset, self.selected_schema, sort, descending, filters, offset, limit
+        ))
+
+
+class DashboardData:
+    """Holds the datasets for one rerun of the dashboard.
+
+    Each dataset is fetched at most once for the selected schema, and the same
+    frame is handed to its tab and to the summary tab. When a ResultCache is
+    given, loads go through it so reruns within the TTL skip the query.
+
+    A dataset whose load fails or times out is recorded in `errors` and reads
+    as an empty frame, so the rest of the page can still render.
+    """
+
+    def __init__(self, selected_schema, loaders=None, cache=None, version=LIVE_VERSION, page_cache=None):
+        self.selected_schema = selected_schema
+        self.loaders = DATASET_LOADERS if loaders is None else loaders
+        self.cache = cache
+        self.page_cache = page_cache
+        self.version = version
+        self._frames = {}
+        self.timings = {}
+        self.errors = {}
+
+    def _derive(self, name, selected_schema):
+        inputs, compute = DERIVED_DATASETS[name]
+        frames = [self.get(input_name) for input_name in inputs]
+        failed = [input_name for input_name in inputs if self.failed(input_name)]
+        if failed:
+            # Raising keeps a result computed from partial data out of the cache
+            raise RuntimeError(f"'{name}' needs datasets that failed to load: {', '.join(failed)}")
+        return compute(*frames)
+
+    def _load(self, name):
+        loader = self.loaders[name] if name in self.loaders else lambda schema: self._derive(name, schema)
+        if self.cache is None:
+            return loader(self.selected_schema)
+        return self.cache.get_or_load(
+            name, self.selected_schema, self.version, lambda: loader(self.selected_schema)
+        )
+
+    def _timed_load(self, name):
+        start = time.perf_counter()
+        try:
+            return self._load(name)
+        finally:
+            self.timings[name] = time.perf_counter() - start
+
+    def _fail(self, name, error):
+        self.errors[name] = error
+        self._frames[name] = pd.DataFrame()
+
+    def prefetch(self, names=None, timeout=DEFAULT_LOAD_TIMEOUT):
+        """Loads the given datasets (default: all) concurrently on a thread pool.
+
+        Loads still running after `timeout` seconds are marked as failed; the
+        page doesn't wait for them.
+        """
+        if names is None:
+            names = [name for name in self.loaders if name not in LAZY_DATASETS]
+        pending = [name for name in names if name not in self._frames]
+        if not pending:
+            return
+        executor = ThreadPoolExecutor(max_workers=len(pending), thread_name_prefix="dashboard-load")
+        futures = {executor.submit(self._timed_load, name): name for name in pending}
+        done, not_done = wait(futures, timeout=timeout)
+        executor.shutdown(wait=False, cancel_futures=True)
+
+        for future in done:
+            name = futures[future]
+            try:
+                self._frames[name] = future.result()
+            except Exception as e:
+                self._fail(name, e)
+        for future in not_done:
+            name = futures[future]
+            self.timings.setdefault(name, timeout)
+            self._fail(name, TimeoutError(f"Loading '{name}' took longer than {timeout}s"))
+
+    def get(self, name):
+        if name not in self._frames:
+            try:
+                self._frames[name] = self._timed_load(name)
+            except Exception as e:
+                self._fail(name, e)
+        return self._frames[name]
+
+    def failed(self, name):
+        return name in self.errors
+
+    def pager(self, name, backend):
+        """A Pager over `name` from `backend`, sharing this rerun's schema and data version.
+
+        Its pages are cached in page_cache, apart from the datasets.
+        """
+        return Pager(backend, name, self.selected_schema, cache=self.page_cache, version=self.version)
+
+    def row_count(self, name):
+        """Rows in a loaded dataset, or None if it hasn't been loaded."""
+        frame = self._frames.get(name)
+        return None if frame is None else len(frame)
+
+    def timings_frame(self):
+        """Per-loader wall time, slowest (the critical path) first."""
+        rows = [
+            {
+                'Dataset': name,
+                'Seconds': round(seconds, 3),
+                'Status': 'failed' if name in self.errors else 'ok',
+            }
+            for name, seconds in self.timings.items()
+        ]
+        return pd.DataFrame(rows, columns=['Dataset', 'Seconds', 'Status']).sort_values('Seconds', ascending=False)
+
+    @property
+    def cost(self):
+        """Individual materialization runs; only fetched when a user drills down."""
+        return self.get('cost')
+
+    @property
+    def cost_monthly(self):
+        return self.get('cost_monthly')
+
+    @property
+    def cost_daily(self):
+        return self.get('cost_daily')
+
+    @property
+    def usage_totals(self):
+        return self.get('usage_totals')
+
+    @property
+    def usage_daily(self):
+        return self.get('usage_daily')
+
+    @property
+    def usage_recent(self):
+        return self.get('usage_recent')
+
+    @property
+    def usage_by_model(self):
+        return self.get('usage_by_model')
+
+    @property
+    def governance(self):
+        return self.get('governance')
+
+    @property
+    def performance(self):
+        return self.get('performance')
+
+    @property
+    def quality(self):
+        return self.get('quality')
+
+    @property
+    def top_models(self):
+        return self.get('usage_top_models')
+
+    @property
+    def recommendations(self):
+        """Rule results for the schema, derived from the other datasets unless a snapshot has them."""
+        return self.get('recommendations')
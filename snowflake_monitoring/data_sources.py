@@ -0,0 +1,650 @@
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from functools import partial
+
+import pandas as pd
+import streamlit as st
+from dateutil import tz
+
+from catalog import split_qualified
+from dashboard_data import (
+    AVAILABLE_SCHEMAS,
+    get_mock_cost_data,
+    get_mock_usage_data,
+    get_mock_governance_data,
+    get_mock_performance_data,
+    get_mock_quality_data,
+)
+
+# --- Dataset Queries ---
+# One set-based query per dataset against ACCOUNT_USAGE-style views. In
+# Snowflake these views live in the monitoring database the connection points
+# at; the offline stand-in creates tables with the same names and columns.
+# Schemas are qualified (DATABASE.SCHEMA), since schema names repeat across
+# databases. Parameters are qmark-style: the database and schema first, then
+# the lookback start if the dataset has one.
+DATASET_QUERIES = {
+    # Cost rollups per model; in Snowflake these can be backed by materialized views
+    'cost_monthly': """
+        SELECT DATE_TRUNC('MONTH', END_TIME) AS "Month",
+               MODEL_NAME AS "Data Model",
+               SUM(CREDITS_USED) AS "Materialization Cost (Credits)",
+               COUNT(*) AS "Runs",
+               MAX(END_TIME) AS "Last Run"
+        FROM ACCOUNT_USAGE.MATERIALIZATION_HISTORY
+        WHERE TABLE_CATALOG = ? AND TABLE_SCHEMA = ? AND END_TIME >= ?
+        GROUP BY 1, 2
+        ORDER BY 1 DESC, 3 DESC
+    """,
+    'cost_daily': """
+        SELECT DATE_TRUNC('DAY', END_TIME) AS "Date",
+               MODEL_NAME AS "Data Model",
+               SUM(CREDITS_USED) AS "Materialization Cost (Credits)"
+        FROM ACCOUNT_USAGE.MATERIALIZATION_HISTORY
+        WHERE TABLE_CATALOG = ? AND TABLE_SCHEMA = ? AND END_TIME >= ?
+        GROUP BY 1, 2
+        ORDER BY 1, 2
+    """,
+    # Individual runs, only fetched for drill-downs
+    'cost': """
+        SELECT MODEL_NAME AS "Data Model",
+               CREDITS_USED AS "Materialization Cost (Credits)",
+               END_TIME AS "Last Run"
+        FROM ACCOUNT_USAGE.MATERIALIZATION_HISTORY
+        WHERE TABLE_CATALOG = ? AND TABLE_SCHEMA = ? AND END_TIME >= ?
+        ORDER BY END_TIME DESC
+    """,
+    'usage_totals': """
+        SELECT COUNT(*) AS "Total Queries",
+               COUNT(DISTINCT USER_NAME) AS "Unique Users"
+        FROM ACCOUNT_USAGE.QUERY_HISTORY
+        WHERE TABLE_CATALOG = ? AND TABLE_SCHEMA = ? AND START_TIME >= ?
+    """,
+    'usage_daily': """
+        SELECT DATE(START_TIME) AS "Date",
+               COUNT(*) AS "Number of Queries"
+        FROM ACCOUNT_USAGE.QUERY_HISTORY
+        WHERE TABLE_CATALOG = ? AND TABLE_SCHEMA = ? AND START_TIME >= ?
+        GROUP BY DATE(START_TIME)
+        ORDER BY 1
+    """,
+    'usage_top_models': """
+        SELECT MODEL_NAME AS "Data Model",
+               COUNT(*) AS "Query Count"
+        FROM ACCOUNT_USAGE.QUERY_HISTORY
+        WHERE TABLE_CATALOG = ? AND TABLE_SCHEMA = ? AND START_TIME >= ?
+        GROUP BY MODEL_NAME
+        ORDER BY 2 DESC, 1
+        LIMIT 5
+    """,
+    # Query count for every model, for the recommendation rules
+    'usage_by_model': """
+        SELECT MODEL_NAME AS "Data Model",
+               COUNT(*) AS "Query Count"
+        FROM ACCOUNT_USAGE.QUERY_HISTORY
+        WHERE TABLE_CATALOG = ? AND TABLE_SCHEMA = ? AND START_TIME >= ?
+        GROUP BY MODEL_NAME
+        ORDER BY 2 DESC, 1
+    """,
+    'usage_recent': """
+        SELECT START_TIME AS "Timestamp",
+               USER_NAME AS "User",
+               MODEL_NAME AS "Data Model Queried",
+               QUERY_TYPE AS "Query Type"
+        FROM ACCOUNT_USAGE.QUERY_HISTORY
+        WHERE TABLE_CATALOG = ? AND TABLE_SCHEMA = ? AND START_TIME >= ?
+        ORDER BY START_TIME DESC
+        LIMIT 10
+    """,
+    'governance': """
+        SELECT TABLE_NAME AS "Data Model",
+               COMMENT IS NOT NULL AS "Has Documentation",
+               TABLE_OWNER AS "Owner"
+        FROM ACCOUNT_USAGE.TABLES
+        WHERE TABLE_CATALOG = ? AND TABLE_SCHEMA = ? AND DELETED IS NULL
+        ORDER BY TABLE_NAME
+    """,
+    'performance': """
+        SELECT TABLE_NAME AS "Data Model",
+               POOR_PARTITION_PRUNING AS "Poor Partition Pruning",
+               SPILL_COUNT_24H AS "Disk Spilling Occurrences (Last 24h)",
+               AVG_DURATION_S AS "Avg Query Duration (s)"
+        FROM ACCOUNT_USAGE.TABLE_PERFORMANCE
+        WHERE TABLE_CATALOG = ? AND TABLE_SCHEMA = ?
+        ORDER BY TABLE_NAME
+    """,
+    'quality': """
+        SELECT TABLE_NAME AS "Data Model",
+               LAST_ALTERED AS "Last Refreshed",
+               SOURCE_SYSTEM AS "Source System"
+        FROM ACCOUNT_USAGE.TABLES
+        WHERE TABLE_CATALOG = ? AND TABLE_SCHEMA = ? AND LAST_ALTERED IS NOT NULL AND DELETED IS NULL
+        ORDER BY TABLE_NAME
+    """,
+}
+
+# --- Paged Queries ---
+# Datasets that can be browsed a page at a time. Sorting, filtering and
+# LIMIT/OFFSET run in the warehouse; only the displayed columns can be sorted
+# or filtered on, so user input never reaches the SQL text.
+PAGED_QUERIES = {
+    'usage': {
+        'from': "ACCOUNT_USAGE.QUERY_HISTORY WHERE TABLE_CATALOG = ? AND TABLE_SCHEMA = ? AND START_TIME >= ?",
+        'columns': {
+            'Timestamp': "START_TIME",
+            'User': "USER_NAME",
+            'Data Model Queried': "MODEL_NAME",
+            'Query Type': "QUERY_TYPE",
+        },
+    },
+    'performance': {
+        'from': "ACCOUNT_USAGE.TABLE_PERFORMANCE WHERE TABLE_CATALOG = ? AND TABLE_SCHEMA = ?",
+        'columns': {
+            'Data Model': "TABLE_NAME",
+            'Poor Partition Pruning': "POOR_PARTITION_PRUNING",
+            'Disk Spilling Occurrences (Last 24h)': "SPILL_COUNT_24H",
+            'Avg Query Duration (s)': "AVG_DURATION_S",
+        },
+    },
+}
+
+# --- Comparison Queries ---
+# Metrics for several schemas at once: one query per dataset, grouped by
+# schema, so comparing N schemas costs the same number of round trips as one.
+# {schemas} is replaced by one (?, ?) pair per schema; the database and schema
+# of each come first in the parameters, then the lookback start if the dataset
+# has one. "Schema" is the qualified name.
+COMPARISON_QUERIES = {
+    'compare_cost': """
+        SELECT TABLE_CATALOG || '.' || TABLE_SCHEMA AS "Schema",
+               DATE_TRUNC('MONTH', END_TIME) AS "Month",
+               SUM(CREDITS_USED) AS "Materialization Cost (Credits)"
+        FROM ACCOUNT_USAGE.MATERIALIZATION_HISTORY
+        WHERE (TABLE_CATALOG, TABLE_SCHEMA) IN ({schemas}) AND END_TIME >= ?
+        GROUP BY 1, 2
+        ORDER BY 1, 2
+    """,
+    'compare_usage': """
+        SELECT TABLE_CATALOG || '.' || TABLE_SCHEMA AS "Schema",
+               COUNT(*) AS "Total Queries",
+               COUNT(DISTINCT USER_NAME) AS "Unique Users"
+        FROM ACCOUNT_USAGE.QUERY_HISTORY
+        WHERE (TABLE_CATALOG, TABLE_SCHEMA) IN ({schemas}) AND START_TIME >= ?
+        GROUP BY 1
+        ORDER BY 1
+    """,
+    'compare_usage_daily': """
+        SELECT TABLE_CATALOG || '.' || TABLE_SCHEMA AS "Schema",
+               DATE(START_TIME) AS "Date",
+               COUNT(*) AS "Number of Queries"
+        FROM ACCOUNT_USAGE.QUERY_HISTORY
+        WHERE (TABLE_CATALOG, TABLE_SCHEMA) IN ({schemas}) AND START_TIME >= ?
+        GROUP BY 1, 2
+        ORDER BY 1, 2
+    """,
+    # Per table, since freshness thresholds depend on the source system and are applied in pandas
+    'compare_tables': """
+        SELECT TABLE_CATALOG || '.' || TABLE_SCHEMA AS "Schema",
+               TABLE_NAME AS "Data Model",
+               COMMENT IS NOT NULL AS "Has Documentation",
+               LAST_ALTERED AS "Last Refreshed",
+               SOURCE_SYSTEM AS "Source System"
+        FROM ACCOUNT_USAGE.TABLES
+        WHERE (TABLE_CATALOG, TABLE_SCHEMA) IN ({schemas}) AND DELETED IS NULL
+        ORDER BY 1, 2
+    """,
+}
+
+# --- Catalog Queries ---
+# Every table in the account with its metadata, for the catalog index. The
+# changes query also returns tables dropped since the watermark (DELETED is
+# set on them) so the index can remove them.
+CATALOG_QUERY = """
+    SELECT TABLE_CATALOG AS "Database",
+           TABLE_SCHEMA AS "Schema",
+           TABLE_NAME AS "Data Model",
+           COMMENT AS "Comment",
+           TABLE_OWNER AS "Owner",
+           LAST_ALTERED AS "Last Altered",
+           SOURCE_SYSTEM AS "Source System"
+    FROM ACCOUNT_USAGE.TABLES
+    WHERE DELETED IS NULL
+"""
+CATALOG_CHANGES_QUERY = """
+    SELECT TABLE_CATALOG AS "Database",
+           TABLE_SCHEMA AS "Schema",
+           TABLE_NAME AS "Data Model",
+           COMMENT AS "Comment",
+           TABLE_OWNER AS "Owner",
+           LAST_ALTERED AS "Last Altered",
+           SOURCE_SYSTEM AS "Source System",
+           DELETED AS "Deleted"
+    FROM ACCOUNT_USAGE.TABLES
+    WHERE LAST_ALTERED > ? OR DELETED > ?
+    ORDER BY LAST_ALTERED
+"""
+
+# Query-log rows from a point in time on, for incremental ingestion; the
+# query id lets the store drop rows it already has
+QUERY_LOG_SINCE_QUERY = """
+    SELECT QUERY_ID AS "Query ID",
+           START_TIME AS "Timestamp",
+           USER_NAME AS "User",
+           MODEL_NAME AS "Data Model Queried",
+           QUERY_TYPE AS "Query Type"
+    FROM ACCOUNT_USAGE.QUERY_HISTORY
+    WHERE TABLE_CATALOG = ? AND TABLE_SCHEMA = ? AND START_TIME >= ?
+    ORDER BY START_TIME
+"""
+
+# How far back time-filtered datasets look
+DATASET_LOOKBACK = {
+    'cost_monthly': timedelta(days=365),
+    'cost_daily': timedelta(days=365),
+    'cost': timedelta(days=365),
+    'usage_totals': timedelta(days=7),
+    'usage_daily': timedelta(days=7),
+    'usage_top_models': timedelta(days=7),
+    'usage_by_model': timedelta(days=7),
+    'usage_recent': timedelta(days=7),
+    # The query log browsed a page at a time (PAGED_QUERIES)
+    'usage': timedelta(days=7),
+    'compare_cost': timedelta(days=365),
+    'compare_usage': timedelta(days=7),
+    'compare_usage_daily': timedelta(days=7),
+}
+
+# Column types to restore after a query (drivers differ on timestamps and booleans)
+DATETIME_COLUMNS = ['Last Run', 'Timestamp', 'Last Refreshed', 'Date', 'Month', 'Last Altered', 'Deleted']
+BOOL_COLUMNS = ['Has Documentation', 'Poor Partition Pruning']
+
+
+# Paged-table filters are {column: text it must contain} or {column: (operator, value)}
+FILTER_OPERATORS = {'==': '=', '!=': '<>', '>': '>', '>=': '>=', '<': '<', '<=': '<='}
+
+
+def _like_pattern(text):
+    """A case-insensitive 'contains' pattern for LIKE ... ESCAPE '!'."""
+    escaped = text.lower().replace("!", "!!").replace("%", "!%").replace("_", "!_")
+    return f"%{escaped}%"
+
+
+def _to_local_naive(values):
+    """Parses timestamps as naive local time, like datetime.now().
+
+    Snowflake returns TIMESTAMP_LTZ columns (START_TIME, LAST_ALTERED, ...)
+    tz-aware; they are converted to the local zone and the zone dropped.
+    """
+    present = values.dropna()
+    aware = isinstance(values.dtype, pd.DatetimeTZDtype) or (
+        not present.empty and getattr(present.iloc[0], 'tzinfo', None) is not None
+    )
+    if not aware:
+        return pd.to_datetime(values, format='ISO8601')
+    return pd.to_datetime(values, format='ISO8601', utc=True).dt.tz_convert(tz.tzlocal()).dt.tz_localize(None)
+
+
+def _coerce_types(df):
+    if 'Materialization Cost (Credits)' in df.columns:
+        df['Materialization Cost (Credits)'] = df['Materialization Cost (Credits)'].astype(float).round(2)
+    for column in DATETIME_COLUMNS:
+        if column in df.columns:
+            df[column] = _to_local_naive(df[column])
+    for column in BOOL_COLUMNS:
+        if column in df.columns:
+            df[column] = df[column].astype(bool)
+    return df
+
+
+# --- Connection Pool ---
+
+class ConnectionPool:
+    """Thread-safe pool of reusable DB-API connections.
+
+    At most max_size connections are checked out at once; further callers wait
+    up to `timeout` seconds. Connections idle longer than `health_check_after`
+    seconds are pinged before reuse and replaced if the ping fails.
+    """
+
+    def __init__(self, connect, max_size=4, timeout=30, health_check_after=60,
+                 health_check_sql="SELECT 1"):
+        self._connect = connect
+        self.max_size = max_size
+        self.timeout = timeout
+        self.health_check_after = health_check_after
+        self.health_check_sql = health_check_sql
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(max_size)
+
+    def _is_healthy(self, conn):
+        try:
+            cur = conn.cursor()
+            try:
+                cur.execute(self.health_check_sql)
+                cur.fetchall()
+            finally:
+                cur.close()
+            return True
+        except Exception:
+            return False
+
+    def _discard(self, conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def _checkout(self):
+        while True:
+            try:
+                conn, last_used = self._idle.get_nowait()
+            except queue.Empty:
+                return self._connect()
+            if time.monotonic() - last_used < self.health_check_after or self._is_healthy(conn):
+                return conn
+            self._discard(conn)
+
+    @contextmanager
+    def connection(self):
+        if not self._slots.acquire(timeout=self.timeout):
+            raise TimeoutError(f"No database connection available after {self.timeout}s")
+        conn = None
+        try:
+            conn = self._checkout()
+            yield conn
+        except Exception:
+            # Don't hand a connection in an unknown state to the next caller
+            if conn is not None:
+                self._discard(conn)
+                conn = None
+            raise
+        finally:
+            if conn is not None:
+                self._idle.put((conn, time.monotonic()))
+            self._slots.release()
+
+    def close(self):
+        while True:
+            try:
+                conn, _ = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            self._discard(conn)
+
+
+# --- Data Sources ---
+
+class DataSource:
+    """Runs the dataset queries over a connection pool and returns DataFrames."""
+
+    description = "Generic DB-API source"
+
+    def __init__(self, pool):
+        self.pool = pool
+
+    def query(self, sql, params=()):
+        with self.pool.connection() as conn:
+            cur = conn.cursor()
+            try:
+                cur.execute(sql, list(params))
+                rows = cur.fetchall()
+                columns = [column[0] for column in cur.description]
+            finally:
+                cur.close()
+        return pd.DataFrame.from_records(rows, columns=columns)
+
+    def load(self, dataset, selected_schema):
+        params = list(split_qualified(selected_schema))
+        if dataset in DATASET_LOOKBACK:
+            params.append(datetime.now() - DATASET_LOOKBACK[dataset])
+        return _coerce_types(self.query(DATASET_QUERIES[dataset], params))
+
+    def load_comparison(self, dataset, schemas):
+        """Loads a comparison dataset for several schemas in a single query."""
+        params = [part for schema in schemas for part in split_qualified(schema)]
+        if dataset in DATASET_LOOKBACK:
+            params.append(datetime.now() - DATASET_LOOKBACK[dataset])
+        sql = COMPARISON_QUERIES[dataset].format(schemas=", ".join(["(?, ?)"] * len(schemas)))
+        return _coerce_types(self.query(sql, params))
+
+    def _paged_where(self, dataset, selected_schema, filters):
+        spec = PAGED_QUERIES[dataset]
+        params = list(split_qualified(selected_schema))
+        if dataset in DATASET_LOOKBACK:
+            params.append(datetime.now() - DATASET_LOOKBACK[dataset])
+        clauses = []
+        for column, condition in (filters or {}).items():
+            if column not in spec['columns']:
+                raise ValueError(f"Can't filter {dataset} on {column!r}")
+            if isinstance(condition, tuple):
+                op, value = condition
+                if op not in FILTER_OPERATORS:
+                    raise ValueError(f"Unknown filter operator {op!r}")
+                clauses.append(f"({spec['columns'][column]}) {FILTER_OPERATORS[op]} ?")
+                params.append(value)
+            else:
+                clauses.append(f"LOWER(CAST({spec['columns'][column]} AS VARCHAR)) LIKE ? ESCAPE '!'")
+                params.append(_like_pattern(condition))
+        return spec['from'] + "".join(f" AND {clause}" for clause in clauses), params
+
+    def count_rows(self, dataset, selected_schema, filters=None):
+        """Rows of a paged dataset matching `filters` ({column: text it must contain, or (operator, value)})."""
+        where, params = self._paged_where(dataset, selected_schema, filters)
+        return int(self.query(f"SELECT COUNT(*) FROM {where}", params).iloc[0, 0])
+
+    def fetch_page(self, dataset, selected_schema, sort, descending=False, filters=None, offset=0, limit=50):
+        """One page of a paged dataset, sorted and filtered in the warehouse."""
+        columns = PAGED_QUERIES[dataset]['columns']
+        if sort not in columns:
+            raise ValueError(f"Can't sort {dataset} on {sort!r}")
+        where, params = self._paged_where(dataset, selected_schema, filters)
+        select = ", ".join(f'{expr} AS "{column}"' for column, expr in columns.items())
+        # The first column breaks ties, so rows don't move between pages
+        tiebreak = next(iter(columns.values()))
+        sql = (
+            f"SELECT {select} FROM {where} "
+            f"ORDER BY {columns[sort]} {'DESC' if descending else 'ASC'}, {tiebreak} "
+            f"LIMIT {int(limit)} OFFSET {int(offset)}"
+        )
+        return _coerce_types(self.query(sql, params))
+
+    def fetch_query_log_since(self, selected_schema, since):
+        """Returns query-log rows, with their query ids, that started at or after `since`."""
+        return _coerce_types(self.query(QUERY_LOG_SINCE_QUERY, [*split_qualified(selected_schema), since]))
+
+    def fetch_daily_costs_since(self, selected_schema, since):
+        """Returns per-model credits per day for runs that ended on or after `since`."""
+        return _coerce_types(self.query(DATASET_QUERIES['cost_daily'], [*split_qualified(selected_schema), since]))
+
+    def fetch_catalog(self, since=None):
+        """Returns every live table, or only tables altered or dropped after `since`."""
+        if since is None:
+            return _coerce_types(self.query(CATALOG_QUERY))
+        return _coerce_types(self.query(CATALOG_CHANGES_QUERY, [since, since]))
+
+    def loaders(self):
+        """Returns DashboardData-compatible loaders bound to this source."""
+        return {dataset: partial(self.load, dataset) for dataset in DATASET_QUERIES}
+
+    def comparison_loaders(self):
+        """Like loaders(), but called with a tuple of schemas instead of one."""
+        return {dataset: partial(self.load_comparison, dataset) for dataset in COMPARISON_QUERIES}
+
+    def close(self):
+        self.pool.close()
+
+
+class SnowflakeSource(DataSource):
+    """Live backend: a process-wide pool of snowflake.connector connections."""
+
+    description = "Snowflake"
+
+    def __init__(self, connection_params, max_connections=8):
+        # Only the live backend needs the connector
+        import snowflake.connector
+        snowflake.connector.paramstyle = 'qmark'
+        connection_params = dict(connection_params)
+        super().__init__(ConnectionPool(
+            lambda: snowflake.connector.connect(**connection_params),
+            max_size=max_connections,
+        ))
+
+
+sqlite3.register_adapter(datetime, lambda value: value.isoformat(' '))
+sqlite3.register_adapter(pd.Timestamp, lambda value: value.isoformat(' '))
+
+def _sqlite_date_trunc(part, value):
+    """Snowflake's DATE_TRUNC for the offline stand-in (timestamps are stored as ISO strings)."""
+    if value is None:
+        return None
+    ts = datetime.fromisoformat(value).replace(hour=0, minute=0, second=0, microsecond=0)
+    part = part.upper()
+    if part == 'MONTH':
+        ts = ts.replace(day=1)
+    elif part == 'WEEK':
+        ts -= timedelta(days=ts.weekday())
+    elif part != 'DAY':
+        raise ValueError(f"Unsupported DATE_TRUNC part: {part}")
+    return ts.isoformat(' ')
+
+
+# Tables of the offline stand-in, mirroring the views the queries read
+SQLITE_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS ACCOUNT_USAGE.MATERIALIZATION_HISTORY (
+        TABLE_CATALOG TEXT, TABLE_SCHEMA TEXT, MODEL_NAME TEXT, CREDITS_USED REAL, END_TIME TIMESTAMP
+    );
+    CREATE TABLE IF NOT EXISTS ACCOUNT_USAGE.QUERY_HISTORY (
+        QUERY_ID TEXT, TABLE_CATALOG TEXT, TABLE_SCHEMA TEXT, START_TIME TIMESTAMP, USER_NAME TEXT, MODEL_NAME TEXT, QUERY_TYPE TEXT
+    );
+    CREATE TABLE IF NOT EXISTS ACCOUNT_USAGE.TABLES (
+        TABLE_CATALOG TEXT, TABLE_SCHEMA TEXT, TABLE_NAME TEXT, COMMENT TEXT,
+        TABLE_OWNER TEXT, LAST_ALTERED TIMESTAMP, SOURCE_SYSTEM TEXT, DELETED TIMESTAMP
+    );
+    CREATE TABLE IF NOT EXISTS ACCOUNT_USAGE.TABLE_PERFORMANCE (
+        TABLE_CATALOG TEXT, TABLE_SCHEMA TEXT, TABLE_NAME TEXT, POOR_PARTITION_PRUNING BOOLEAN,
+        SPILL_COUNT_24H INTEGER, AVG_DURATION_S REAL
+    );
+    CREATE INDEX IF NOT EXISTS ACCOUNT_USAGE.QUERY_HISTORY_SCHEMA_TIME
+        ON QUERY_HISTORY (TABLE_CATALOG, TABLE_SCHEMA, START_TIME);
+    CREATE INDEX IF NOT EXISTS ACCOUNT_USAGE.MATERIALIZATION_HISTORY_SCHEMA_TIME
+        ON MATERIALIZATION_HISTORY (TABLE_CATALOG, TABLE_SCHEMA, END_TIME);
+"""
+
+
+def _records(df):
+    """Converts a frame to plain Python rows sqlite3 can bind."""
+    return df.astype(object).where(df.notna(), None).to_numpy().tolist()
+
+
+def build_offline_tables(selected_schema):
+    """Builds the stand-in view contents for one schema from the mock generators."""
+    cost = get_mock_cost_data(selected_schema)
+    usage = get_mock_usage_data(selected_schema)
+    governance = get_mock_governance_data(selected_schema)
+    performance = get_mock_performance_data(selected_schema)
+    quality = get_mock_quality_data(selected_schema)
+
+    database, schema = split_qualified(selected_schema)
+    tables = governance.merge(quality, on='Data Model', how='outer')
+    # Undocumented models have no comment; owners are unknown for models only seen by freshness checks
+    tables['COMMENT'] = tables['Has Documentation'].map({True: 'Documented model', False: None})
+    return {
+        'MATERIALIZATION_HISTORY': pd.DataFrame({
+            'TABLE_CATALOG': database,
+            'TABLE_SCHEMA': schema,
+            'MODEL_NAME': cost['Data Model'],
+            'CREDITS_USED': cost['Materialization Cost (Credits)'],
+            'END_TIME': cost['Last Run'],
+        }),
+        'QUERY_HISTORY': pd.DataFrame({
+            'QUERY_ID': [f"{selected_schema}-{i}" for i in range(len(usage))],
+            'TABLE_CATALOG': database,
+            'TABLE_SCHEMA': schema,
+            'START_TIME': usage['Timestamp'],
+            'USER_NAME': usage['User'],
+            'MODEL_NAME': usage['Data Model Queried'],
+            'QUERY_TYPE': usage['Query Type'],
+        }),
+        'TABLES': pd.DataFrame({
+            'TABLE_CATALOG': database,
+            'TABLE_SCHEMA': schema,
+            'TABLE_NAME': tables['Data Model'],
+            'COMMENT': tables['COMMENT'],
+            'TABLE_OWNER': tables['Owner'],
+            'LAST_ALTERED': tables['Last Refreshed'],
+            'SOURCE_SYSTEM': tables['Source System'],
+        }),
+        'TABLE_PERFORMANCE': pd.DataFrame({
+            'TABLE_CATALOG': database,
+            'TABLE_SCHEMA': schema,
+            'TABLE_NAME': performance['Data Model'],
+            'POOR_PARTITION_PRUNING': performance['Poor Partition Pruning'],
+            'SPILL_COUNT_24H': performance['Disk Spilling Occurrences (Last 24h)'],
+            'AVG_DURATION_S': performance['Avg Query Duration (s)'],
+        }),
+    }
+
+
+class SQLiteSource(DataSource):
+    """Offline backend: an in-memory SQLite stand-in seeded from the mock generators.
+
+    Runs the same queries as SnowflakeSource, so the app and its checks work
+    with no network access.
+    """
+
+    description = "Offline SQLite stand-in (mock data)"
+
+    def __init__(self, name="snowflake_monitoring", schemas=None, max_connections=8):
+        self.name = name
+        # Keeps the memory databases alive even if every pooled connection is discarded
+        self._keepalive = self._connect()
+        super().__init__(ConnectionPool(self._connect, max_size=max_connections))
+        self.seed(AVAILABLE_SCHEMAS if schemas is None else schemas)
+
+    def _connect(self):
+        # Shared-cache memory databases live as long as one pooled connection is open
+        conn = sqlite3.connect(
+            f"file:{self.name}?mode=memory&cache=shared", uri=True, check_same_thread=False
+        )
+        conn.execute(
+            f"ATTACH DATABASE 'file:{self.name}_account_usage?mode=memory&cache=shared' AS ACCOUNT_USAGE"
+        )
+        conn.create_function("DATE_TRUNC", 2, _sqlite_date_trunc, deterministic=True)
+        return conn
+
+    def seed(self, schemas):
+        with self.pool.connection() as conn:
+            conn.executescript(SQLITE_SCHEMA)
+            for selected_schema in schemas:
+                for table, df in build_offline_tables(selected_schema).items():
+                    conn.execute(
+                        f"DELETE FROM ACCOUNT_USAGE.{table} WHERE TABLE_CATALOG = ? AND TABLE_SCHEMA = ?",
+                        list(split_qualified(selected_schema)),
+                    )
+                    placeholders = ", ".join("?" * len(df.columns))
+                    conn.executemany(
+                        f"INSERT INTO ACCOUNT_USAGE.{table} ({', '.join(df.columns)}) VALUES ({placeholders})",
+                        _records(df),
+                    )
+            conn.commit()
+
+    def close(self):
+        super().close()
+        self._keepalive.close()
+
+
+def create_data_source():
+    """Returns the Snowflake backend if st.secrets has a [snowflake] section, else the offline stand-in.
+
+    The Snowflake connection parameters should point at the database holding
+    the ACCOUNT_USAGE-style monitoring views.
+    """
+    try:
+        connection_params = st.secrets["snowflake"]
+    except (KeyError, FileNotFoundError):  # no secrets file or no [snowflake] section
+        return SQLiteSource()
+    return SnowflakeSource(connection_params)
@@ -0,0 +1,141 @@
+import contextvars
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+import pandas as pd
+import streamlit as st
+
+# Profiling is opt-in: ?profile=1 in the URL, or this env var set to 1 for every session
+PROFILE_ENV = "SNOWFLAKE_MONITORING_PROFILE"
+# If set, every profiled rerun is appended to this file as one JSON line
+PROFILE_LOG_ENV = "SNOWFLAKE_MONITORING_PROFILE_LOG"
+
+# Streamlit calls timed separately inside a render stage, so the panel can
+# tell pandas/Altair work in the tab apart from serialization in Streamlit
+SERIALIZING_CALLS = ['dataframe', 'altair_chart']
+
+_current_stage = contextvars.ContextVar("current_stage", default=None)
+_install_lock = threading.Lock()
+_installed = False
+_log_lock = threading.Lock()
+
+
+def profiling_enabled():
+    if os.environ.get(PROFILE_ENV, "").lower() in ("1", "true", "yes"):
+        return True
+    return st.query_params.get("profile", "").lower() in ("1", "true", "yes")
+
+
+def _install_serialization_timers():
+    """Wraps st.dataframe and st.altair_chart so their time is charged to the current stage.
+
+    The wrappers only record something while a profiled stage is active in
+    the calling context, so other sessions are unaffected.
+    """
+    global _installed
+    with _install_lock:
+        if _installed:
+            return
+        for name in SERIALIZING_CALLS:
+            original = getattr(st, name)
+
+            def timed(*args, _original=original, _name=name, **kwargs):
+                stage = _current_stage.get()
+                if stage is None:
+                    return _original(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return _original(*args, **kwargs)
+                finally:
+                    key = f"st.{_name} seconds"
+                    stage[key] = stage.get(key, 0) + time.perf_counter() - start
+
+            setattr(st, name, timed)
+        _installed = True
+
+
+class RerunProfiler:
+    """Collects per-stage timings and row counts for one rerun of the dashboard.
+
+    When disabled every method is a no-op, so the dashboard can call it
+    unconditionally.
+    """
+
+    def __init__(self, enabled):
+        self.enabled = enabled
+        self.rerun_id = uuid.uuid4().hex
+        self.started_at = datetime.now(timezone.utc)
+        self._start = time.perf_counter()
+        self.stages = []
+        if enabled:
+            _install_serialization_timers()
+
+    def record(self, kind, name, seconds, rows=None, status="ok"):
+        if self.enabled:
+            self.stages.append({'kind': kind, 'name': name, 'seconds': seconds, 'rows': rows, 'status': status})
+
+    @contextmanager
+    def stage(self, kind, name, rows=None):
+        """Times the enclosed block as one stage."""
+        if not self.enabled:
+            yield
+            return
+        stage = {'kind': kind, 'name': name, 'rows': rows, 'status': 'ok'}
+        token = _current_stage.set(stage)
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            stage['status'] = 'failed'
+            raise
+        finally:
+            stage['seconds'] = time.perf_counter() - start
+            _current_stage.reset(token)
+            self.stages.append(stage)
+
+    def record_loads(self, data):
+        """Adds one fetch stage per dataset DashboardData loaded this rerun."""
+        for name, seconds in data.timings.items():
+            self.record('fetch', name, seconds, rows=data.row_count(name),
+                        status='failed' if data.failed(name) else 'ok')
+
+    def timings_frame(self):
+        rows = []
+        for stage in self.stages:
+            serialize = sum(stage.get(f"st.{name} seconds", 0) for name in SERIALIZING_CALLS)
+            rows.append({
+                'Stage': f"{stage['kind']}: {stage['name']}",
+                'Seconds': round(stage['seconds'], 3),
+                'Serialize (s)': round(serialize, 3) if stage['kind'] == 'render' else None,
+                'Rows': stage['rows'],
+                'Status': stage['status'],
+            })
+        timings = pd.DataFrame(rows, columns=['Stage', 'Seconds', 'Serialize (s)', 'Rows', 'Status'])
+        return timings.astype({'Rows': 'Int64'})
+
+    def to_record(self, **extra):
+        return {
+            'rerun_id': self.rerun_id,
+            'started_at': self.started_at.isoformat(),
+            'total_seconds': round(time.perf_counter() - self._start, 4),
+            **extra,
+            'stages': [
+                {key: round(value, 4) if isinstance(value, float) else value for key, value in stage.items()}
+                for stage in self.stages
+            ],
+        }
+
+    def emit(self, path=None, **extra):
+        """Appends this rerun as one JSON line to `path` (default: $SNOWFLAKE_MONITORING_PROFILE_LOG)."""
+        path = path or os.environ.get(PROFILE_LOG_ENV)
+        if not self.enabled or not path:
+            return
+        line = json.dumps(self.to_record(**extra), default=str)
+        with _log_lock:
+            with open(path, "a") as f:
+                f.write(line + "\n")
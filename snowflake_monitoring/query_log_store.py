@@ -0,0 +1,310 @@
+import json
+import os
+import shutil
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from functools import partial
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+# Directory of the local store; unset means the usage tab queries the source directly
+QUERY_LOG_DIR_ENV = "SNOWFLAKE_MONITORING_QUERY_LOG_DIR"
+
+QUERY_LOG_COLUMNS = ['Timestamp', 'User', 'Data Model Queried', 'Query Type']
+# Stored with every row, so rows fetched twice can be recognized
+QUERY_ID_COLUMN = 'Query ID'
+STORED_COLUMNS = QUERY_LOG_COLUMNS + [QUERY_ID_COLUMN]
+
+# Days of query log kept locally; older day partitions are deleted
+DEFAULT_RETENTION = timedelta(days=7)
+
+# Re-ingesting more often than this is skipped; the five usage loaders of one
+# rerun share a single round-trip for new rows
+DEFAULT_MIN_INGEST_INTERVAL = 60
+
+# QUERY_HISTORY rows land late (up to ~45 minutes), and rows sharing the
+# watermark's timestamp can land after it; each ingest re-reads this much
+# before the watermark and drops the query ids it already has
+INGEST_OVERLAP = timedelta(hours=3)
+
+# A day partition with more part files than this is rewritten as one file
+MAX_FILES_PER_DAY = 32
+
+# Arrow kernels for (operator, value) page filters
+COMPARISONS = {
+    '==': pc.equal, '!=': pc.not_equal, '>': pc.greater, '>=': pc.greater_equal, '<': pc.less, '<=': pc.less_equal,
+}
+
+
+class QueryLogStore:
+    """Local copy of the query log as day-partitioned Parquet files.
+
+    Layout: <root>/schema=<SCHEMA>/day=<YYYY-MM-DD>/part-*.parquet, plus a
+    watermarks.json holding the newest ingested Timestamp per schema. Each
+    ingest only fetches rows from INGEST_OVERLAP before that mark on, and
+    keeps those whose query id isn't stored yet, so a refresh costs the recent
+    rows rather than the whole retention window and late rows aren't lost.
+    Reads are memory-mapped and only touch the columns they need.
+    """
+
+    def __init__(self, root, retention=DEFAULT_RETENTION, min_ingest_interval=DEFAULT_MIN_INGEST_INTERVAL):
+        self.root = root
+        self.retention = retention
+        self.min_ingest_interval = min_ingest_interval
+        self._lock = threading.Lock()
+        self._last_ingest = {}
+        self._checked_schemas = set()
+        os.makedirs(root, exist_ok=True)
+
+    # --- Layout ---
+
+    def _schema_dir(self, selected_schema):
+        return os.path.join(self.root, f"schema={selected_schema}")
+
+    def _day_dirs(self, selected_schema):
+        """Returns (day, path) pairs for the schema's partitions, oldest first."""
+        schema_dir = self._schema_dir(selected_schema)
+        if not os.path.isdir(schema_dir):
+            return []
+        return sorted(
+            (name.split("=", 1)[1], os.path.join(schema_dir, name))
+            for name in os.listdir(schema_dir)
+            if name.startswith("day=")
+        )
+
+    def _watermarks_path(self):
+        return os.path.join(self.root, "watermarks.json")
+
+    def _read_watermarks(self):
+        try:
+            with open(self._watermarks_path()) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def watermark(self, selected_schema):
+        """Returns the newest ingested Timestamp for the schema, or None."""
+        value = self._read_watermarks().get(selected_schema)
+        return None if value is None else datetime.fromisoformat(value)
+
+    def _set_watermark(self, selected_schema, value):
+        watermarks = self._read_watermarks()
+        if value is None:
+            watermarks.pop(selected_schema, None)
+        else:
+            watermarks[selected_schema] = value.isoformat()
+        tmp_path = self._watermarks_path() + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(watermarks, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self._watermarks_path())
+
+    # --- Writes ---
+
+    def _write_part(self, day_dir, rows):
+        os.makedirs(day_dir, exist_ok=True)
+        name = f"part-{int(time.time() * 1000)}-{uuid.uuid4().hex[:8]}.parquet"
+        # Files starting with '.' are ignored by readers until renamed
+        tmp_path = os.path.join(day_dir, "." + name)
+        pq.write_table(pa.Table.from_pandas(rows[STORED_COLUMNS], preserve_index=False), tmp_path)
+        os.replace(tmp_path, os.path.join(day_dir, name))
+
+    def _compact(self, day_dir):
+        parts = [name for name in os.listdir(day_dir) if name.startswith("part-")]
+        if len(parts) <= MAX_FILES_PER_DAY:
+            return
+        table = pq.read_table(day_dir, memory_map=True)
+        self._write_part(day_dir, table.to_pandas())
+        for name in parts:
+            os.remove(os.path.join(day_dir, name))
+
+    def evict(self, selected_schema, now=None):
+        """Deletes day partitions that fall outside the retention window."""
+        cutoff = ((now or datetime.now()) - self.retention).date().isoformat()
+        evicted = 0
+        for day, day_dir in self._day_dirs(selected_schema):
+            if day < cutoff:
+                shutil.rmtree(day_dir)
+                evicted += 1
+        return evicted
+
+    def _part_paths(self, selected_schema, since=None):
+        return [
+            os.path.join(day_dir, name)
+            for day, day_dir in self._day_dirs(selected_schema)
+            if since is None or day >= since.date().isoformat()
+            for name in sorted(os.listdir(day_dir))
+            if name.startswith("part-")
+        ]
+
+    def _drop_unkeyed(self, selected_schema):
+        """Rebuilds a schema stored before query ids were kept; its rows can't be de-duplicated."""
+        if selected_schema in self._checked_schemas:
+            return
+        if any(QUERY_ID_COLUMN not in pq.read_schema(path).names for path in self._part_paths(selected_schema)):
+            shutil.rmtree(self._schema_dir(selected_schema))
+            self._set_watermark(selected_schema, None)
+        self._checked_schemas.add(selected_schema)
+
+    def _stored_ids(self, selected_schema, since):
+        paths = self._part_paths(selected_schema, since)
+        if not paths:
+            return pd.Series([], dtype=object)
+        return pq.read_table(paths, columns=[QUERY_ID_COLUMN], memory_map=True)[QUERY_ID_COLUMN].to_pandas()
+
+    def ingest(self, source, selected_schema, force=False):
+        """Appends query-log rows that arrived since the last ingest.
+
+        Rows from INGEST_OVERLAP before the watermark on are fetched again;
+        those whose query id is already stored are dropped. Returns the
+        number of new rows.
+        """
+        with self._lock:
+            last_ingest = self._last_ingest.get(selected_schema)
+            if not force and last_ingest is not None and time.monotonic() - last_ingest < self.min_ingest_interval:
+                return 0
+
+            self._drop_unkeyed(selected_schema)
+            watermark = self.watermark(selected_schema)
+            since = watermark - INGEST_OVERLAP if watermark is not None else datetime.now() - self.retention
+            fetched = source.fetch_query_log_since(selected_schema, since)
+            new_rows = fetched.drop_duplicates(QUERY_ID_COLUMN)
+            if not new_rows.empty:
+                new_rows = new_rows[~new_rows[QUERY_ID_COLUMN].isin(self._stored_ids(selected_schema, since))]
+            if not new_rows.empty:
+                days = new_rows['Timestamp'].dt.strftime('%Y-%m-%d')
+                for day, rows in new_rows.groupby(days):
+                    day_dir = os.path.join(self._schema_dir(selected_schema), f"day={day}")
+                    self._write_part(day_dir, rows)
+                    self._compact(day_dir)
+                latest = new_rows['Timestamp'].max().to_pydatetime()
+                self._set_watermark(selected_schema, latest if watermark is None else max(watermark, latest))
+
+            self.evict(selected_schema)
+            self._last_ingest[selected_schema] = time.monotonic()
+            return len(new_rows)
+
+    # --- Reads ---
+
+    def scan(self, selected_schema, columns=None, since=None):
+        """Reads the schema's query log as an Arrow table.
+
+        Only the requested columns are read, and only partitions on or after
+        `since` (default: start of the retention window) are opened.
+        """
+        since = since or datetime.now() - self.retention
+        paths = self._part_paths(selected_schema, since)
+        columns = QUERY_LOG_COLUMNS if columns is None else columns
+        if not paths:
+            return pa.table({column: pa.array([], type=pa.string()) for column in columns})
+        read_columns = list(dict.fromkeys(columns + ['Timestamp']))
+        table = pq.read_table(paths, columns=read_columns, memory_map=True)
+        table = table.filter(pc.greater_equal(table['Timestamp'], pa.scalar(since, type=table['Timestamp'].type)))
+        return table.select(columns)
+
+    def query_log(self, selected_schema):
+        return self.scan(selected_schema).to_pandas()
+
+    def usage_totals(self, selected_schema):
+        users = self.scan(selected_schema, columns=['User'])['User']
+        return pd.DataFrame({
+            'Total Queries': [len(users)],
+            'Unique Users': [pc.count_distinct(users).as_py() if len(users) else 0],
+        })
+
+    def usage_daily(self, selected_schema):
+        timestamps = self.scan(selected_schema, columns=['Timestamp'])['Timestamp']
+        if not len(timestamps):
+            return pd.DataFrame(columns=['Date', 'Number of Queries'])
+        days = pc.floor_temporal(timestamps, unit='day')
+        counts = pa.table({'Date': days}).group_by('Date').aggregate([('Date', 'count')])
+        queries_by_day = counts.to_pandas()
+        queries_by_day.columns = ['Date', 'Number of Queries']
+        return queries_by_day.sort_values('Date').reset_index(drop=True)
+
+    def usage_by_model(self, selected_schema):
+        models = self.scan(selected_schema, columns=['Data Model Queried'])['Data Model Queried']
+        if not len(models):
+            return pd.DataFrame(columns=['Data Model', 'Query Count'])
+        counts = pc.value_counts(models).flatten()
+        by_model = pd.DataFrame({
+            'Data Model': counts[0].to_pylist(),
+            'Query Count': counts[1].to_pylist(),
+        })
+        return by_model.sort_values(['Query Count', 'Data Model'], ascending=[False, True]).reset_index(drop=True)
+
+    def usage_top_models(self, selected_schema, n=5):
+        return self.usage_by_model(selected_schema).head(n)
+
+    def usage_recent(self, selected_schema, n=10):
+        # Newest partitions first; stop once there are enough rows
+        since = datetime.now() - self.retention
+        frames = []
+        for day, day_dir in reversed(self._day_dirs(selected_schema)):
+            if day < since.date().isoformat():
+                break
+            frames.append(pq.read_table(day_dir, columns=QUERY_LOG_COLUMNS, memory_map=True).to_pandas())
+            if sum(len(frame) for frame in frames) >= n:
+                break
+        if not frames:
+            return pd.DataFrame(columns=QUERY_LOG_COLUMNS)
+        recent = pd.concat(frames, ignore_index=True)
+        recent = recent[recent['Timestamp'] >= since]
+        return recent.sort_values('Timestamp', ascending=False).head(n).reset_index(drop=True)
+
+    # --- Pages ---
+
+    def _filtered(self, selected_schema, filters):
+        table = self.scan(selected_schema)
+        for column, condition in (filters or {}).items():
+            if column not in QUERY_LOG_COLUMNS:
+                raise ValueError(f"Can't filter the query log on {column!r}")
+            if isinstance(condition, tuple):
+                op, value = condition
+                if op not in COMPARISONS:
+                    raise ValueError(f"Unknown filter operator {op!r}")
+                table = table.filter(COMPARISONS[op](table[column], value))
+            else:
+                values = pc.cast(table[column], pa.string())
+                table = table.filter(pc.match_substring(values, condition, ignore_case=True))
+        return table
+
+    def count_rows(self, dataset, selected_schema, filters=None):
+        """Like DataSource.count_rows, for the 'usage' query log."""
+        return self._filtered(selected_schema, filters).num_rows
+
+    def fetch_page(self, dataset, selected_schema, sort, descending=False, filters=None, offset=0, limit=50):
+        """Like DataSource.fetch_page, for the 'usage' query log; only the page is converted to pandas."""
+        if sort not in QUERY_LOG_COLUMNS:
+            raise ValueError(f"Can't sort the query log on {sort!r}")
+        table = self._filtered(selected_schema, filters)
+        if offset >= table.num_rows:
+            return table.slice(0, 0).to_pandas()
+        sort_keys = [(sort, 'descending' if descending else 'ascending'), (QUERY_LOG_COLUMNS[0], 'ascending')]
+        if offset + limit <= table.num_rows // 100:
+            # Early pages only need the first offset + limit rows ordered, not the whole log
+            indices = pc.select_k_unstable(table, k=offset + limit, sort_keys=sort_keys)
+        else:
+            indices = pc.sort_indices(table, sort_keys=sort_keys)
+        return table.take(indices[offset:offset + limit]).to_pandas()
+
+    def _load(self, source, dataset, selected_schema):
+        self.ingest(source, selected_schema)
+        return getattr(self, dataset)(selected_schema)
+
+    def loaders(self, source):
+        """Returns DashboardData loaders for the usage datasets, fed incrementally from `source`."""
+        return {
+            dataset: partial(self._load, source, dataset)
+            for dataset in ['usage_totals', 'usage_daily', 'usage_top_models', 'usage_by_model', 'usage_recent']
+        }
+
+
+def create_query_log_store():
+    """Returns a QueryLogStore rooted at $SNOWFLAKE_MONITORING_QUERY_LOG_DIR, or None if unset."""
+    root = os.environ.get(QUERY_LOG_DIR_ENV)
+    return QueryLogStore(root) if root else None
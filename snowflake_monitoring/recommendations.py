@@ -0,0 +1,290 @@
+import json
+import operator
+import os
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from tabs.quality_tab import STALE, compute_freshness
+
+# Optional JSON file of rules; entries replace the built-in rule with the same
+# id (e.g. to change a threshold or severity) or add new ones
+RULES_FILE_ENV = "SNOWFLAKE_MONITORING_RULES"
+
+SEVERITIES = ['high', 'medium', 'low']
+SCOPES = ['model', 'schema']
+
+# Credits over this many days are what a recommendation's impact is estimated from
+IMPACT_WINDOW = timedelta(days=30)
+CREDITS_COLUMN = 'Credits (30d)'
+
+# Each rule fires for every row where all of its `when` conditions hold.
+# Conditions are (column, operator, threshold); 'isnull' takes no threshold.
+# Columns are those in MODEL_COLUMNS / SCHEMA_COLUMNS; text columns only
+# support == and !=.
+# Model rules run on one row per data model, schema rules on one row of
+# schema-wide aggregates. A rule's estimated impact is `impact` times the
+# credits of the rows it fires for.
+RULES = [
+    {
+        'id': 'unused_model', 'scope': 'model', 'category': 'Cost', 'severity': 'high',
+        'when': [(CREDITS_COLUMN, '>', 0), ('Query Count (7d)', '==', 0)],
+        'impact': 1.0,
+        'message': "Materialized but not queried in the last 7 days. Consider dropping it or refreshing it less often.",
+    },
+    {
+        'id': 'disk_spilling', 'scope': 'model', 'category': 'Performance', 'severity': 'medium',
+        'when': [('Disk Spilling Occurrences (Last 24h)', '>', 0)],
+        'impact': 0.2,
+        'message': "Queries spill to disk. Review query logic and consider warehouse scaling if appropriate.",
+    },
+    {
+        'id': 'poor_partition_pruning', 'scope': 'model', 'category': 'Performance', 'severity': 'medium',
+        'when': [('Poor Partition Pruning', '==', True)],
+        'impact': 0.15,
+        'message': "Poor partition pruning. Investigate query patterns and table clustering.",
+    },
+    {
+        'id': 'slow_queries', 'scope': 'model', 'category': 'Performance', 'severity': 'low',
+        'when': [('Avg Query Duration (s)', '>', 30)],
+        'impact': 0.1,
+        'message': "Average query duration above 30s. Check whether it is worth clustering or pre-aggregating.",
+    },
+    {
+        'id': 'stale_model', 'scope': 'model', 'category': 'Quality', 'severity': 'high',
+        'when': [('Is Stale', '==', True)],
+        'impact': 0.0,
+        'message': "Past its source's freshness threshold. Verify the refresh schedule and investigate any failures.",
+    },
+    {
+        'id': 'undocumented_model', 'scope': 'model', 'category': 'Governance', 'severity': 'low',
+        'when': [('Has Documentation', '==', False)],
+        'impact': 0.0,
+        'message': "No Snowflake comment. Add a description to improve discoverability.",
+    },
+    {
+        'id': 'low_documentation_coverage', 'scope': 'schema', 'category': 'Governance', 'severity': 'medium',
+        'when': [('Documentation Coverage (%)', '<', 80)],
+        'impact': 0.0,
+        'message': "Less than 80% of models are documented. Prioritize adding comments to undocumented models.",
+    },
+]
+
+OPERATORS = {
+    '>': np.greater,
+    '>=': np.greater_equal,
+    '<': np.less,
+    '<=': np.less_equal,
+    '==': np.equal,
+    '!=': np.not_equal,
+}
+
+# Text columns are compared as Python values rather than as floats
+TEXT_OPERATORS = {'==': operator.eq, '!=': operator.ne}
+
+# Columns rules can test, by scope, with the kind of value each holds
+MODEL_COLUMNS = {
+    'Data Model': 'text',
+    CREDITS_COLUMN: 'number',
+    'Query Count (7d)': 'number',
+    'Has Documentation': 'bool',
+    'Owner': 'text',
+    'Poor Partition Pruning': 'bool',
+    'Disk Spilling Occurrences (Last 24h)': 'number',
+    'Avg Query Duration (s)': 'number',
+    'Hours Since Last Refresh': 'number',
+    'Is Stale': 'bool',
+}
+SCHEMA_COLUMNS = {
+    CREDITS_COLUMN: 'number',
+    'Documentation Coverage (%)': 'number',
+}
+KIND_OPERATORS = {'number': set(OPERATORS), 'bool': set(TEXT_OPERATORS), 'text': set(TEXT_OPERATORS)}
+
+RECOMMENDATION_COLUMNS = [
+    'Rule', 'Category', 'Severity', 'Data Model', 'Recommendation', CREDITS_COLUMN, 'Estimated Impact (Credits)',
+]
+
+
+def _is_kind(value, kind):
+    if kind == 'bool':
+        return isinstance(value, (bool, np.bool_))
+    if kind == 'number':
+        return isinstance(value, (int, float, np.number)) and not isinstance(value, (bool, np.bool_))
+    return isinstance(value, str)
+
+
+def validate_rule(rule):
+    """Returns what is wrong with a rule, as a list of messages (empty if it is valid)."""
+    problems = [f"missing '{key}'" for key in ['severity', 'category', 'message', 'when'] if key not in rule]
+    if 'severity' in rule and rule['severity'] not in SEVERITIES:
+        problems.append(f"severity {rule['severity']!r} is not one of {SEVERITIES}")
+    scope = rule.get('scope', 'model')
+    if scope not in SCOPES:
+        problems.append(f"scope {scope!r} is not one of {SCOPES}")
+    if not _is_kind(rule.get('impact', 0.0), 'number'):
+        problems.append(f"impact {rule['impact']!r} is not a number")
+    if not rule.get('when', [None]):
+        problems.append("'when' has no conditions")
+    columns = SCHEMA_COLUMNS if scope == 'schema' else MODEL_COLUMNS
+    for condition in rule.get('when', []):
+        if not isinstance(condition, (list, tuple)) or len(condition) not in (2, 3):
+            problems.append(f"condition {condition!r} is not [column, operator, threshold]")
+            continue
+        column, op, *threshold = condition
+        kind = columns.get(column)
+        if kind is None:
+            problems.append(f"unknown {scope} column {column!r}")
+        elif op == 'isnull':
+            if threshold:
+                problems.append(f"'isnull' on {column!r} takes no threshold")
+        elif op not in KIND_OPERATORS[kind]:
+            problems.append(f"operator {op!r} can't be used on {kind} column {column!r}")
+        elif not threshold or not _is_kind(threshold[0], kind):
+            problems.append(f"{column!r} {op} needs a {kind} threshold, got {threshold[0] if threshold else None!r}")
+    return problems
+
+
+def load_rules(path=None):
+    """Returns the built-in RULES, overridden by the JSON rules file if one is configured.
+
+    Raises ValueError naming every invalid rule, so a typo in the rules file
+    is reported rather than silently never firing.
+    """
+    path = path or os.environ.get(RULES_FILE_ENV)
+    rules = {rule['id']: rule for rule in RULES}
+    if path:
+        with open(path) as f:
+            for rule in json.load(f):
+                if 'id' not in rule:
+                    raise ValueError(f"Invalid rules in {path}: a rule has no 'id': {rule!r}")
+                rules[rule['id']] = {**rules.get(rule['id'], {}), **rule}
+    problems = [
+        f"rule {rule_id!r}: {problem}" for rule_id, rule in rules.items() for problem in validate_rule(rule)
+    ]
+    if problems:
+        raise ValueError(f"Invalid rules in {path or 'RULES'}:\n" + "\n".join(f"- {problem}" for problem in problems))
+    return [{**rule, 'when': [tuple(condition) for condition in rule['when']]} for rule in rules.values()]
+
+
+# --- Metrics ---
+
+def build_model_metrics(cost_daily, usage_by_model, governance_data, performance_data, quality_data, now=None):
+    """Joins the datasets into one row per data model, with the columns the rules refer to."""
+    now = now or datetime.now()
+    frames = []
+    if not cost_daily.empty:
+        recent = cost_daily[cost_daily['Date'] >= now - IMPACT_WINDOW]
+        frames.append(recent.groupby('Data Model')['Materialization Cost (Credits)'].sum().rename(CREDITS_COLUMN))
+    if not usage_by_model.empty:
+        frames.append(usage_by_model.set_index('Data Model')['Query Count'].rename('Query Count (7d)'))
+    if not governance_data.empty:
+        frames.append(governance_data.set_index('Data Model')[['Has Documentation', 'Owner']])
+    if not performance_data.empty:
+        frames.append(performance_data.set_index('Data Model')[
+            ['Poor Partition Pruning', 'Disk Spilling Occurrences (Last 24h)', 'Avg Query Duration (s)']
+        ])
+    if not quality_data.empty:
+        freshness = compute_freshness(quality_data[['Data Model', 'Last Refreshed', 'Source System']], now=now)
+        freshness['Is Stale'] = freshness['Freshness'] == STALE
+        frames.append(freshness.set_index('Data Model')[['Hours Since Last Refresh', 'Is Stale']])
+    if not frames:
+        return pd.DataFrame(columns=['Data Model'])
+
+    metrics = pd.concat(frames, axis=1, join='outer')
+    metrics.index.name = 'Data Model'
+    # A model missing from a dataset had no credits / queries; usage is only
+    # known to be zero if the usage dataset itself loaded
+    if CREDITS_COLUMN in metrics:
+        metrics[CREDITS_COLUMN] = metrics[CREDITS_COLUMN].fillna(0)
+    if 'Query Count (7d)' in metrics:
+        metrics['Query Count (7d)'] = metrics['Query Count (7d)'].fillna(0)
+    return metrics.reset_index()
+
+
+def build_schema_metrics(metrics):
+    """One row of schema-wide aggregates for the schema-scoped rules."""
+    row = {'Data Model': None}
+    if CREDITS_COLUMN in metrics:
+        row[CREDITS_COLUMN] = metrics[CREDITS_COLUMN].sum()
+    if 'Has Documentation' in metrics:
+        documented = metrics['Has Documentation'].dropna().astype(bool)
+        row['Documentation Coverage (%)'] = documented.mean() * 100 if len(documented) else np.nan
+    return pd.DataFrame([row])
+
+
+# --- Evaluation ---
+
+def evaluate_rules(metrics, rules):
+    """Returns one row per (rule, matching row) of `metrics`.
+
+    Conditions that share a column and operator are compared against all of
+    their thresholds in a single broadcast, and each rule then combines its
+    conditions with one matrix product, so the cost grows with the number of
+    distinct columns rather than the number of rules.
+    """
+    if metrics.empty or not rules:
+        return pd.DataFrame(columns=RECOMMENDATION_COLUMNS)
+
+    conditions = list(dict.fromkeys(condition for rule in rules for condition in rule['when']))
+    position = {condition: i for i, condition in enumerate(conditions)}
+    condition_hits = np.zeros((len(metrics), len(conditions)), dtype=np.float32)
+
+    groups = {}
+    for i, (column, op, *threshold) in enumerate(conditions):
+        groups.setdefault((column, op), []).append((i, threshold[0] if threshold else None))
+    for (column, op), members in groups.items():
+        if column not in metrics:
+            continue
+        indices = [i for i, _ in members]
+        values = metrics[column]
+        if op == 'isnull':
+            condition_hits[:, indices] = values.isna().to_numpy()[:, None]
+            continue
+        present = values.notna().to_numpy()
+        if any(isinstance(threshold, str) for _, threshold in members):
+            thresholds = np.array([threshold for _, threshold in members], dtype=object)
+            matched = TEXT_OPERATORS[op](values.to_numpy(dtype=object)[:, None], thresholds[None, :])
+            condition_hits[:, indices] = matched.astype(bool) & present[:, None]
+            continue
+        thresholds = np.array([threshold for _, threshold in members], dtype=float)
+        numbers = values.astype(float).to_numpy()
+        with np.errstate(invalid='ignore'):
+            condition_hits[:, indices] = OPERATORS[op](numbers[:, None], thresholds[None, :]) & present[:, None]
+
+    # float32 so the product runs through BLAS; the counts stay exact
+    incidence = np.zeros((len(conditions), len(rules)), dtype=np.float32)
+    for r, rule in enumerate(rules):
+        for condition in rule['when']:
+            incidence[position[condition], r] = 1
+    fired = (condition_hits @ incidence) == incidence.sum(axis=0)
+    rows, rule_indices = np.nonzero(fired)
+
+    credits = metrics[CREDITS_COLUMN].to_numpy(dtype=float)[rows] if CREDITS_COLUMN in metrics else np.zeros(len(rows))
+    impact = np.array([rule.get('impact', 0.0) for rule in rules])[rule_indices]
+    return pd.DataFrame({
+        'Rule': np.array([rule['id'] for rule in rules], dtype=object)[rule_indices],
+        'Category': np.array([rule['category'] for rule in rules], dtype=object)[rule_indices],
+        'Severity': pd.Categorical(
+            np.array([rule['severity'] for rule in rules], dtype=object)[rule_indices], categories=SEVERITIES, ordered=True
+        ),
+        'Data Model': metrics['Data Model'].to_numpy()[rows],
+        'Recommendation': np.array([rule['message'] for rule in rules], dtype=object)[rule_indices],
+        CREDITS_COLUMN: credits.round(2),
+        'Estimated Impact (Credits)': (credits * impact).round(2),
+    }, columns=RECOMMENDATION_COLUMNS)
+
+
+def compute_recommendations(cost_daily, usage_by_model, governance_data, performance_data, quality_data, rules=None):
+    """Evaluates every rule for the schema, ranked by estimated credit impact then severity."""
+    rules = load_rules() if rules is None else rules
+    metrics = build_model_metrics(cost_daily, usage_by_model, governance_data, performance_data, quality_data)
+    recommendations = pd.concat([
+        evaluate_rules(metrics, [rule for rule in rules if rule.get('scope', 'model') == 'model']),
+        evaluate_rules(build_schema_metrics(metrics), [rule for rule in rules if rule.get('scope') == 'schema']),
+    ], ignore_index=True)
+    recommendations['Severity'] = pd.Categorical(recommendations['Severity'], categories=SEVERITIES, ordered=True)
+    return recommendations.sort_values(
+        ['Estimated Impact (Credits)', 'Severity', 'Rule', 'Data Model'], ascending=[False, True, True, True]
+    ).reset_index(drop=True)
@@ -0,0 +1,111 @@
+"""Precomputes every dashboard dataset for every schema and writes a snapshot.
+
+The dashboard reads the newest snapshot when SNOWFLAKE_MONITORING_SNAPSHOT_DIR
+is set, so page loads no longer wait on the warehouse and extra viewers cost
+it nothing. Run from this directory, next to snowflake_dashboard.py:
+
+    python -m refresh --snapshot-dir snapshots              # once
+    python -m refresh --snapshot-dir snapshots --interval 900   # every 15 minutes
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+
+from catalog import create_catalog_index
+from cost_history import create_cost_history_store
+from dashboard_data import AVAILABLE_SCHEMAS, DERIVED_DATASETS, LAZY_DATASETS, DashboardData
+from data_sources import create_data_source
+from query_log_store import create_query_log_store
+from snapshot_store import DEFAULT_KEEP, SNAPSHOT_DIR_ENV, SnapshotStore
+
+logger = logging.getLogger("snowflake_monitoring.refresh")
+
+
+def refresh_once(source, snapshot_store, schemas, query_log_store=None, cost_history_store=None):
+    """Loads all datasets for each schema and writes them as one snapshot version.
+
+    Nothing is written if any load fails, so the dashboard keeps serving the
+    previous complete snapshot.
+    """
+    loaders = source.loaders()
+    if query_log_store is not None:
+        loaders.update(query_log_store.loaders(source))
+
+    frames_by_schema = {}
+    failures = {}
+    for selected_schema in schemas:
+        data = DashboardData(selected_schema, loaders=loaders)
+        data.prefetch()
+        # Derived datasets (e.g. recommendations) are stored too, so the dashboard doesn't recompute them
+        frames_by_schema[selected_schema] = {
+            name: data.get(name) for name in [*loaders, *DERIVED_DATASETS] if name not in LAZY_DATASETS
+        }
+        for name, error in data.errors.items():
+            failures[f"{selected_schema}.{name}"] = error
+        slowest = max(data.timings, key=data.timings.get)
+        logger.info("Loaded %s in %.2fs (slowest: %s)", selected_schema, max(data.timings.values()), slowest)
+        if cost_history_store is not None:
+            try:
+                cost_history_store.update(source, selected_schema, force=True)
+            except Exception as e:
+                failures[f"{selected_schema}.cost_history"] = e
+
+    if failures:
+        raise RuntimeError(f"Snapshot not written; failed loads: {failures}")
+    return snapshot_store.write(frames_by_schema)
+
+
+def current_schemas(catalog, source, requested=None, force=False):
+    """Refreshes the catalog and returns the schemas to precompute this round.
+
+    If the catalog can't be refreshed, the schemas it already indexed are used.
+    """
+    try:
+        catalog.refresh(source, force=force)
+    except Exception:
+        logger.exception("Catalog refresh failed; using the schemas indexed so far")
+    return requested or catalog.schemas() or AVAILABLE_SCHEMAS
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--snapshot-dir", default=os.environ.get(SNAPSHOT_DIR_ENV, "snapshots"),
+                        help=f"Snapshot directory (default: ${SNAPSHOT_DIR_ENV} or ./snapshots)")
+    parser.add_argument("--schema", action="append", dest="schemas",
+                        help="DATABASE.SCHEMA to precompute; repeat for several (default: every schema in the catalog)")
+    parser.add_argument("--interval", type=float, default=0,
+                        help="Seconds between refreshes; 0 refreshes once and exits")
+    parser.add_argument("--keep", type=int, default=DEFAULT_KEEP, help="Snapshot versions to keep")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    source = create_data_source()
+    query_log_store = create_query_log_store()
+    cost_history_store = create_cost_history_store()
+    snapshot_store = SnapshotStore(args.snapshot_dir, keep=args.keep)
+    # Each round refreshes the catalog itself, so it shouldn't be throttled like the dashboard's
+    catalog = create_catalog_index(min_refresh_interval=0)
+
+    first_round = True
+    while True:
+        started = time.monotonic()
+        # Re-resolved every round, so a long-running refresher picks up new schemas;
+        # the first round reloads the catalog fully, later ones incrementally
+        schemas = current_schemas(catalog, source, args.schemas, force=first_round)
+        first_round = False
+        try:
+            manifest = refresh_once(source, snapshot_store, schemas, query_log_store, cost_history_store)
+            logger.info("Wrote snapshot %s for %d schema(s)", manifest['version'], len(schemas))
+        except Exception:
+            logger.exception("Refresh failed")
+            if not args.interval:
+                return 1
+        if not args.interval:
+            return 0
+        time.sleep(max(0, args.interval - (time.monotonic() - started)))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
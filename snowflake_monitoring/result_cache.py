@@ -0,0 +1,124 @@
+import threading
+import time
+from collections import OrderedDict
+
+# How long a cached result stays fresh, per dataset (seconds).
+# Cost and governance change slowly; usage and performance should stay close to live.
+DEFAULT_TTLS = {
+    'cost': 6 * 60 * 60,
+    'cost_monthly': 6 * 60 * 60,
+    'cost_daily': 6 * 60 * 60,
+    'governance': 6 * 60 * 60,
+    'usage_totals': 5 * 60,
+    'usage_daily': 5 * 60,
+    'usage_top_models': 5 * 60,
+    'usage_by_model': 5 * 60,
+    'usage_recent': 5 * 60,
+    'performance': 5 * 60,
+    'quality': 15 * 60,
+    'recommendations': 15 * 60,
+    'compare_cost': 6 * 60 * 60,
+    'compare_usage': 5 * 60,
+    'compare_usage_daily': 5 * 60,
+    'compare_tables': 15 * 60,
+}
+DEFAULT_TTL = 5 * 60
+
+
+def _copy(value):
+    # Frames are copied so callers can't mutate the cached one; plain values such as row counts are immutable
+    return value.copy() if hasattr(value, 'copy') else value
+
+
+class ResultCache:
+    """Process-wide LRU cache of loader results with a TTL per dataset.
+
+    Entries are keyed on (dataset, schema, version), where version names the
+    data the result came from (live queries or a snapshot). Concurrent misses
+    for the same key wait for a single load instead of each querying the
+    warehouse. Entries expire their dataset's TTL after they were stored;
+    hits don't extend it.
+
+    With copy=False cached values are returned as they are rather than
+    copied, for values callers never modify.
+    """
+
+    def __init__(self, ttls=None, max_entries=256, clock=time.monotonic, copy=True):
+        self.ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self.max_entries = max_entries
+        self.copy = copy
+        self.clock = clock
+        self._entries = OrderedDict()
+        self._key_locks = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _result(self, value):
+        return _copy(value) if self.copy else value
+
+    def ttl_for(self, dataset):
+        return self.ttls.get(dataset, DEFAULT_TTL)
+
+    def _lookup(self, key):
+        # Caller must hold self._lock
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if self.clock() >= expires_at:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def get_or_load(self, dataset, schema, version, loader):
+        """Returns the cached result for the key, calling loader() on a miss."""
+        key = (dataset, schema, version)
+        with self._lock:
+            value = self._lookup(key)
+            if value is not None:
+                self.hits += 1
+                return self._result(value)
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            # Another thread may have loaded the key while we were waiting
+            with self._lock:
+                value = self._lookup(key)
+                if value is not None:
+                    self.hits += 1
+                    return self._result(value)
+                self.misses += 1
+
+            value = loader()
+
+            with self._lock:
+                self._entries[key] = (self.clock() + self.ttl_for(dataset), value)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+                self._key_locks.pop(key, None)
+        return self._result(value)
+
+    def invalidate(self, dataset=None, schema=None):
+        """Drops entries matching the given dataset and/or schema (all if neither)."""
+        with self._lock:
+            stale = [
+                key for key in self._entries
+                if (dataset is None or key[0] == dataset) and (schema is None or key[1] == schema)
+            ]
+            for key in stale:
+                del self._entries[key]
+        return len(stale)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+            }
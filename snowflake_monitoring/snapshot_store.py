@@ -0,0 +1,102 @@
+import json
+import os
+import shutil
+import uuid
+from datetime import datetime, timezone
+from functools import partial
+
+import pandas as pd
+
+# Directory of the snapshots written by refresh.py; unset means the dashboard queries live
+SNAPSHOT_DIR_ENV = "SNOWFLAKE_MONITORING_SNAPSHOT_DIR"
+
+# Number of snapshot versions kept on disk; readers of an older version keep working until it is pruned
+DEFAULT_KEEP = 5
+
+
+class SnapshotStore:
+    """Versioned on-disk snapshots of every dashboard dataset for every schema.
+
+    Layout: <root>/<version>/<schema>/<dataset>.parquet plus a manifest.json
+    per version, and a LATEST file naming the newest complete version. A
+    version is written under a temporary name and renamed into place, so
+    readers never see a partial snapshot.
+    """
+
+    def __init__(self, root, keep=DEFAULT_KEEP):
+        self.root = root
+        self.keep = keep
+        os.makedirs(root, exist_ok=True)
+
+    def _latest_path(self):
+        return os.path.join(self.root, "LATEST")
+
+    def _versions(self):
+        """Complete snapshot versions on disk, oldest first."""
+        return sorted(
+            name for name in os.listdir(self.root)
+            if not name.startswith(".") and os.path.isfile(os.path.join(self.root, name, "manifest.json"))
+        )
+
+    def write(self, frames_by_schema):
+        """Writes {schema: {dataset: DataFrame}} as a new version and marks it latest.
+
+        Returns the new version's manifest.
+        """
+        created_at = datetime.now(timezone.utc)
+        version = f"{created_at:%Y%m%dT%H%M%SZ}-{uuid.uuid4().hex[:6]}"
+        tmp_dir = os.path.join(self.root, f".tmp-{version}")
+        for selected_schema, frames in frames_by_schema.items():
+            schema_dir = os.path.join(tmp_dir, selected_schema)
+            os.makedirs(schema_dir)
+            for dataset, df in frames.items():
+                df.to_parquet(os.path.join(schema_dir, f"{dataset}.parquet"), index=False)
+
+        manifest = {
+            'version': version,
+            'created_at': created_at.isoformat(timespec='seconds'),
+            'schemas': sorted(frames_by_schema),
+            'datasets': sorted({dataset for frames in frames_by_schema.values() for dataset in frames}),
+        }
+        with open(os.path.join(tmp_dir, "manifest.json"), "w") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_dir, os.path.join(self.root, version))
+
+        tmp_latest = self._latest_path() + ".tmp"
+        with open(tmp_latest, "w") as f:
+            f.write(version)
+        os.replace(tmp_latest, self._latest_path())
+
+        self.prune()
+        return manifest
+
+    def prune(self):
+        """Deletes all but the newest `keep` versions."""
+        for version in self._versions()[:-self.keep]:
+            shutil.rmtree(os.path.join(self.root, version), ignore_errors=True)
+
+    def latest(self):
+        """Returns the manifest of the newest snapshot, or None if there is none."""
+        try:
+            with open(self._latest_path()) as f:
+                version = f.read().strip()
+            with open(os.path.join(self.root, version, "manifest.json")) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def load(self, version, dataset, selected_schema):
+        return pd.read_parquet(os.path.join(self.root, version, selected_schema, f"{dataset}.parquet"))
+
+    def loaders(self, version):
+        """Returns DashboardData loaders reading the given version."""
+        manifest_path = os.path.join(self.root, version, "manifest.json")
+        with open(manifest_path) as f:
+            datasets = json.load(f)['datasets']
+        return {dataset: partial(self.load, version, dataset) for dataset in datasets}
+
+
+def create_snapshot_store():
+    """Returns a SnapshotStore rooted at $SNOWFLAKE_MONITORING_SNAPSHOT_DIR, or None if unset."""
+    root = os.environ.get(SNAPSHOT_DIR_ENV)
+    return SnapshotStore(root) if root else None
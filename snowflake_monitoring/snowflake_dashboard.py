@@ -1,8 +1,13 @@
 import streamlit as st
-import pandas as pd
-import altair as alt
-import numpy as np
-from datetime import datetime, timedelta
+
+from catalog import create_catalog_index
+from cost_history import create_cost_history_store
+from dashboard_data import AVAILABLE_SCHEMAS, LIVE_VERSION, PAGE_CACHE_ENTRIES, DashboardData
+from data_sources import create_data_source
+from instrumentation import RerunProfiler, profiling_enabled
+from query_log_store import create_query_log_store
+from result_cache import ResultCache
+from snapshot_store import create_snapshot_store
 
 # Import tab functions
 from tabs.cost_tab import display_cost_tab
@@ -11,84 +16,201 @@ from tabs.governance_tab import display_governance_tab
 from tabs.performance_tab import display_performance_tab
 from tabs.quality_tab import display_quality_tab
 from tabs.summary_tab import display_summary_tab
+from tabs.comparison_tab import display_comparison_tab
+from tabs.pagination import FramePager
+
+# --- Data Source ---
+# Snowflake when st.secrets["snowflake"] is set, otherwise an offline SQLite
+# stand-in seeded with mock data.
+@st.cache_resource
+def get_data_source():
+    return create_data_source()
+
+# --- Catalog ---
+# Databases, schemas and per-table metadata, indexed locally and refreshed
+# incrementally; feeds the schema search and the governance and quality tabs.
+@st.cache_resource
+def get_catalog_index():
+    return create_catalog_index()
+
+# Most schemas offered by the sidebar selector at once; search narrows the rest
+MAX_SCHEMA_OPTIONS = 100
+
+# --- Local Query Log Store ---
+# Set SNOWFLAKE_MONITORING_QUERY_LOG_DIR to keep an incrementally ingested
+# Parquet copy of the query log; the usage tab then reads from it.
+@st.cache_resource
+def get_query_log_store():
+    return create_query_log_store()
+
+# --- Snapshots ---
+# Set SNOWFLAKE_MONITORING_SNAPSHOT_DIR to read the datasets precomputed by
+# refresh.py instead of querying on every page load.
+@st.cache_resource
+def get_snapshot_store():
+    return create_snapshot_store()
+
+# --- Cost History ---
+# Per-model daily/weekly/monthly credits kept on disk (SNOWFLAKE_MONITORING_COST_HISTORY_DIR),
+# so long trends don't rescan every run
+@st.cache_resource
+def get_cost_history_store():
+    return create_cost_history_store()
+
+def load_cost_trend(selected_schema, months):
+    """Returns (trend, resolution) for the cost tab, pulling new days first.
+
+    With snapshots enabled refresh.py keeps the history current instead, so
+    page loads don't query the warehouse.
+    """
+    store = get_cost_history_store()
+    if get_snapshot_store() is None:
+        store.update(get_data_source(), selected_schema)
+    return store.trend(selected_schema, months)
+
+# --- Result Cache ---
+# One cache per server process, shared by every session and rerun
+@st.cache_resource
+def get_result_cache():
+    return ResultCache()
+
+# Pages and row counts of paged tables, kept apart so paging can't evict datasets
+@st.cache_resource
+def get_page_cache():
+    return ResultCache(max_entries=PAGE_CACHE_ENTRIES)
+
+def snapshot_mode():
+    """True when the datasets come from a snapshot written by refresh.py."""
+    snapshot_store = get_snapshot_store()
+    return snapshot_store is not None and snapshot_store.latest() is not None
+
+def catalog_source():
+    """Where the catalog index refreshes from; None when refresh.py keeps the on-disk index current."""
+    return None if snapshot_mode() else get_data_source()
+
+def page_backend(dataset):
+    """Where a paged table's pages come from; None pages the already loaded frame in memory."""
+    if dataset == 'usage':
+        return get_query_log_store() or get_data_source()
+    return None if snapshot_mode() else get_data_source()
+
+def show_load_failure(data, dataset):
+    """Shows a placeholder when a dataset failed to load. Returns True if it did."""
+    if not data.failed(dataset):
+        return False
+    st.error(f"Could not load {dataset} data: {data.errors[dataset]}")
+    return True
+
+# --- Views ---
+# Each view is a fragment: widgets inside it (e.g. the cost month selector)
+# rerun only that view, not the whole page.
+
+@st.fragment
+def cost_view(data, selected_schema):
+    if not any(show_load_failure(data, name) for name in COST_DATASETS):
+        display_cost_tab(
+            data.cost_monthly,
+            selected_schema,
+            cost_daily=data.cost_daily,
+            load_cost_runs=lambda: data.cost,
+            load_cost_trend=lambda months: load_cost_trend(selected_schema, months),
+        )
+
+@st.fragment
+def usage_view(data, selected_schema):
+    if not any(show_load_failure(data, name) for name in USAGE_DATASETS):
+        display_usage_tab(
+            data.usage_totals,
+            data.usage_daily,
+            data.top_models,
+            data.usage_recent,
+            selected_schema,
+            query_log_pager=data.pager('usage', page_backend('usage')),
+        )
+
+@st.fragment
+def governance_view(data, selected_schema):
+    if not show_load_failure(data, 'governance'):
+        # Paged in memory: the catalog index already holds every row
+        display_governance_tab(data.governance, selected_schema)
+
+@st.fragment
+def performance_view(data, selected_schema):
+    # Live, every table and count is a paged query and the full frame is never
+    # loaded; from a snapshot, the frame is read and paged in memory
+    backend = page_backend('performance')
+    pager = data.pager('performance', backend) if backend else FramePager(data.performance)
+    if show_load_failure(data, 'performance'):
+        return
+    try:
+        display_performance_tab(pager, selected_schema)
+    except Exception as e:
+        st.error(f"Could not load performance data: {e}")
 
-# --- Mock Data Generation ---
-
-def get_mock_cost_data():
-    """Generates mock data for materialization costs."""
-    data = {
-        'Data Model': [f'model_{chr(65+i)}' for i in range(5)],
-        'Materialization Cost (Credits)': np.random.uniform(5, 50, 5).round(2),
-        'Last Run': [datetime.now() - timedelta(hours=i*2) for i in range(5)]
-    }
-    return pd.DataFrame(data)
-
-def get_mock_usage_data():
-    """Generates mock data for schema usage."""
-    users = [f'user_{i}' for i in range(10)]
-    data_models = [f'model_{chr(65+i)}' for i in range(5)]
-    
-    query_log = []
-    for _ in range(100):
-        query_log.append({
-            'Timestamp': datetime.now() - timedelta(minutes=np.random.randint(1, 60*24*7)),
-            'User': np.random.choice(users),
-            'Data Model Queried': np.random.choice(data_models),
-            'Query Type': np.random.choice(['SELECT', 'INSERT', 'UPDATE', 'DELETE'])
-        })
-    return pd.DataFrame(query_log)
-
-def get_mock_governance_data():
-    """Generates mock data for governance metrics."""
-    data = {
-        'Data Model': [f'model_{chr(65+i)}' for i in range(10)],
-        'Has Documentation': np.random.choice([True, False], 10, p=[0.6, 0.4]),
-        'Owner': [f'owner_{chr(97+i)}' for i in range(10)]
-    }
-    return pd.DataFrame(data)
-
-def get_mock_performance_data():
-    """Generates mock data for performance issues."""
-    data = {
-        'Data Model': [f'model_{chr(65+i)}' for i in range(7)],
-        'Poor Partition Pruning': np.random.choice([True, False], 7, p=[0.3, 0.7]),
-        'Disk Spilling Occurrences (Last 24h)': np.random.randint(0, 5, 7),
-        'Avg Query Duration (s)': np.random.uniform(1, 60, 7).round(1)
-    }
-    df = pd.DataFrame(data)
-    # Ensure at least one model has issues for demonstration
-    if not df['Poor Partition Pruning'].any():
-        df.loc[0, 'Poor Partition Pruning'] = True
-    if df['Disk Spilling Occurrences (Last 24h)'].sum() == 0:
-        df.loc[1, 'Disk Spilling Occurrences (Last 24h)'] = np.random.randint(1,5)
-    return df
-
-def get_mock_quality_data():
-    """Generates mock data for data quality/freshness."""
-    data = {
-        'Data Model': [f'model_{chr(65+i)}' for i in range(8)],
-        'Last Refreshed': [datetime.now() - timedelta(hours=np.random.randint(1, 48)) for i in range(8)],
-        'Source System': [f'source_{chr(88+i)}' for i in range(8)]
-    }
-    return pd.DataFrame(data)
-
-# --- Snowflake Connection (Placeholder) ---
-# In a real app, you would use snowflake.connector
-# st.secrets["snowflake"] would store your credentials
-# def get_snowflake_connection():
-# try:
-# conn = snowflake.connector.connect(
-# user=st.secrets["snowflake"]["user"],
-# password=st.secrets["snowflake"]["password"],
-# account=st.secrets["snowflake"]["account"],
-# warehouse=st.secrets["snowflake"]["warehouse"],
-# database=st.secrets["snowflake"]["database"],
-# schema=st.secrets["snowflake"]["schema"] # This might be overridden by user selection
-# )
-# return conn
-# except Exception as e:
-#     st.error(f"Error connecting to Snowflake: {e}")
-#     return None
+@st.fragment
+def quality_view(data, selected_schema):
+    if not show_load_failure(data, 'quality'):
+        display_quality_tab(data.quality, selected_schema)
+
+@st.fragment
+def summary_view(data, selected_schema):
+    # Derived first, so a failed input shows as an error rather than as no recommendations
+    recommendations = data.get('recommendations')
+    display_summary_tab(
+        data.cost_monthly,
+        data.usage_totals,
+        data.governance,
+        data.quality,
+        data.top_models,
+        recommendations,
+        selected_schema,
+        recommendations_error=data.errors.get('recommendations'),
+    )
+
+@st.fragment
+def comparison_view(data, selected_schema):
+    # Loads its own datasets: they are keyed on the set of schemas, not the selected one
+    options = get_catalog_index().schemas() or AVAILABLE_SCHEMAS
+    default = options if len(options) <= 10 else [selected_schema]
+    schemas = st.multiselect("Schemas to compare", options, default=default, key="compare_schemas")
+    if not schemas:
+        st.info("Select at least one schema to compare.")
+        return
+    comparison_loaders = get_data_source().comparison_loaders()
+    comparison_loaders.update(get_catalog_index().comparison_loaders(catalog_source()))
+    comparison = DashboardData(tuple(sorted(schemas)), loaders=comparison_loaders, cache=get_result_cache())
+    comparison.prefetch()
+    if not any(show_load_failure(comparison, name) for name in COMPARISON_DATASETS):
+        display_comparison_tab(
+            comparison.get('compare_cost'),
+            comparison.get('compare_usage'),
+            comparison.get('compare_usage_daily'),
+            comparison.get('compare_tables'),
+            schemas,
+        )
+
+COST_DATASETS = ['cost_monthly', 'cost_daily']
+USAGE_DATASETS = ['usage_totals', 'usage_daily', 'usage_top_models', 'usage_recent']
+# The summary's own datasets plus the inputs of the recommendations it derives
+SUMMARY_DATASETS = [
+    'cost_monthly', 'cost_daily', 'usage_totals', 'usage_top_models', 'usage_by_model',
+    'governance', 'performance', 'quality',
+]
+COMPARISON_DATASETS = ['compare_cost', 'compare_usage', 'compare_usage_daily', 'compare_tables']
+
+# View label -> (datasets it needs, render function)
+VIEWS = {
+    "💰 Cost": (COST_DATASETS, cost_view),
+    "📊 Usage": (USAGE_DATASETS, usage_view),
+    "📜 Governance": (['governance'], governance_view),
+    # Pages through the source itself (see performance_view)
+    "⚡ Performance": ([], performance_view),
+    "✅ Quality": (['quality'], quality_view),
+    "📝 Summary & Recommendations": (
+        SUMMARY_DATASETS, summary_view
+    ),
+    "🔀 Compare Schemas": ([], comparison_view),
+}
 
 # --- App Layout ---
 st.set_page_config(layout="wide", page_title="Snowflake Schema Metrics")
@@ -98,77 +220,105 @@ st.markdown("Visualizing key metrics for your selected Snowflake schema.")
 
 # --- Sidebar (Placeholder for Schema Selection) ---
 st.sidebar.header("Schema Selector")
-# In a real app, you'd query Snowflake for available schemas
-available_schemas = ["SALES_RAW", "MARKETING_DM", "FINANCE_PROD", "HR_ANALYTICS"]
-selected_schema = st.sidebar.selectbox("Select Schema", available_schemas, index=1)
+data_source = get_data_source()
+catalog = get_catalog_index()
+try:
+    if catalog_source() is None:
+        # refresh.py refreshes the on-disk index; only pick up its latest save, so
+        # no rerun (or its daily full reload) queries the warehouse or holds the lock
+        catalog.reload()
+    else:
+        # At most one incremental catalog query per refresh interval, however many reruns
+        catalog.refresh(data_source)
+except Exception as e:
+    st.sidebar.warning(f"Could not refresh the schema catalog: {e}")
+all_schemas = catalog.schemas() or AVAILABLE_SCHEMAS
+schema_search = st.sidebar.text_input("Search schemas", key="schema_search", placeholder="DATABASE.SCHEMA, schema prefix or approximate name")
+schema_options = catalog.search(schema_search, limit=MAX_SCHEMA_OPTIONS) if not catalog.is_empty() else all_schemas
+if not schema_options:
+    st.sidebar.warning(f"No schema matches '{schema_search}'.")
+    schema_options = all_schemas[:MAX_SCHEMA_OPTIONS]
+default_schema = AVAILABLE_SCHEMAS[1] if AVAILABLE_SCHEMAS[1] in schema_options else schema_options[0]
+selected_schema = st.sidebar.selectbox("Select Schema", schema_options, index=schema_options.index(default_schema))
 st.sidebar.info(f"Displaying metrics for schema: **{selected_schema}**")
+if not catalog.is_empty():
+    st.sidebar.caption(
+        f"{len(all_schemas)} schemas in {len(catalog.databases())} database(s) · catalog refreshed {catalog.refreshed_at:.16}"
+    )
 st.sidebar.markdown("---")
-st.sidebar.markdown("This dashboard uses mock data. Replace data fetching functions with your Snowflake queries.")
-
-
-# --- Main Content Tabs ---
-tab_cost, tab_usage, tab_governance, tab_performance, tab_quality, tab_summary = st.tabs([
-    "💰 Cost", "📊 Usage", "📜 Governance", "⚡ Performance", "✅ Quality", "📝 Summary & Recommendations"
-])
-
-# --- 1. Cost Tab ---
-with tab_cost:
-    cost_data = get_mock_cost_data() # Replace with actual Snowflake query
-    display_cost_tab(cost_data, selected_schema)
-
-# --- 2. Usage Tab ---
-with tab_usage:
-    usage_data = get_mock_usage_data() # Replace with actual Snowflake query
-    top_models = display_usage_tab(usage_data, selected_schema) # Capture top_models
-
-# --- 3. Governance Tab ---
-with tab_governance:
-    governance_data = get_mock_governance_data() # Replace with actual Snowflake query
-    display_governance_tab(governance_data, selected_schema)
-
-# --- 4. Performance Tab ---
-with tab_performance:
-    performance_data = get_mock_performance_data() # Replace with actual Snowflake query
-    display_performance_tab(performance_data, selected_schema)
-
-# --- 5. Quality Tab ---
-with tab_quality:
-    quality_data = get_mock_quality_data() # Replace with actual Snowflake query
-    display_quality_tab(quality_data, selected_schema)
-
-# --- 6. Summary & Recommendations Tab ---
-with tab_summary:
-    # Ensure all data is fetched before displaying summary
-    cost_data_summary = get_mock_cost_data() 
-    usage_data_summary = get_mock_usage_data()
-    # top_models should be available from the usage_tab call if it ran
-    # If usage_tab might not run or return top_models, fetch it again or handle None
-    if 'top_models' not in locals() or top_models is None: 
-        # Recalculate if not available, or pass placeholder
-        temp_usage_data_for_summary = get_mock_usage_data()
-        if not temp_usage_data_for_summary.empty:
-            top_models_summary = temp_usage_data_for_summary['Data Model Queried'].value_counts().nlargest(5).reset_index()
-            top_models_summary.columns = ['Data Model', 'Query Count']
-        else:
-            top_models_summary = pd.DataFrame() # Empty DataFrame
-    else:
-        top_models_summary = top_models
+st.sidebar.markdown(f"Data source: **{data_source.description}**")
+snapshot_placeholder = st.sidebar.empty()
 
-    governance_data_summary = get_mock_governance_data()
-    performance_data_summary = get_mock_performance_data()
-    quality_data_summary = get_mock_quality_data()
-    
-    display_summary_tab(
-        cost_data_summary, 
-        usage_data_summary, 
-        governance_data_summary, 
-        performance_data_summary, 
-        quality_data_summary, 
-        top_models_summary, # Pass the potentially recalculated top_models
-        selected_schema
-    )
+result_cache = get_result_cache()
+st.sidebar.markdown("---")
+st.sidebar.subheader("Data Cache")
+if st.sidebar.button("Refresh now", help=f"Drop cached results for {selected_schema} and query again."):
+    result_cache.invalidate(schema=selected_schema)
+    get_page_cache().invalidate(schema=selected_schema)
+    if catalog_source() is not None:
+        try:
+            # Governance and quality are read from the catalog, so it has to catch up too
+            catalog.refresh(data_source, throttle=False)
+        except Exception as e:
+            st.sidebar.warning(f"Could not refresh the schema catalog: {e}")
+# Filled in after the active view has loaded its data
+cache_stats_placeholder = st.sidebar.empty()
+
+loaders = data_source.loaders()
+query_log_store = get_query_log_store()
+if query_log_store is not None:
+    loaders.update(query_log_store.loaders(data_source))
+loaders.update(catalog.loaders(catalog_source()))
+version = LIVE_VERSION
+snapshot_store = get_snapshot_store()
+snapshot = snapshot_store.latest() if snapshot_store is not None else None
+if snapshot is not None:
+    # Drill-downs (lazy datasets) still go to the source; everything else comes from the snapshot.
+    # Keying the cache on the snapshot version picks up a new snapshot as soon as it lands.
+    loaders.update(snapshot_store.loaders(snapshot['version']))
+    version = snapshot['version']
+    snapshot_placeholder.caption(f"Snapshot from {snapshot['created_at']} (version {snapshot['version']})")
+elif snapshot_store is not None:
+    snapshot_placeholder.warning("No snapshot found yet; querying the data source directly.")
+
+# Opt-in per-rerun timings (?profile=1 or SNOWFLAKE_MONITORING_PROFILE=1)
+profiler = RerunProfiler(profiling_enabled())
+# Filled in at the end of the rerun
+timings_placeholder = st.sidebar.empty()
+
+# Each dataset is fetched at most once per rerun and shared between views
+data = DashboardData(selected_schema, loaders=loaders, cache=result_cache, version=version, page_cache=get_page_cache())
+
+# --- Main Content ---
+# Only the active view is computed and sent to the browser
+active_view = st.radio("View", list(VIEWS), horizontal=True, key="active_view", label_visibility="collapsed")
+view_datasets, render_view = VIEWS[active_view]
+
+# Run the view's queries in parallel; page latency is the slowest one, not the sum
+with profiler.stage('fetch', 'view datasets (wall)'):
+    data.prefetch(view_datasets)
+
+with profiler.stage('render', active_view):
+    render_view(data, selected_schema)
+
+cache_stats = result_cache.stats()
+cache_stats_placeholder.caption(
+    f"Hits: {cache_stats['hits']} · Misses: {cache_stats['misses']} · "
+    f"Entries: {cache_stats['entries']} · Evictions: {cache_stats['evictions']}"
+)
+
+profiler.record_loads(data)
+if profiler.enabled:
+    with timings_placeholder.expander("⏱ Profiling (this rerun)", expanded=True):
+        st.dataframe(profiler.timings_frame(), hide_index=True)
+        st.caption("Fetch stages overlap (loads run in parallel). 'Serialize' is time spent in st.dataframe / st.altair_chart; the rest of a render stage is pandas and chart construction.")
+    profiler.emit(schema=selected_schema, cache=cache_stats)
+else:
+    with timings_placeholder.expander("Load timings"):
+        st.dataframe(data.timings_frame(), hide_index=True)
 
 # To run this app:
 # 1. Save as snowflake_dashboard.py
 # 2. Install dependencies: pip install streamlit pandas altair numpy
+#    (plus snowflake-connector-python for the live backend)
 # 3. Run in terminal: streamlit run snowflake_dashboard.py
@@ -0,0 +1,189 @@
+import hashlib
+
+import altair as alt
+import numpy as np
+import pandas as pd
+
+from result_cache import ResultCache
+
+# Hard bound on the rows embedded in any one chart spec, whatever the input size
+MAX_CHART_ROWS = 1000
+# Categories beyond this are folded into a single "Other" bar / series
+DEFAULT_TOP_N = 20
+DEFAULT_MAX_SERIES = 10
+OTHER_LABEL = "Other"
+# Highlighted points drawn over a line chart, at most (the largest values win)
+MAX_HIGHLIGHTS = MAX_CHART_ROWS // 10
+
+# Built charts, keyed on a fingerprint of their input frame plus their parameters,
+# so changed data gets a new key. Each entry expires DEFAULT_TTL after it was
+# built, used or not. Charts are returned uncopied: callers only render them,
+# and Altair's methods return new charts rather than changing one in place.
+_chart_cache = ResultCache(ttls={}, max_entries=128, copy=False)
+
+
+# --- Reduction ---
+
+def frame_fingerprint(df):
+    """Hash of a frame's columns, dtypes and values; equal frames give equal fingerprints."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr([(column, str(dtype)) for column, dtype in df.dtypes.items()]).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def _as_float(values):
+    # LTTB only needs x as a number: timestamps as int64, anything else by position
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values.astype('int64').to_numpy(dtype=float)
+    if pd.api.types.is_numeric_dtype(values):
+        return values.to_numpy(dtype=float)
+    return np.arange(len(values), dtype=float)
+
+
+def lttb(df, x, y, threshold):
+    """Downsamples a series to `threshold` rows with Largest-Triangle-Three-Buckets.
+
+    The first and last points are kept; from every bucket in between, the
+    point forming the largest triangle with the previously kept point and the
+    next bucket's average is kept, so peaks and dips survive. Returns rows of
+    `df` (sorted by x) with all their columns.
+    """
+    df = df[df[y].notna()].sort_values(x, kind='stable')
+    n = len(df)
+    if threshold >= n or threshold < 3:
+        return df
+
+    xs = _as_float(df[x])
+    ys = df[y].to_numpy(dtype=float)
+    every = (n - 2) / (threshold - 2)
+    edges = (np.arange(threshold - 1) * every).astype(int) + 1
+    edges[-1] = n - 1
+
+    selected = np.empty(threshold, dtype=int)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x, avg_y = xs[end:next_end].mean(), ys[end:next_end].mean()
+        area = np.abs((xs[a] - avg_x) * (ys[start:end] - ys[a]) - (xs[a] - xs[start:end]) * (avg_y - ys[a]))
+        a = start + int(area.argmax())
+        selected[i + 1] = a
+    return df.iloc[selected]
+
+
+def top_n_with_other(df, category, value, n=DEFAULT_TOP_N, other_label=OTHER_LABEL):
+    """The n rows with the largest `value`, plus one row summing the rest.
+
+    In the "Other" row numeric columns are summed and timestamps take their
+    latest value; its label says how many categories it folds together.
+    """
+    df = df.sort_values(value, ascending=False, kind='stable')
+    if len(df) <= n:
+        return df
+    top, rest = df.iloc[:n], df.iloc[n:]
+    other = {category: f"{other_label} ({len(rest):,} more)"}
+    for column in rest.columns.drop(category):
+        if pd.api.types.is_datetime64_any_dtype(rest[column]):
+            other[column] = rest[column].max()
+        elif pd.api.types.is_numeric_dtype(rest[column]) and not pd.api.types.is_bool_dtype(rest[column]):
+            other[column] = rest[column].sum()
+    return pd.concat([top, pd.DataFrame([other])], ignore_index=True)
+
+
+def top_series_with_other(df, x, series, value, n=DEFAULT_MAX_SERIES, other_label=OTHER_LABEL):
+    """Keeps the n series with the largest total `value`; the rest are summed per x into one series."""
+    totals = df.groupby(series, observed=True)[value].sum()
+    if len(totals) <= n:
+        return df
+    kept = totals.nlargest(n).index
+    rest = df[~df[series].isin(kept)]
+    other = rest.groupby(x, as_index=False)[value].sum()
+    other[series] = f"{other_label} ({len(totals) - n:,} more)"
+    return pd.concat([df[df[series].isin(kept)], other], ignore_index=True)
+
+
+def downsample_series(df, x, y, series=None, max_rows=MAX_CHART_ROWS):
+    """LTTB per series, splitting `max_rows` evenly between them."""
+    if series is None:
+        return lttb(df, x, y, max_rows)
+    groups = df.groupby(series, observed=True, sort=False)
+    per_series = max(max_rows // max(groups.ngroups, 1), 3)
+    return pd.concat([lttb(group, x, y, per_series) for _, group in groups], ignore_index=True) if groups.ngroups else df
+
+
+# --- Charts ---
+
+def _cached(kind, df, params, build):
+    return _chart_cache.get_or_load(kind, frame_fingerprint(df), params, build)
+
+
+def bar_chart(df, category, value, title=None, tooltip=None, top_n=DEFAULT_TOP_N, value_title=None):
+    """Bars for the top_n categories by value, largest first, with the rest in one "Other" bar."""
+    tooltip = list(tooltip or [category, value])
+    top_n = min(top_n, MAX_CHART_ROWS - 1)
+
+    def build():
+        data = top_n_with_other(df[list(dict.fromkeys([category, value, *tooltip]))], category, value, top_n)
+        return alt.Chart(data).mark_bar().encode(
+            # An explicit order, so the "Other" bar stays last however large it is
+            x=alt.X(f'{category}:N', sort=list(data[category])),
+            y=alt.Y(f'{value}:Q', title=value_title or value),
+            tooltip=tooltip,
+        ).properties(title=title or "")
+
+    return _cached('bar_chart', df, (category, value, title, tuple(tooltip), top_n, value_title), build)
+
+
+def arc_chart(df, category, value, title=None, top_n=DEFAULT_TOP_N, inner_radius=50):
+    """A donut of `value` per category, with categories past top_n folded into "Other"."""
+    top_n = min(top_n, MAX_CHART_ROWS - 1)
+
+    def build():
+        data = top_n_with_other(df[[category, value]], category, value, top_n)
+        return alt.Chart(data).mark_arc(innerRadius=inner_radius).encode(
+            theta=alt.Theta(field=value, type="quantitative"),
+            color=alt.Color(field=category, type="nominal", sort=list(data[category])),
+            tooltip=[category, value],
+        ).properties(title=title or "")
+
+    return _cached('arc_chart', df, (category, value, title, top_n, inner_radius), build)
+
+
+def line_chart(df, x, y, title=None, tooltip=None, color=None, point=False, highlight=None,
+               x_title=None, y_title=None, max_series=DEFAULT_MAX_SERIES):
+    """A time series downsampled with LTTB so it never embeds more than MAX_CHART_ROWS rows.
+
+    With `color`, only the max_series largest series are drawn and the rest
+    are summed into one "Other" series. `highlight` names a boolean column;
+    its True rows are overlaid as red points (the MAX_HIGHLIGHTS largest).
+    """
+    tooltip = list(tooltip or [x, y])
+
+    def build():
+        data = df[list(dict.fromkeys([x, y, *([color] if color else []), *([highlight] if highlight else []), *tooltip]))]
+        if color:
+            data = top_series_with_other(data, x, color, y, max_series)
+        marks = pd.DataFrame(columns=data.columns)
+        if highlight:
+            flagged = data[highlight].fillna(False).astype(bool)
+            marks = data[flagged].nlargest(MAX_HIGHLIGHTS, y)
+        data = downsample_series(data, x, y, color, MAX_CHART_ROWS - len(marks))
+
+        encoding = {
+            'x': alt.X(f'{x}:T', title=x_title or x),
+            'y': alt.Y(f'{y}:Q', title=y_title or y),
+            'tooltip': tooltip,
+        }
+        if color:
+            encoding['color'] = alt.Color(f'{color}:N')
+        chart = alt.Chart(data).mark_line(point=point).encode(**encoding)
+        if highlight and not marks.empty:
+            chart += alt.Chart(marks).mark_point(size=80, filled=True, color='red').encode(
+                x=f'{x}:T', y=f'{y}:Q', tooltip=[column for column in tooltip if column != highlight],
+            )
+        return chart.properties(title=title or "")
+
+    params = (x, y, title, tuple(tooltip), color, point, highlight, x_title, y_title, max_series)
+    return _cached('line_chart', df, params, build)
@@ -0,0 +1,111 @@
+import streamlit as st
+import altair as alt
+import pandas as pd
+
+from tabs.quality_tab import STALE, compute_freshness
+
+# Pixels per schema row in the comparison charts, so 50+ schemas stay legible
+ROW_HEIGHT = 22
+
+
+def compute_schema_comparison(compare_cost, compare_usage, compare_tables, schemas, today=None):
+    """One row per schema with its cost, usage, documentation and freshness metrics.
+
+    Every metric is a grouped aggregate over the batched frames, so the cost
+    grows with the number of rows rather than with the number of schemas.
+    Month-over-month compares the last two complete months, not the partial
+    current one.
+    """
+    comparison = pd.DataFrame(index=pd.Index(list(schemas), name='Schema'))
+
+    if not compare_cost.empty:
+        credits = compare_cost.pivot_table(
+            index='Schema', columns='Month', values='Materialization Cost (Credits)', aggfunc='sum', fill_value=0
+        ).sort_index(axis=1)
+        comparison['Credits (Latest Month)'] = credits.iloc[:, -1]
+        complete = credits.loc[:, credits.columns < (today or pd.Timestamp.now()).replace(day=1).normalize()]
+        if complete.shape[1] >= 2:
+            previous = complete.iloc[:, -2].where(complete.iloc[:, -2] > 0)
+            comparison['Month-over-Month (%)'] = ((complete.iloc[:, -1] - previous) / previous * 100).round(1)
+        comparison['Credits (12 Months)'] = credits.sum(axis=1)
+
+    if not compare_usage.empty:
+        comparison = comparison.join(compare_usage.set_index('Schema')[['Total Queries', 'Unique Users']])
+
+    if not compare_tables.empty:
+        tables = compare_tables.groupby('Schema')
+        comparison['Models'] = tables.size()
+        comparison['Documentation Coverage (%)'] = (tables['Has Documentation'].mean() * 100).round(1)
+        refreshed = compute_freshness(compare_tables[compare_tables['Last Refreshed'].notna()])
+        freshness = refreshed.groupby('Schema')
+        comparison['Stale Models'] = (refreshed['Freshness'] == STALE).groupby(refreshed['Schema']).sum()
+        comparison['Avg Data Age (Hours)'] = freshness['Hours Since Last Refresh'].mean().round(1)
+
+    counts = [column for column in ['Total Queries', 'Unique Users', 'Models', 'Stale Models'] if column in comparison]
+    comparison[counts] = comparison[counts].fillna(0).astype(int)
+    return comparison.reset_index()
+
+
+def _bar_chart(comparison, column, title):
+    return alt.Chart(comparison).mark_bar().encode(
+        x=alt.X(f'{column}:Q', title=column),
+        y=alt.Y('Schema:N', sort='-x', title=None),
+        tooltip=['Schema', column],
+    ).properties(title=title, height=ROW_HEIGHT * len(comparison))
+
+
+def _heatmap(df, period, time_unit, value, title):
+    return alt.Chart(df).mark_rect().encode(
+        x=alt.X(f'{time_unit}({period}):O', title=period),
+        y=alt.Y('Schema:N', title=None),
+        color=alt.Color(f'{value}:Q', title=None),
+        tooltip=['Schema', period, value],
+    ).properties(title=title, height=ROW_HEIGHT * df['Schema'].nunique())
+
+
+def display_comparison_tab(compare_cost, compare_usage, compare_usage_daily, compare_tables, schemas):
+    """Renders cost, usage, documentation and freshness side by side for several schemas."""
+    st.header("Schema Comparison")
+    st.markdown(f"Side-by-side metrics for **{len(schemas)}** schemas, each loaded in one batched query.")
+
+    comparison = compute_schema_comparison(compare_cost, compare_usage, compare_tables, schemas)
+
+    st.subheader("Overview")
+    column_config = {
+        'Documentation Coverage (%)': st.column_config.ProgressColumn(
+            'Documentation Coverage (%)', min_value=0, max_value=100, format="%.1f%%"
+        ),
+        'Month-over-Month (%)': st.column_config.NumberColumn(
+            'Month-over-Month (%)', format="%+.1f%%", help="Last complete month against the one before it."
+        ),
+    }
+    st.dataframe(comparison, column_config=column_config, hide_index=True, height=min(400, 35 * (len(comparison) + 1)))
+
+    col1, col2 = st.columns(2)
+    with col1:
+        if 'Credits (Latest Month)' in comparison:
+            st.altair_chart(_bar_chart(comparison, 'Credits (Latest Month)', "Materialization Cost (Latest Month)"),
+                            use_container_width=True)
+        if 'Documentation Coverage (%)' in comparison:
+            st.altair_chart(_bar_chart(comparison, 'Documentation Coverage (%)', "Documentation Coverage"),
+                            use_container_width=True)
+    with col2:
+        if 'Total Queries' in comparison:
+            st.altair_chart(_bar_chart(comparison, 'Total Queries', "Queries (Last 7 Days)"),
+                            use_container_width=True)
+        if 'Stale Models' in comparison:
+            st.altair_chart(_bar_chart(comparison, 'Stale Models', "Stale Models"),
+                            use_container_width=True)
+
+    st.markdown("---")
+    st.subheader("Trends")
+    if not compare_cost.empty:
+        st.altair_chart(
+            _heatmap(compare_cost, 'Month', 'yearmonth', 'Materialization Cost (Credits)', "Monthly Materialization Cost (Credits)"),
+            use_container_width=True,
+        )
+    if not compare_usage_daily.empty:
+        st.altair_chart(
+            _heatmap(compare_usage_daily, 'Date', 'monthdate', 'Number of Queries', "Daily Queries"),
+            use_container_width=True,
+        )
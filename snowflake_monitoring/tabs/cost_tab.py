@@ -1,69 +1,140 @@
 import streamlit as st
-import altair as alt
 import pandas as pd # Import pandas
 
-def display_cost_tab(cost_data, selected_schema):
+from tabs.charts import DEFAULT_MAX_SERIES, bar_chart, line_chart
+
+# Trend ranges offered, in months
+TREND_RANGES = [1, 3, 6, 12, 24]
+
+
+def display_cost_tab(cost_monthly, selected_schema, cost_daily=None, load_cost_runs=None, load_cost_trend=None):
+    """Renders the cost tab from the per-model monthly (and daily) cost rollups.
+
+    Individual runs are only fetched, through load_cost_runs(), when the user
+    asks for them. load_cost_trend(months) returns (trend, resolution) from the
+    cost history store for the multi-month trend.
+    """
     st.header("Data Model Materialization Costs")
     st.markdown("Overview of compute costs associated with materializing and maintaining data models in the schema. This includes single-shot materializations and costs over time for incremental models and materialized views.")
-    
-    if not cost_data.empty and 'Last Run' in cost_data.columns:
-        # Ensure 'Last Run' is datetime
-        cost_data['Last Run'] = pd.to_datetime(cost_data['Last Run'])
-        cost_data['Month-Year'] = cost_data['Last Run'].dt.strftime('%Y-%m')
-        
-        available_months = sorted(cost_data['Month-Year'].unique(), reverse=True)
-        
-        if not available_months:
-            st.warning("No month data available to select.")
-            return
-
-        selected_month_year = st.selectbox("Select Month:", available_months, key="cost_month_selector")
-        
-        # Filter data based on selected month
-        filtered_cost_data = cost_data[cost_data['Month-Year'] == selected_month_year].copy() # Use .copy() to avoid SettingWithCopyWarning
-
-        if filtered_cost_data.empty:
-            st.warning(f"No cost data available for {selected_month_year}.")
-            return
+
+    if not cost_monthly.empty:
+        # Indexed by month, so picking a month is a lookup rather than a scan of every run
+        rollup = cost_monthly.set_index('Month').sort_index()
+        months = rollup.index.unique().sort_values(ascending=False)
+        # Only the distinct months get formatted
+        month_labels = {month.strftime('%Y-%m'): month for month in months}
+
+        selected_month_year = st.selectbox("Select Month:", list(month_labels), key="cost_month_selector")
+        month_start = month_labels[selected_month_year]
+        month_end = month_start + pd.offsets.MonthBegin(1)
+
+        filtered_cost_data = rollup.loc[[month_start]].reset_index(drop=True)
 
         col1, col2 = st.columns([2,1])
         with col1:
             st.subheader(f"Cost per Data Model ({selected_month_year})")
-            cost_chart = alt.Chart(filtered_cost_data).mark_bar().encode(
-                x=alt.X('Data Model:N', sort='-y'),
-                y=alt.Y('Materialization Cost (Credits):Q', title='Cost (Credits)'),
-                tooltip=['Data Model', 'Materialization Cost (Credits)', 'Last Run', 'Model Type:N']
-            ).properties(
-                title=f"Materialization Costs for {selected_schema} ({selected_month_year})"
+            cost_chart = bar_chart(
+                filtered_cost_data, 'Data Model', 'Materialization Cost (Credits)',
+                title=f"Materialization Costs for {selected_schema} ({selected_month_year})",
+                tooltip=['Data Model', 'Materialization Cost (Credits)', 'Runs', 'Last Run'],
+                value_title='Cost (Credits)',
             )
             st.altair_chart(cost_chart, use_container_width=True)
-        
+
+            if cost_daily is not None and not cost_daily.empty:
+                daily = cost_daily.set_index('Date').sort_index()
+                month_daily = daily.loc[month_start:month_end - pd.Timedelta(microseconds=1)]
+                daily_totals = month_daily.groupby(level='Date')['Materialization Cost (Credits)'].sum().reset_index()
+                daily_chart = line_chart(
+                    daily_totals, 'Date', 'Materialization Cost (Credits)',
+                    title=f"Daily Materialization Cost ({selected_month_year})",
+                    point=True, y_title='Cost (Credits)',
+                )
+                st.altair_chart(daily_chart, use_container_width=True)
+
         with col2:
             total_cost = filtered_cost_data['Materialization Cost (Credits)'].sum()
             st.metric(f"Total Estimated Cost ({selected_month_year})", f"{total_cost:.2f} Credits")
-            
-            if not filtered_cost_data.empty:
-                # Ensure the DataFrame is not empty before trying to find idxmax
-                most_expensive = filtered_cost_data.loc[filtered_cost_data['Materialization Cost (Credits)'].idxmax()]
-                st.markdown(f"""
-                **Most Expensive Model ({selected_month_year}):**
-                - **Name:** {most_expensive['Data Model']}
-                - **Cost:** {most_expensive['Materialization Cost (Credits)']} Credits 
-                """ ) 
-            
+
+            most_expensive = filtered_cost_data.loc[filtered_cost_data['Materialization Cost (Credits)'].idxmax()]
+            st.markdown(f"""
+            **Most Expensive Model ({selected_month_year}):**
+            - **Name:** {most_expensive['Data Model']}
+            - **Cost:** {most_expensive['Materialization Cost (Credits)']} Credits
+            """ )
+
             st.markdown("---")
             st.subheader(f"Detailed Model Costs ({selected_month_year})")
-            display_columns = ['Data Model', 'Last Run', 'Materialization Cost (Credits)']
-            if 'Model Type' in filtered_cost_data.columns:
-                display_columns.insert(1, 'Model Type')
-            # 'Cost Period' might be redundant if we are filtering by 'Month-Year'
-            # but can be kept if it provides additional granularity (e.g. daily within the month)
-            if 'Cost Period' in filtered_cost_data.columns: 
-                display_columns.insert(2, 'Cost Period')
-                
+            display_columns = ['Data Model', 'Runs', 'Last Run', 'Materialization Cost (Credits)']
             st.dataframe(filtered_cost_data[display_columns].sort_values(by="Last Run", ascending=False), height=200)
 
-    elif cost_data.empty:
+        if load_cost_runs is not None and st.toggle(f"Show individual runs ({selected_month_year})", key="cost_show_runs"):
+            runs = load_cost_runs()
+            month_runs = runs[(runs['Last Run'] >= month_start) & (runs['Last Run'] < month_end)]
+            st.dataframe(month_runs.sort_values(by="Last Run", ascending=False), height=300)
+
+        if load_cost_trend is not None:
+            display_cost_trend(cost_daily, load_cost_trend)
+
+    else:
         st.warning("No cost data available.")
+
+
+def month_to_date_change(cost_daily, today=None):
+    """Returns (credits so far this month, credits over the same days of the previous month).
+
+    Comparing the partial current month with a whole previous one would read
+    as a large drop early in every month.
+    """
+    today = pd.Timestamp(today or pd.Timestamp.now()).normalize()
+    month_start = today.replace(day=1)
+    # DateOffset clamps to the previous month's last day (e.g. Mar 31 -> Feb 28)
+    previous_end = today - pd.DateOffset(months=1)
+    dates = cost_daily['Date']
+    credits = cost_daily['Materialization Cost (Credits)']
+    current = credits[(dates >= month_start) & (dates <= today)].sum()
+    previous = credits[(dates >= previous_end.replace(day=1)) & (dates <= previous_end)].sum()
+    return current, previous
+
+
+def display_cost_trend(cost_daily, load_cost_trend):
+    """Month-to-date change plus a per-model trend with anomalous periods marked."""
+    st.markdown("---")
+    st.subheader("Cost Trend")
+
+    if cost_daily is not None and not cost_daily.empty:
+        current, previous = month_to_date_change(cost_daily)
+        st.metric(
+            f"Month to Date ({pd.Timestamp.now():%Y-%m})",
+            f"{current:.2f} Credits",
+            f"{(current - previous) / previous:+.1%}" if previous else None,
+            delta_color="inverse",
+            help="Change against the same days of the previous month.",
+        )
+
+    months = st.select_slider("Trend range (months):", TREND_RANGES, value=12, key="cost_trend_months")
+    trend, resolution = load_cost_trend(months)
+    if trend.empty:
+        st.info("No cost history stored yet.")
+        return
+
+    trend_chart = line_chart(
+        trend, 'Period', 'Materialization Cost (Credits)',
+        title=f"Cost per Data Model by {resolution} (last {months} months)",
+        tooltip=['Period', 'Data Model', 'Materialization Cost (Credits)', 'Anomaly'],
+        color='Data Model', highlight='Anomaly', x_title=resolution.capitalize(), y_title='Cost (Credits)',
+    )
+    st.altair_chart(trend_chart, use_container_width=True)
+    if trend['Data Model'].nunique() > DEFAULT_MAX_SERIES:
+        st.caption(f"The {DEFAULT_MAX_SERIES} most expensive models are drawn; the rest are summed into 'Other'.")
+
+    anomalies = trend[trend['Anomaly']]
+    if anomalies.empty:
+        st.caption(f"No anomalous {resolution}s in this range.")
     else:
-        st.warning("Cost data is missing 'Last Run' column, cannot filter by month.")
+        st.markdown(f"**Anomalous {resolution}s** (cost well above the model's recent average):")
+        st.dataframe(
+            anomalies[['Period', 'Data Model', 'Materialization Cost (Credits)']].sort_values('Period', ascending=False),
+            hide_index=True,
+            height=200,
+        )
@@ -1,11 +1,15 @@
 import streamlit as st
-import altair as alt
+
+from tabs.charts import arc_chart
+from tabs.pagination import FramePager, display_paginated_table
 
 def display_governance_tab(governance_data, selected_schema):
+    """Renders the governance tab; the model lists are browsed a page at a time."""
     st.header("Data Governance Status")
     st.markdown("Documentation and ownership of data models.")
 
     if not governance_data.empty:
+        pager = FramePager(governance_data)
         total_models = len(governance_data)
         documented_models = governance_data['Has Documentation'].sum()
         documentation_percentage = (documented_models / total_models) * 100 if total_models > 0 else 0
@@ -20,24 +24,29 @@ def display_governance_tab(governance_data, selected_schema):
             status_counts.columns = ['Status', 'Count']
             status_counts['Status'] = status_counts['Status'].map({True: 'Documented', False: 'Not Documented'})
             
-            pie_chart = alt.Chart(status_counts).mark_arc(innerRadius=50).encode(
-                theta=alt.Theta(field="Count", type="quantitative"),
-                color=alt.Color(field="Status", type="nominal"),
-                tooltip=['Status', 'Count']
-            ).properties(title="Model Documentation Breakdown")
+            pie_chart = arc_chart(status_counts, 'Status', 'Count', title="Model Documentation Breakdown")
             st.altair_chart(pie_chart, use_container_width=True)
 
         with col2:
             st.subheader("Models Missing Documentation")
-            missing_docs = governance_data[~governance_data['Has Documentation']]
-            if not missing_docs.empty:
-                st.dataframe(missing_docs[['Data Model', 'Owner']], height=280)
+            if documented_models < total_models:
+                display_paginated_table(
+                    "governance_missing_docs", pager, ['Data Model', 'Owner'],
+                    filter_columns=['Owner'], page_size=25, height=200, filters={'Has Documentation': ('==', False)},
+                )
             else:
                 st.success("All models are documented!")
         
         st.markdown("---")
-        st.subheader("Data Model Owners (Sample)")
-        st.dataframe(governance_data[['Data Model', 'Owner']].sample(min(5, len(governance_data))), height=200)
+        st.subheader("Data Model Owners")
+        display_paginated_table(
+            "governance_owners",
+            pager,
+            ['Data Model', 'Owner', 'Has Documentation'],
+            filter_columns=['Owner', 'Data Model'],
+            page_size=25,
+            height=250,
+        )
 
     else:
         st.warning("No governance data available.")
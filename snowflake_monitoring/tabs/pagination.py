@@ -0,0 +1,88 @@
+import math
+import operator
+
+import streamlit as st
+
+PAGE_SIZES = [25, 50, 100, 250]
+
+# Filters are {column: text it must contain} or {column: (operator, value)}
+COMPARISONS = {
+    '==': operator.eq, '!=': operator.ne, '>': operator.gt, '>=': operator.ge, '<': operator.lt, '<=': operator.le,
+}
+
+
+class FramePager:
+    """The pager interface (count / page) over a frame that is already in memory.
+
+    Used when there is no backend to push paging down to, e.g. snapshot or
+    catalog data; only the visible page is still sent to the browser.
+    """
+
+    def __init__(self, df):
+        self.df = df
+
+    def _filtered(self, filters):
+        df = self.df
+        for column, condition in (filters or {}).items():
+            if isinstance(condition, tuple):
+                op, value = condition
+                df = df[COMPARISONS[op](df[column], value).fillna(False).astype(bool)]
+            else:
+                df = df[df[column].astype(str).str.contains(condition, case=False, regex=False, na=False)]
+        return df
+
+    def count(self, filters=None):
+        return len(self._filtered(filters))
+
+    def page(self, sort, descending=False, filters=None, offset=0, limit=50):
+        df = self._filtered(filters).sort_values(sort, ascending=not descending, kind='stable')
+        return df.iloc[offset:offset + limit]
+
+
+def _reset_page(key):
+    st.session_state[f"{key}_page"] = 1
+
+
+def display_paginated_table(key, pager, columns, default_sort=None, descending=False,
+                            filter_columns=(), page_size=50, height=400, column_config=None, filters=None):
+    """Renders a sortable, filterable table that only ever holds one page.
+
+    `pager` provides count(filters) and page(sort, descending, filters,
+    offset, limit); sorting and filtering happen wherever the pager runs them.
+    `filters` always apply, under whatever the user filters on. Widget keys
+    are derived from `key`, so several tables can share a view.
+    """
+    default_sort = default_sort or columns[0]
+    col1, col2, col3, col4 = st.columns([3, 1, 3, 1])
+    sort = col1.selectbox("Sort by", columns, index=columns.index(default_sort), key=f"{key}_sort",
+                          on_change=_reset_page, args=(key,))
+    descending = col2.toggle("Descending", value=descending, key=f"{key}_descending",
+                             on_change=_reset_page, args=(key,))
+    filters = dict(filters or {})
+    if filter_columns:
+        filter_column = col3.selectbox("Filter column", filter_columns, key=f"{key}_filter_column",
+                                       on_change=_reset_page, args=(key,))
+        filter_text = col3.text_input("Contains", key=f"{key}_filter_text", on_change=_reset_page, args=(key,))
+        if filter_text:
+            filters[filter_column] = filter_text
+    page_size = col4.selectbox("Rows", PAGE_SIZES, index=PAGE_SIZES.index(page_size), key=f"{key}_page_size",
+                               on_change=_reset_page, args=(key,))
+
+    total = pager.count(filters)
+    pages = max(math.ceil(total / page_size), 1)
+    page_key = f"{key}_page"
+    st.session_state.setdefault(page_key, 1)
+    if st.session_state[page_key] > pages:
+        st.session_state[page_key] = pages
+    page = st.session_state[page_key]
+    offset = (page - 1) * page_size
+
+    rows = pager.page(sort, descending, filters, offset, page_size)
+    st.dataframe(rows[columns], hide_index=True, height=height, column_config=column_config)
+
+    nav1, nav2 = st.columns([1, 3])
+    nav1.number_input("Page", min_value=1, max_value=pages, step=1, key=page_key)
+    if total:
+        nav2.caption(f"Page {page:,} of {pages:,} · rows {offset + 1:,}–{offset + len(rows):,} of {total:,}")
+    else:
+        nav2.caption("No matching rows.")
@@ -1,32 +1,61 @@
 import streamlit as st
 
-def display_performance_tab(performance_data, selected_schema):
+from tabs.pagination import display_paginated_table
+
+# Filters for the flagged models, run wherever the pager runs them
+PRUNING_ISSUES = {'Poor Partition Pruning': ('==', True)}
+SPILLING = {'Disk Spilling Occurrences (Last 24h)': ('>', 0)}
+
+def display_performance_tab(pager, selected_schema):
+    """Renders the performance tab from `pager`, one page of each table at a time.
+
+    Counts and flagged lists are filtered queries on the pager, so only the
+    visible pages are held in memory; wrap an already loaded frame in a
+    FramePager to render it instead.
+    """
     st.header("Performance Monitoring")
     st.markdown("Identifying potential bottlenecks like poor partition pruning or disk spilling.")
 
-    if not performance_data.empty:
-        models_with_pruning_issues = performance_data[performance_data['Poor Partition Pruning']]
-        models_with_spilling = performance_data[performance_data['Disk Spilling Occurrences (Last 24h)'] > 0]
+    if pager.count():
+        pruning_count = pager.count(PRUNING_ISSUES)
+        spilling_count = pager.count(SPILLING)
 
         col1, col2 = st.columns(2)
         with col1:
             st.subheader("Partition Pruning Issues")
-            if not models_with_pruning_issues.empty:
-                st.warning(f"{len(models_with_pruning_issues)} model(s) flagged for potential partition pruning issues.")
-                st.dataframe(models_with_pruning_issues[['Data Model', 'Avg Query Duration (s)']], height=200)
+            if pruning_count:
+                st.warning(f"{pruning_count} model(s) flagged for potential partition pruning issues.")
+                display_paginated_table(
+                    "performance_pruning", pager,
+                    ['Data Model', 'Avg Query Duration (s)'], default_sort='Avg Query Duration (s)', descending=True,
+                    page_size=25, height=200, filters=PRUNING_ISSUES,
+                )
             else:
                 st.success("No models flagged for partition pruning issues.")
         
         with col2:
             st.subheader("Disk Spilling Occurrences (Last 24h)")
-            if not models_with_spilling.empty:
-                st.error(f"{len(models_with_spilling)} model(s) experienced disk spilling.")
-                st.dataframe(models_with_spilling[['Data Model', 'Disk Spilling Occurrences (Last 24h)']], height=200)
+            if spilling_count:
+                st.error(f"{spilling_count} model(s) experienced disk spilling.")
+                display_paginated_table(
+                    "performance_spilling", pager,
+                    ['Data Model', 'Disk Spilling Occurrences (Last 24h)'],
+                    default_sort='Disk Spilling Occurrences (Last 24h)', descending=True, page_size=25, height=200,
+                    filters=SPILLING,
+                )
             else:
                 st.success("No disk spilling occurrences reported in the last 24 hours.")
         
         st.markdown("---")
         st.subheader("Overall Model Performance Metrics")
-        st.dataframe(performance_data, height=300)
+        display_paginated_table(
+            "performance_table",
+            pager,
+            ['Data Model', 'Poor Partition Pruning', 'Disk Spilling Occurrences (Last 24h)', 'Avg Query Duration (s)'],
+            default_sort='Avg Query Duration (s)',
+            descending=True,
+            filter_columns=['Data Model'],
+            height=300,
+        )
     else:
         st.warning("No performance data available.")
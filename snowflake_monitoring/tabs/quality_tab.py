@@ -1,38 +1,102 @@
+import json
+import os
+
 import streamlit as st
 import pandas as pd
+import numpy as np
 from datetime import datetime
 
+# Optional JSON file of per source system thresholds, e.g. {"source_X": [2, 6]}
+# for a near-real-time feed; entries replace the built-in ones
+FRESHNESS_FILE_ENV = "SNOWFLAKE_MONITORING_FRESHNESS"
+
+# Freshness buckets as (warning after, stale after) hours since the last refresh
+DEFAULT_FRESHNESS_THRESHOLDS = (12, 24)
+# Built-in per source system overrides
+SOURCE_FRESHNESS_THRESHOLDS = {}
+
+FRESH, WARNING, STALE = '🟢 Fresh', '🟡 Warning', '🔴 Stale'
+FRESHNESS_STATUSES = [FRESH, WARNING, STALE]
+
+
+def load_freshness_thresholds(path=None):
+    """Returns SOURCE_FRESHNESS_THRESHOLDS, overridden by the JSON thresholds file if one is configured.
+
+    Raises ValueError naming every source whose thresholds aren't two
+    numbers with the warning one no later than the stale one.
+    """
+    path = path or os.environ.get(FRESHNESS_FILE_ENV)
+    thresholds = dict(SOURCE_FRESHNESS_THRESHOLDS)
+    if not path:
+        return thresholds
+    with open(path) as f:
+        overrides = json.load(f)
+    problems = [
+        f"- {source!r}: {value!r} is not [warning hours, stale hours]"
+        for source, value in overrides.items()
+        if not (isinstance(value, list) and len(value) == 2
+                and all(isinstance(hours, (int, float)) and not isinstance(hours, bool) for hours in value)
+                and value[0] <= value[1])
+    ]
+    if problems:
+        raise ValueError(f"Invalid freshness thresholds in {path}:\n" + "\n".join(problems))
+    thresholds.update({source: tuple(value) for source, value in overrides.items()})
+    return thresholds
+
+
+def compute_freshness(quality_data, now=None, thresholds=None, default_thresholds=DEFAULT_FRESHNESS_THRESHOLDS):
+    """Returns quality_data with 'Hours Since Last Refresh' and a categorical 'Freshness' column.
+
+    Thresholds default to load_freshness_thresholds(). Everything is computed
+    as whole-column operations, so this stays fast for tens of thousands of
+    models; the input frame is left as it is.
+    """
+    thresholds = load_freshness_thresholds() if thresholds is None else thresholds
+    now = now or datetime.now()
+
+    last_refreshed = pd.to_datetime(quality_data['Last Refreshed'])
+    hours = ((now - last_refreshed) / pd.Timedelta(hours=1)).round(1)
+
+    warn_after = quality_data['Source System'].map({s: t[0] for s, t in thresholds.items()}).fillna(default_thresholds[0])
+    stale_after = quality_data['Source System'].map({s: t[1] for s, t in thresholds.items()}).fillna(default_thresholds[1])
+    status = np.select([hours > stale_after, hours > warn_after], [STALE, WARNING], default=FRESH)
+    return quality_data.assign(**{
+        'Last Refreshed': last_refreshed,
+        'Hours Since Last Refresh': hours,
+        'Freshness': pd.Categorical(status, categories=FRESHNESS_STATUSES, ordered=True),
+    })
+
+
 def display_quality_tab(quality_data, selected_schema):
     st.header("Data Freshness & Quality")
     st.markdown("Timeliness of data model refreshes.")
 
     if not quality_data.empty:
-        quality_data['Last Refreshed'] = pd.to_datetime(quality_data['Last Refreshed'])
-        quality_data['Hours Since Last Refresh'] = ((datetime.now() - quality_data['Last Refreshed']).dt.total_seconds() / 3600).round(1)
-        
-        st.subheader("Data Model Freshness")
-        
-        def highlight_stale(row):
-            hours = row['Hours Since Last Refresh']
-            if hours > 24:
-                return ['background-color: #FFCCCB'] * len(row)
-            elif hours > 12:
-                return ['background-color: #FFFFE0'] * len(row)
-            return [''] * len(row)
+        quality_data = compute_freshness(quality_data)
 
+        st.subheader("Data Model Freshness")
+        # A status column instead of per-cell Styler CSS keeps the payload small for large schemas
         st.dataframe(
-            quality_data[['Data Model', 'Last Refreshed', 'Hours Since Last Refresh', 'Source System']]
-            .sort_values(by='Hours Since Last Refresh', ascending=False)
-            .style.apply(highlight_stale, axis=1),
+            quality_data[['Freshness', 'Data Model', 'Last Refreshed', 'Hours Since Last Refresh', 'Source System']]
+            .sort_values(by='Hours Since Last Refresh', ascending=False),
+            column_config={
+                'Freshness': st.column_config.TextColumn(
+                    'Freshness',
+                    help=f"Warning after {DEFAULT_FRESHNESS_THRESHOLDS[0]}h and stale after "
+                         f"{DEFAULT_FRESHNESS_THRESHOLDS[1]}h, unless the source system overrides it "
+                         f"(${FRESHNESS_FILE_ENV}).",
+                ),
+            },
+            hide_index=True,
             height=350
         )
 
         avg_freshness = quality_data['Hours Since Last Refresh'].mean()
-        stale_models_count = len(quality_data[quality_data['Hours Since Last Refresh'] > 24])
-        
+        stale_models_count = int((quality_data['Freshness'] == STALE).sum())
+
         col1, col2 = st.columns(2)
         col1.metric("Average Data Age (Hours)", f"{avg_freshness:.1f}h")
-        col2.metric("Models Stale (>24h)", stale_models_count)
+        col2.metric("Models Stale", stale_models_count)
 
     else:
         st.warning("No data quality/freshness information available.")
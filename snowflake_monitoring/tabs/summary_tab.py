@@ -1,69 +1,87 @@
 import streamlit as st
+import pandas as pd
+from datetime import datetime
 
-def display_summary_tab(cost_data, usage_data, governance_data, performance_data, quality_data, top_models, selected_schema):
+# Sections of the summary, in display order; recommendations are grouped by these categories
+CATEGORIES = [('Cost', "💰"), ('Usage', "📊"), ('Performance', "⚡"), ('Quality', "✅"), ('Governance', "📜")]
+SEVERITY_MESSAGES = {'high': st.error, 'medium': st.warning, 'low': st.info}
+
+
+def summarize_by_rule(recommendations, examples=3):
+    """One row per fired rule: how many models it flags and their total estimated impact."""
+    if recommendations.empty:
+        return pd.DataFrame(columns=['Severity', 'Category', 'Recommendation', 'Models', 'Estimated Impact (Credits)', 'Examples'])
+    by_rule = recommendations.groupby('Rule', sort=False, observed=True).agg(
+        Severity=('Severity', 'first'),
+        Category=('Category', 'first'),
+        Recommendation=('Recommendation', 'first'),
+        Models=('Data Model', 'count'),
+        **{'Estimated Impact (Credits)': ('Estimated Impact (Credits)', 'sum')},
+        Examples=('Data Model', lambda models: ", ".join(models.dropna().astype(str).head(examples))),
+    )
+    return by_rule.sort_values(['Estimated Impact (Credits)', 'Severity'], ascending=[False, True]).reset_index(drop=True)
+
+
+def display_summary_tab(cost_monthly, usage_totals, governance_data, quality_data, top_models, recommendations, selected_schema,
+                        recommendations_error=None):
+    """Renders headline metrics and the rule engine's recommendations, ranked by estimated credit impact.
+
+    With `recommendations_error` (the recommendations couldn't be computed),
+    the metrics that did load are still shown but no section reports all clear.
+    """
     st.header("Summary & Recommendations")
     st.markdown(f"Key observations and actionable insights for the **{selected_schema}** schema based on the (mock) data.")
 
-    # Cost Summary
-    st.subheader("💰 Cost Insights")
-    if not cost_data.empty:
-        total_cost = cost_data['Materialization Cost (Credits)'].sum()
-        most_expensive_model = cost_data.loc[cost_data['Materialization Cost (Credits)'].idxmax()]
-        st.write(f"- The total estimated materialization cost for the last cycle was **{total_cost:.2f} credits**.")
-        st.write(f"- **{most_expensive_model['Data Model']}** is the most expensive model to materialize ({most_expensive_model['Materialization Cost (Credits)']} credits). Consider optimizing its definition or refresh frequency if possible.")
+    by_rule = summarize_by_rule(recommendations)
+    st.subheader("🎯 Top Recommendations")
+    if recommendations_error is not None:
+        st.error(f"Could not compute recommendations: {recommendations_error}")
+    elif not by_rule.empty:
+        st.dataframe(
+            by_rule[['Severity', 'Category', 'Recommendation', 'Models', 'Estimated Impact (Credits)', 'Examples']],
+            column_config={
+                'Estimated Impact (Credits)': st.column_config.NumberColumn(
+                    'Estimated Impact (Credits)', format="%.2f",
+                    help="Credits over the last 30 days of the flagged models, times the share the rule expects to save.",
+                ),
+            },
+            hide_index=True,
+        )
     else:
-        st.write("- No cost data to summarize.")
+        st.success("No recommendations: every rule passed.")
 
-    # Usage Summary
-    st.subheader("📊 Usage Insights")
-    if not usage_data.empty:
-        num_queries = len(usage_data)
-        num_users = usage_data['User'].nunique()
-        st.write(f"- There were **{num_queries} queries** by **{num_users} unique users** in the last 7 days.")
-        if not top_models.empty: # Check if top_models is not None and not empty
-             st.write(f"- The most queried model is **{top_models.iloc[0]['Data Model']}** with {top_models.iloc[0]['Query Count']} queries. Ensure this model is performant and up-to-date.")
-    else:
-        st.write("- No usage data to summarize.")
+    for category, icon in CATEGORIES:
+        st.subheader(f"{icon} {category} Insights")
 
-    # Governance Summary
-    st.subheader("📜 Governance Insights")
-    if not governance_data.empty:
-        documentation_percentage = (governance_data['Has Documentation'].sum() / len(governance_data)) * 100 if len(governance_data) > 0 else 0
-        st.write(f"- **{documentation_percentage:.1f}%** of models have documentation.")
-        if documentation_percentage < 80:
-            st.warning("- Recommendation: Prioritize adding documentation (Snowflake comments) to undocumented models to improve data discoverability and understanding.")
-        else:
-            st.success("- Good job on model documentation!")
-    else:
-        st.write("- No governance data to summarize.")
+        if category == 'Cost' and not cost_monthly.empty:
+            # The last cycle is the most recent month of the rollup
+            cost_data = cost_monthly[cost_monthly['Month'] == cost_monthly['Month'].max()]
+            total_cost = cost_data['Materialization Cost (Credits)'].sum()
+            most_expensive_model = cost_data.loc[cost_data['Materialization Cost (Credits)'].idxmax()]
+            st.write(f"- The total estimated materialization cost for the last cycle was **{total_cost:.2f} credits**; "
+                     f"**{most_expensive_model['Data Model']}** was the most expensive model ({most_expensive_model['Materialization Cost (Credits)']} credits).")
+        if category == 'Usage' and not usage_totals.empty and usage_totals['Total Queries'].iloc[0] > 0:
+            num_queries = int(usage_totals['Total Queries'].iloc[0])
+            num_users = int(usage_totals['Unique Users'].iloc[0])
+            st.write(f"- There were **{num_queries} queries** by **{num_users} unique users** in the last 7 days.")
+            if not top_models.empty:
+                st.write(f"- The most queried model is **{top_models.iloc[0]['Data Model']}** with {top_models.iloc[0]['Query Count']} queries.")
+        if category == 'Quality' and not quality_data.empty:
+            avg_age = ((datetime.now() - pd.to_datetime(quality_data['Last Refreshed'])) / pd.Timedelta(hours=1)).mean()
+            st.write(f"- The average data age across models is **{avg_age:.1f} hours**.")
+        if category == 'Governance' and not governance_data.empty:
+            st.write(f"- **{governance_data['Has Documentation'].mean() * 100:.1f}%** of models have documentation.")
 
-    # Performance Summary
-    st.subheader("⚡ Performance Insights")
-    if not performance_data.empty:
-        pruning_issues_count = len(performance_data[performance_data['Poor Partition Pruning']])
-        spilling_issues_count = len(performance_data[performance_data['Disk Spilling Occurrences (Last 24h)'] > 0])
-        if pruning_issues_count > 0:
-            st.write(f"- **{pruning_issues_count} model(s)** show signs of poor partition pruning. Investigate query patterns and table clustering for these models.")
-        if spilling_issues_count > 0:
-            st.write(f"- **{spilling_issues_count} model(s)** experienced disk spilling. This can indicate queries processing large volumes of data inefficiently. Review query logic and consider warehouse scaling if appropriate.")
-        if pruning_issues_count == 0 and spilling_issues_count == 0:
-            st.success("- No major performance red flags (partition pruning, disk spilling) detected.")
-    else:
-        st.write("- No performance data to summarize.")
-
-    # Quality Summary
-    st.subheader("✅ Quality Insights")
-    if not quality_data.empty:
-        avg_freshness = quality_data['Hours Since Last Refresh'].mean() if 'Hours Since Last Refresh' in quality_data else 0
-        stale_models_count = len(quality_data[quality_data['Hours Since Last Refresh'] > 24]) if 'Hours Since Last Refresh' in quality_data and not quality_data[quality_data['Hours Since Last Refresh'] > 24].empty else 0
-        st.write(f"- The average data age across models is **{avg_freshness:.1f} hours**.")
-        if stale_models_count > 0:
-            st.warning(f"- **{stale_models_count} model(s)** are potentially stale (refreshed more than 24 hours ago). Verify their refresh schedules and investigate any failures.")
-        else:
-            st.success("- Data freshness appears to be good across models.")
-    else:
-        st.write("- No quality data to summarize.")
+        if recommendations_error is not None:
+            continue
+        fired = by_rule[by_rule['Category'] == category]
+        if fired.empty:
+            st.success(f"- No {category.lower()} issues flagged.")
+        for rule in fired.to_dict('records'):
+            models = f"**{rule['Models']} model(s)** ({rule['Examples']}{', …' if rule['Models'] > 3 else ''})" if rule['Examples'] else "Schema-wide"
+            impact = rule['Estimated Impact (Credits)']
+            impact = f" Estimated impact: {impact:.2f} credits." if impact else ""
+            SEVERITY_MESSAGES[rule['Severity']](f"{models}: {rule['Recommendation']}{impact}")
 
     st.markdown("---")
     st.info("Remember: These are automated observations on mock data. Always combine with domain knowledge and specific investigations.")
-
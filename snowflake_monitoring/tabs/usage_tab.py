@@ -1,48 +1,50 @@
 import streamlit as st
-import altair as alt
-import pandas as pd
 
-def display_usage_tab(usage_data, selected_schema):
+from tabs.charts import bar_chart, line_chart
+from tabs.pagination import display_paginated_table
+
+def display_usage_tab(usage_totals, queries_by_day, top_models, recent_queries, selected_schema, query_log_pager=None):
+    """Renders the usage tab from pre-aggregated frames.
+
+    The raw query log is only browsed, a page at a time through
+    query_log_pager, when the user asks for the drill-down.
+    """
     st.header("Schema Usage Insights")
     st.markdown("How data models within this schema are being consumed.")
 
-    if not usage_data.empty:
-        num_queries = len(usage_data)
-        num_users = usage_data['User'].nunique()
+    if not usage_totals.empty and usage_totals['Total Queries'].iloc[0] > 0:
+        num_queries = int(usage_totals['Total Queries'].iloc[0])
+        num_users = int(usage_totals['Unique Users'].iloc[0])
         
         col1, col2 = st.columns(2)
         col1.metric("Total Queries (Last 7 Days)", num_queries)
         col2.metric("Unique Users (Last 7 Days)", num_users)
         
         st.subheader("Queries Over Time (Last 7 Days)")
-        usage_data['Timestamp'] = pd.to_datetime(usage_data['Timestamp'])
-        queries_by_day = usage_data.set_index('Timestamp').resample('D')['Data Model Queried'].count().reset_index()
-        queries_by_day.columns = ['Date', 'Number of Queries']
-
-        time_chart = alt.Chart(queries_by_day).mark_line(point=True).encode(
-            x=alt.X('Date:T', title='Date'),
-            y=alt.Y('Number of Queries:Q', title='Number of Queries'),
-            tooltip=['Date', 'Number of Queries']
-        ).properties(
-            title="Daily Query Volume"
+        # Days without queries are missing from the aggregate; show them as zero
+        queries_by_day = (
+            queries_by_day.set_index('Date')['Number of Queries']
+            .asfreq('D', fill_value=0)
+            .reset_index()
         )
+
+        time_chart = line_chart(queries_by_day, 'Date', 'Number of Queries', title="Daily Query Volume", point=True)
         st.altair_chart(time_chart, use_container_width=True)
 
         st.subheader("Top Queried Data Models")
-        top_models = usage_data['Data Model Queried'].value_counts().nlargest(5).reset_index()
-        top_models.columns = ['Data Model', 'Query Count']
-        model_chart = alt.Chart(top_models).mark_bar().encode(
-            x=alt.X('Data Model:N', sort='-y'),
-            y=alt.Y('Query Count:Q'),
-            tooltip=['Data Model', 'Query Count']
-        ).properties(
-            title="Most Frequently Queried Models"
-        )
+        model_chart = bar_chart(top_models, 'Data Model', 'Query Count', title="Most Frequently Queried Models")
         st.altair_chart(model_chart, use_container_width=True)
 
         st.subheader("Recent Query Log (Sample)")
-        st.dataframe(usage_data.head(10), height=300)
-        return top_models # Return top_models for summary tab
+        st.dataframe(recent_queries, height=300)
+
+        if query_log_pager is not None and st.toggle("Browse full query log (Last 7 Days)", key="usage_full_log"):
+            display_paginated_table(
+                "usage_log",
+                query_log_pager,
+                ['Timestamp', 'User', 'Data Model Queried', 'Query Type'],
+                descending=True,
+                filter_columns=['User', 'Data Model Queried', 'Query Type'],
+            )
     else:
         st.warning("No usage data available.")
-        return pd.DataFrame() # Return empty DataFrame if no data
@@ -0,0 +1,28 @@
+import os
+import sys
+
+import pytest
+
+# The app uses flat imports from snowflake_monitoring/, as when run with `streamlit run`
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+STORE_ENV_VARS = [
+    "SNOWFLAKE_MONITORING_CATALOG_DIR",
+    "SNOWFLAKE_MONITORING_COST_HISTORY_DIR",
+    "SNOWFLAKE_MONITORING_QUERY_LOG_DIR",
+    "SNOWFLAKE_MONITORING_SNAPSHOT_DIR",
+    "SNOWFLAKE_MONITORING_RULES",
+    "SNOWFLAKE_MONITORING_FRESHNESS",
+    "SNOWFLAKE_MONITORING_PROFILE",
+]
+
+
+@pytest.fixture
+def isolated_env(tmp_path, monkeypatch):
+    """Keeps the on-disk stores in a per-test directory and the optional ones disabled."""
+    for name in STORE_ENV_VARS:
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setenv("SNOWFLAKE_MONITORING_CATALOG_DIR", str(tmp_path / "catalog"))
+    monkeypatch.setenv("SNOWFLAKE_MONITORING_COST_HISTORY_DIR", str(tmp_path / "cost_history"))
+    return tmp_path
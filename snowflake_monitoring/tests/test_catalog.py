@@ -0,0 +1,104 @@
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from catalog import CATALOG_COLUMNS, CatalogIndex, split_qualified
+
+
+def catalog_rows(*tables):
+    return pd.DataFrame([
+        {'Database': database, 'Schema': schema, 'Data Model': name, 'Comment': comment, 'Owner': owner,
+         'Last Altered': pd.Timestamp(datetime.now()), 'Source System': 'source_X'}
+        for database, schema, name, comment, owner in tables
+    ], columns=CATALOG_COLUMNS)
+
+
+class StubCatalogSource:
+    def __init__(self, tables):
+        self.tables = tables
+        self.requests = []
+
+    def fetch_catalog(self, since=None):
+        self.requests.append(since)
+        return self.tables.copy()
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    index = CatalogIndex(str(tmp_path), min_refresh_interval=0)
+    index.refresh(StubCatalogSource(catalog_rows(
+        ('ANALYTICS', 'PUBLIC', 'orders', 'Orders', 'owner_a'),
+        ('ANALYTICS', 'SALES_RAW', 'leads', None, 'owner_b'),
+        ('RAW', 'PUBLIC', 'events', None, 'owner_c'),
+        ('RAW', 'PUBLIC', 'sessions', 'Sessions', 'owner_c'),
+    )), force=True)
+    return index
+
+
+def test_schemas_with_the_same_name_stay_apart(catalog):
+    assert catalog.schemas() == ['ANALYTICS.PUBLIC', 'ANALYTICS.SALES_RAW', 'RAW.PUBLIC']
+    assert catalog.governance('ANALYTICS.PUBLIC')['Data Model'].tolist() == ['orders']
+    assert catalog.governance('RAW.PUBLIC')['Data Model'].tolist() == ['events', 'sessions']
+    assert catalog.quality('RAW.PUBLIC')['Data Model'].tolist() == ['events', 'sessions']
+
+
+def test_compare_tables_reports_qualified_schemas(catalog):
+    tables = catalog.compare_tables(['ANALYTICS.PUBLIC', 'RAW.PUBLIC'])
+
+    assert tables.groupby('Schema').size().to_dict() == {'ANALYTICS.PUBLIC': 1, 'RAW.PUBLIC': 2}
+
+
+@pytest.mark.parametrize('indexed', [False, True])
+def test_unindexed_schemas_give_empty_frames(catalog, tmp_path, indexed):
+    index = catalog if indexed else CatalogIndex(str(tmp_path / 'empty'))
+
+    assert index.compare_tables(['X.Y']).empty
+    assert index.governance('X.Y').empty
+    assert index.quality('X.Y').empty
+
+
+def test_search_matches_qualified_and_bare_schema_names(catalog):
+    assert catalog.search('raw.') == ['RAW.PUBLIC']
+    assert catalog.search('public') == ['ANALYTICS.PUBLIC', 'RAW.PUBLIC']
+    assert catalog.search('sales') == ['ANALYTICS.SALES_RAW']
+    # Substring: 'raw' is also inside SALES_RAW
+    assert catalog.search('raw') == ['RAW.PUBLIC', 'ANALYTICS.SALES_RAW']
+    assert catalog.search('pubilc') == ['ANALYTICS.PUBLIC', 'RAW.PUBLIC']
+    assert catalog.search('public', limit=1) == ['ANALYTICS.PUBLIC']
+
+
+def test_unthrottled_refresh_is_incremental(tmp_path):
+    source = StubCatalogSource(catalog_rows(('ANALYTICS', 'PUBLIC', 'orders', 'Orders', 'owner_a')))
+    index = CatalogIndex(str(tmp_path))
+    index.refresh(source)
+    index.refresh(source)
+    assert source.requests == [None]
+
+    source.tables = catalog_rows(('ANALYTICS', 'PUBLIC', 'orders', None, 'owner_b'))
+    index.refresh(source, throttle=False)
+
+    assert len(source.requests) == 2 and source.requests[1] is not None
+    assert index.governance('ANALYTICS.PUBLIC')['Owner'].tolist() == ['owner_b']
+
+
+def test_reload_picks_up_an_index_saved_by_another_process(catalog, tmp_path):
+    reader = CatalogIndex(str(tmp_path))
+    assert not reader.reload()
+
+    catalog.refresh(StubCatalogSource(catalog_rows(('NEW', 'PUBLIC', 'orders', None, 'owner_a'))), force=True)
+
+    assert reader.reload()
+    assert reader.schemas() == ['NEW.PUBLIC']
+
+
+def test_index_survives_a_restart(catalog, tmp_path):
+    reopened = CatalogIndex(str(tmp_path))
+
+    assert reopened.schemas() == catalog.schemas()
+
+
+def test_split_qualified_rejects_bare_names():
+    assert split_qualified('RAW.PUBLIC') == ('RAW', 'PUBLIC')
+    with pytest.raises(ValueError):
+        split_qualified('PUBLIC')
@@ -0,0 +1,75 @@
+import altair as alt
+import numpy as np
+import pandas as pd
+import pytest
+
+from tabs.charts import MAX_CHART_ROWS, bar_chart, line_chart, lttb, top_n_with_other
+
+
+def embedded_rows(chart):
+    """Rows of data embedded in a chart spec, across its layers."""
+    if isinstance(chart, alt.LayerChart):
+        return sum(embedded_rows(layer) for layer in chart.layer)
+    return len(chart.data)
+
+
+def series(n, models=1, seed=0):
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range('2026-01-01', periods=n, freq='min')
+    return pd.DataFrame({
+        'Date': np.tile(dates, models),
+        'Model': np.repeat([f"model_{i}" for i in range(models)], n),
+        'Queries': rng.integers(0, 100, n * models),
+        'Anomaly': rng.random(n * models) < 0.05,
+    })
+
+
+# --- Reduction ---
+
+def test_lttb_keeps_threshold_rows_with_the_ends_and_peaks():
+    df = series(10_000)
+    df.loc[5_000, 'Queries'] = 10_000
+
+    sampled = lttb(df, 'Date', 'Queries', 500)
+
+    assert len(sampled) == 500
+    assert sampled['Date'].is_monotonic_increasing
+    assert sampled['Date'].iloc[0] == df['Date'].iloc[0] and sampled['Date'].iloc[-1] == df['Date'].iloc[-1]
+    assert sampled['Queries'].max() == 10_000
+
+
+def test_lttb_leaves_short_series_alone():
+    df = series(100)
+    assert len(lttb(df, 'Date', 'Queries', MAX_CHART_ROWS)) == 100
+
+
+def test_top_n_with_other_folds_the_rest_into_one_row():
+    df = pd.DataFrame({'Model': [f"m{i}" for i in range(5_000)], 'Credits': np.arange(5_000, dtype=float)})
+
+    top = top_n_with_other(df, 'Model', 'Credits', n=20)
+
+    assert len(top) == 21
+    assert list(top['Model'][:3]) == ['m4999', 'm4998', 'm4997']
+    assert top['Model'].iloc[-1] == "Other (4,980 more)"
+    assert top['Credits'].sum() == df['Credits'].sum()
+
+
+# --- Charts ---
+
+@pytest.mark.parametrize('models', [1, 30])
+def test_line_chart_stays_within_max_chart_rows(models):
+    df = series(20_000, models=models)
+
+    chart = line_chart(df, 'Date', 'Queries', color='Model' if models > 1 else None, highlight='Anomaly')
+
+    assert embedded_rows(chart) <= MAX_CHART_ROWS
+
+
+def test_bar_chart_stays_within_max_chart_rows():
+    df = pd.DataFrame({'Model': [f"m{i}" for i in range(5_000)], 'Credits': np.arange(5_000, dtype=float)})
+    assert embedded_rows(bar_chart(df, 'Model', 'Credits', top_n=5_000)) <= MAX_CHART_ROWS
+
+
+def test_cached_charts_are_reused_without_copying():
+    df = series(2_000)
+    assert line_chart(df, 'Date', 'Queries') is line_chart(df.copy(), 'Date', 'Queries')
@@ -0,0 +1,134 @@
+import os
+from datetime import datetime
+
+import pandas as pd
+
+from cost_history import ANOMALY_WINDOW, COST_COLUMN, CostHistoryStore, flag_anomalies
+
+TODAY = pd.Timestamp(datetime.now()).normalize()
+
+
+class StubCostSource:
+    """Per-model daily credits; `days` can be changed between updates to simulate new data."""
+
+    def __init__(self, days=None):
+        self.days = {} if days is None else days
+        self.requests = []
+
+    def fetch_daily_costs_since(self, selected_schema, since):
+        self.requests.append(pd.Timestamp(since))
+        rows = [
+            {'Date': date, 'Data Model': model, COST_COLUMN: credits}
+            for (date, model), credits in sorted(self.days.items())
+            if date >= pd.Timestamp(since)
+        ]
+        return pd.DataFrame(rows, columns=['Date', 'Data Model', COST_COLUMN])
+
+
+def store_at(tmp_path, **kwargs):
+    return CostHistoryStore(str(tmp_path), min_update_interval=0, **kwargs)
+
+
+def daily(store, month):
+    return pd.read_parquet(store._daily_path('S', month))
+
+
+def series(store, resolution):
+    return pd.read_parquet(store._series_path('S', resolution))
+
+
+# --- Incremental Updates ---
+
+def test_partial_newest_day_is_replaced_not_duplicated(tmp_path):
+    store = store_at(tmp_path)
+    yesterday = TODAY - pd.Timedelta(days=1)
+    source = StubCostSource({(yesterday, 'model_A'): 10.0, (TODAY, 'model_A'): 5.0})
+    assert store.update(source, 'S') == 2
+
+    # Later in the day the run finishes and a second model materializes
+    source.days.update({(TODAY, 'model_A'): 12.0, (TODAY, 'model_B'): 3.0})
+    assert store.update(source, 'S') == 2
+    assert source.requests[-1] == TODAY
+
+    days = pd.concat([daily(store, month) for month in {yesterday.replace(day=1), TODAY.replace(day=1)}])
+    assert sorted(days.itertuples(index=False, name=None)) == [
+        (yesterday, 'model_A', 10.0), (TODAY, 'model_A', 12.0), (TODAY, 'model_B', 3.0),
+    ]
+    monthly = series(store, 'month')
+    assert monthly[COST_COLUMN].sum() == 25.0
+    assert store.watermark('S') == TODAY
+
+
+def test_week_spanning_a_month_boundary_sums_both_months(tmp_path):
+    # The most recent month start that falls mid-week
+    month_start = TODAY.replace(day=1)
+    while month_start.dayofweek == 0:
+        month_start = (month_start - pd.DateOffset(months=1)).replace(day=1)
+    week_start = month_start - pd.Timedelta(days=month_start.dayofweek)
+
+    store = store_at(tmp_path)
+    source = StubCostSource({(day, 'model_A'): 1.0 for day in pd.date_range(week_start, month_start - pd.Timedelta(days=1))})
+    store.update(source, 'S')
+    source.days.update({(day, 'model_A'): 1.0 for day in pd.date_range(month_start, week_start + pd.Timedelta(days=6))})
+    store.update(source, 'S')
+
+    weekly = series(store, 'week').set_index('Period')[COST_COLUMN]
+    assert weekly[week_start] == 7.0
+    monthly = series(store, 'month').set_index('Period')[COST_COLUMN]
+    assert monthly[month_start] == 7 - month_start.dayofweek
+
+
+def test_months_past_retention_are_pruned(tmp_path):
+    store = store_at(tmp_path, retention_months=3)
+    old_month = (TODAY - pd.DateOffset(months=6)).replace(day=1)
+    store._write(store._daily_path('S', old_month),
+                 pd.DataFrame({'Date': [old_month], 'Data Model': ['model_A'], COST_COLUMN: [1.0]}))
+    store._write(store._series_path('S', 'month'),
+                 pd.DataFrame({'Period': [old_month], 'Data Model': ['model_A'], COST_COLUMN: [1.0], 'Anomaly': [False]}))
+
+    store.update(StubCostSource({(TODAY, 'model_A'): 2.0}), 'S')
+
+    assert not os.path.exists(store._daily_path('S', old_month))
+    monthly = series(store, 'month')
+    assert list(monthly['Period']) == [TODAY.replace(day=1)]
+    assert store.trend('S', months=12)[0]['Period'].min() >= TODAY - pd.DateOffset(months=12)
+
+
+# --- Anomalies ---
+
+def periods(model, costs):
+    return pd.DataFrame({
+        'Period': pd.date_range('2025-01-01', periods=len(costs), freq='MS'),
+        'Data Model': model,
+        COST_COLUMN: costs,
+    })
+
+
+def test_spike_over_the_trailing_window_is_flagged():
+    flagged = flag_anomalies(periods('model_A', [10, 11, 9, 10, 11, 10, 60, 10]), 'Period')
+
+    assert flagged['Anomaly'].tolist() == [False] * 6 + [True, False]
+
+
+def test_first_periods_are_never_flagged():
+    # Fewer than three earlier periods is not enough history to judge
+    flagged = flag_anomalies(periods('model_A', [1, 50, 500, 5000]), 'Period')
+
+    assert flagged['Anomaly'].tolist() == [False, False, False, True]
+
+
+def test_window_only_looks_back_anomaly_window_periods():
+    # An old spike drops out of the window, so a later, smaller spike stands out again
+    costs = [10, 10, 10, 200] + [10] * ANOMALY_WINDOW + [60]
+    flagged = flag_anomalies(periods('model_A', costs), 'Period')
+
+    assert flagged['Anomaly'].tolist()[-1]
+    assert flagged['Anomaly'].sum() == 2
+
+
+def test_models_are_judged_on_their_own_history():
+    frame = pd.concat([periods('model_A', [100] * 7), periods('model_B', [10, 11, 9, 10, 11, 10, 100])])
+    flagged = flag_anomalies(frame, 'Period').set_index(['Data Model', 'Period'])['Anomaly']
+
+    assert not flagged['model_A'].any()
+    assert flagged['model_B'].iloc[-1]
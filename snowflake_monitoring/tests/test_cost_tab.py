@@ -0,0 +1,39 @@
+import pandas as pd
+
+from tabs.comparison_tab import compute_schema_comparison
+from tabs.cost_tab import month_to_date_change
+
+EMPTY = pd.DataFrame()
+
+
+def daily(credits_by_date):
+    return pd.DataFrame({
+        'Date': pd.to_datetime(list(credits_by_date)),
+        'Data Model': 'orders',
+        'Materialization Cost (Credits)': list(credits_by_date.values()),
+    })
+
+
+def test_month_to_date_compares_the_same_days_of_the_previous_month():
+    cost_daily = daily({'2026-02-01': 1.0, '2026-02-03': 2.0, '2026-02-04': 50.0, '2026-03-01': 1.0, '2026-03-03': 4.0})
+
+    assert month_to_date_change(cost_daily, today='2026-03-03') == (5.0, 3.0)
+
+
+def test_month_to_date_clamps_to_the_end_of_a_shorter_month():
+    cost_daily = daily({'2026-02-28': 2.0, '2026-03-01': 9.0, '2026-03-31': 1.0})
+
+    assert month_to_date_change(cost_daily, today='2026-03-31') == (10.0, 2.0)
+
+
+def test_comparison_month_over_month_skips_the_partial_month():
+    compare_cost = pd.DataFrame({
+        'Schema': 'A.S',
+        'Month': pd.to_datetime(['2026-01-01', '2026-02-01', '2026-03-01']),
+        'Materialization Cost (Credits)': [100.0, 150.0, 5.0],
+    })
+
+    comparison = compute_schema_comparison(compare_cost, EMPTY, EMPTY, ['A.S'], today=pd.Timestamp('2026-03-03'))
+
+    assert comparison['Month-over-Month (%)'].tolist() == [50.0]
+    assert comparison['Credits (Latest Month)'].tolist() == [5.0]
@@ -0,0 +1,188 @@
+import threading
+from collections import Counter
+
+import pandas as pd
+import pytest
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+import dashboard_data
+import result_cache
+from dashboard_data import DERIVED_DATASETS, DashboardData
+from data_sources import SQLiteSource
+from result_cache import ResultCache
+from tabs.pagination import FramePager
+
+APP = f"{dashboard_data.__file__.rsplit('/', 1)[0]}/snowflake_dashboard.py"
+
+
+def counting(loaders, calls):
+    lock = threading.Lock()
+
+    def wrap(name, loader):
+        def load(*args):
+            with lock:
+                calls[name] += 1
+            return loader(*args)
+        return load
+
+    return {name: wrap(name, loader) for name, loader in loaders.items()}
+
+
+# --- DashboardData ---
+
+def test_each_dataset_loads_once_however_often_it_is_read():
+    calls = Counter()
+    data = DashboardData("ANALYTICS.SALES_RAW", loaders=counting(dashboard_data.DATASET_LOADERS, calls))
+    data.prefetch(['cost_monthly', 'governance', 'quality'])
+    for _ in range(3):
+        data.cost_monthly, data.governance, data.quality, data.top_models
+
+    assert calls == Counter({'cost_monthly': 1, 'governance': 1, 'quality': 1, 'usage_top_models': 1})
+
+
+def test_derived_dataset_reuses_the_frames_already_loaded():
+    calls = Counter()
+    data = DashboardData("ANALYTICS.SALES_RAW", loaders=counting(dashboard_data.DATASET_LOADERS, calls))
+    inputs, _ = DERIVED_DATASETS['recommendations']
+    data.prefetch(inputs)
+    data.recommendations
+    data.recommendations
+
+    assert calls == Counter({name: 1 for name in inputs})
+
+
+def test_failed_load_is_recorded_and_reads_as_empty():
+    def broken(selected_schema):
+        raise RuntimeError("warehouse down")
+
+    data = DashboardData("ANALYTICS.SALES_RAW", loaders={'governance': broken})
+    data.prefetch(['governance'])
+
+    assert data.failed('governance')
+    assert data.governance.empty
+
+
+# --- Pages ---
+
+class StubPageBackend:
+    def __init__(self):
+        self.pages = 0
+
+    def count_rows(self, dataset, selected_schema, filters=None):
+        return 1000
+
+    def fetch_page(self, dataset, selected_schema, sort, descending=False, filters=None, offset=0, limit=50):
+        self.pages += 1
+        return pd.DataFrame({'Row': range(offset, offset + limit)})
+
+
+def test_paging_does_not_evict_cached_datasets():
+    cache, page_cache = ResultCache(max_entries=4), ResultCache(max_entries=4)
+    data = DashboardData("ANALYTICS.SALES_RAW", cache=cache, page_cache=page_cache)
+    data.prefetch(['governance', 'quality'])
+    backend = StubPageBackend()
+    pager = data.pager('usage', backend)
+    for offset in range(0, 1000, 50):
+        pager.page('Row', offset=offset)
+    pager.page('Row', offset=950)
+
+    assert cache.stats()['entries'] == 2 and cache.stats()['evictions'] == 0
+    assert page_cache.stats()['entries'] == 4
+    assert backend.pages == 20
+
+
+@pytest.fixture(scope='module')
+def paged_source():
+    return SQLiteSource(name="test_paged_filters", schemas=["ANALYTICS.SALES_RAW"])
+
+
+@pytest.mark.parametrize('dataset, filters', [
+    ('performance', {'Poor Partition Pruning': ('==', True)}),
+    ('performance', {'Disk Spilling Occurrences (Last 24h)': ('>', 0)}),
+    ('performance', {'Disk Spilling Occurrences (Last 24h)': ('>', 0), 'Data Model': 'fct'}),
+])
+def test_source_and_frame_pagers_filter_alike(paged_source, dataset, filters):
+    frame = FramePager(paged_source.load(dataset, "ANALYTICS.SALES_RAW"))
+    count = paged_source.count_rows(dataset, "ANALYTICS.SALES_RAW", filters)
+    page = paged_source.fetch_page(dataset, "ANALYTICS.SALES_RAW", 'Data Model', filters=filters, limit=1000)
+
+    assert count == frame.count(filters) == len(page)
+    assert list(page['Data Model']) == list(frame.page('Data Model', filters=filters, limit=1000)['Data Model'])
+
+
+def test_unknown_filter_operator_is_rejected(paged_source):
+    with pytest.raises(ValueError, match="operator"):
+        paged_source.count_rows('performance', "ANALYTICS.SALES_RAW", {'Avg Query Duration (s)': ('LIKE', 1)})
+
+
+# --- Dashboard Reruns ---
+
+@pytest.fixture
+def app_calls(isolated_env, monkeypatch):
+    """Counts loader calls made by the dashboard, with the result cache disabled.
+
+    With every cache entry expiring immediately, each rerun has to load its
+    datasets again, so the counts show how often a rerun loads each one.
+    """
+    calls = Counter()
+    monkeypatch.setattr(result_cache, 'DEFAULT_TTLS', {})
+    monkeypatch.setattr(result_cache, 'DEFAULT_TTL', 0)
+
+    class CountingDashboardData(DashboardData):
+        def __init__(self, selected_schema, loaders=None, **kwargs):
+            super().__init__(selected_schema, loaders=counting(loaders or dashboard_data.DATASET_LOADERS, calls), **kwargs)
+
+    monkeypatch.setattr(dashboard_data, 'DashboardData', CountingDashboardData)
+    st.cache_resource.clear()
+    yield calls
+    st.cache_resource.clear()
+
+
+# Datasets each view needs; nothing else should be loaded
+VIEW_DATASETS = {
+    "💰 Cost": ['cost_monthly', 'cost_daily'],
+    "📊 Usage": ['usage_totals', 'usage_daily', 'usage_top_models', 'usage_recent'],
+    "📜 Governance": ['governance'],
+    "⚡ Performance": [],
+    "✅ Quality": ['quality'],
+    "📝 Summary & Recommendations": [
+        'cost_monthly', 'cost_daily', 'usage_totals', 'usage_top_models', 'usage_by_model',
+        'governance', 'performance', 'quality',
+    ],
+}
+
+
+@pytest.mark.parametrize("view", list(VIEW_DATASETS))
+def test_each_loader_runs_once_per_rerun(app_calls, view):
+    at = AppTest.from_file(APP, default_timeout=120)
+    at.run()
+    at.radio(key="active_view").set_value(view)
+
+    for _ in range(2):
+        app_calls.clear()
+        at.run()
+        assert not at.exception
+        assert app_calls == Counter({name: 1 for name in VIEW_DATASETS[view]})
+
+
+def test_summary_reports_a_failed_recommendations_input(isolated_env, monkeypatch):
+    def broken(selected_schema):
+        raise RuntimeError("warehouse down")
+
+    class FailingPerformance(DashboardData):
+        def __init__(self, selected_schema, loaders=None, **kwargs):
+            super().__init__(selected_schema, loaders={**(loaders or dashboard_data.DATASET_LOADERS), 'performance': broken}, **kwargs)
+
+    monkeypatch.setattr(dashboard_data, 'DashboardData', FailingPerformance)
+    st.cache_resource.clear()
+    at = AppTest.from_file(APP, default_timeout=120)
+    at.run()
+    at.radio(key="active_view").set_value("📝 Summary & Recommendations").run()
+    st.cache_resource.clear()
+
+    assert not at.exception
+    assert any("Could not compute recommendations" in error.value and "performance" in error.value for error in at.error)
+    assert not at.success
+    # The headline metrics whose datasets loaded are still shown
+    assert any("unique users" in markdown.value for markdown in at.markdown)
@@ -0,0 +1,27 @@
+from datetime import datetime, timezone
+
+import pandas as pd
+import pytest
+
+from data_sources import _coerce_types
+
+
+@pytest.mark.parametrize('column', [
+    # A connector may hand back aware datetime objects or an aware datetime64 column
+    lambda stamps: stamps,
+    lambda stamps: pd.Series(stamps).astype('datetime64[ns, UTC]'),
+])
+def test_tz_aware_timestamps_become_naive_local_time(column):
+    utc = datetime(2026, 3, 1, 12, 0, tzinfo=timezone.utc)
+    df = _coerce_types(pd.DataFrame({'Last Refreshed': column([utc, None])}))
+
+    assert df['Last Refreshed'].dt.tz is None
+    assert df['Last Refreshed'].iloc[0] == pd.Timestamp(utc.astimezone().replace(tzinfo=None))
+    # Comparable with the naive datetime.now() the tabs use
+    assert (datetime.now() - df['Last Refreshed']).notna().iloc[0]
+
+
+def test_naive_timestamps_are_parsed_unchanged():
+    df = _coerce_types(pd.DataFrame({'Timestamp': ['2026-03-01T12:00:00', '2026-03-01 13:30:00.123']}))
+
+    assert df['Timestamp'].tolist() == [pd.Timestamp('2026-03-01 12:00'), pd.Timestamp('2026-03-01 13:30:00.123')]
@@ -0,0 +1,48 @@
+import json
+from datetime import datetime, timedelta
+
+import pandas as pd
+import pytest
+
+from tabs.quality_tab import FRESH, FRESHNESS_FILE_ENV, STALE, WARNING, compute_freshness, load_freshness_thresholds
+
+NOW = datetime(2026, 3, 1, 12, 0)
+
+
+def quality(*models):
+    return pd.DataFrame([
+        {'Data Model': name, 'Last Refreshed': NOW - timedelta(hours=hours), 'Source System': source}
+        for name, hours, source in models
+    ])
+
+
+def write_thresholds(tmp_path, thresholds):
+    path = tmp_path / 'freshness.json'
+    path.write_text(json.dumps(thresholds))
+    return str(path)
+
+
+def test_freshness_returns_a_new_frame():
+    quality_data = quality(('orders', 5, 'source_X'))
+    columns = list(quality_data.columns)
+
+    freshness = compute_freshness(quality_data, now=NOW, thresholds={})
+
+    assert list(quality_data.columns) == columns
+    assert freshness['Hours Since Last Refresh'].tolist() == [5.0]
+
+
+def test_thresholds_file_overrides_per_source(isolated_env, monkeypatch):
+    monkeypatch.setenv(FRESHNESS_FILE_ENV, write_thresholds(isolated_env, {'feed': [2, 4]}))
+    quality_data = quality(('orders', 3, 'feed'), ('events', 5, 'feed'), ('leads', 5, 'source_X'))
+
+    freshness = compute_freshness(quality_data, now=NOW)
+
+    assert freshness['Freshness'].tolist() == [WARNING, STALE, FRESH]
+
+
+@pytest.mark.parametrize('value', [[6, 2], [2], "2,6", [2, "6"], [True, 6]])
+def test_invalid_thresholds_are_reported_by_source(tmp_path, value):
+    path = write_thresholds(tmp_path, {'feed': value})
+    with pytest.raises(ValueError, match="'feed'"):
+        load_freshness_thresholds(path)
@@ -0,0 +1,70 @@
+from datetime import datetime, timedelta
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from query_log_store import INGEST_OVERLAP, QUERY_LOG_COLUMNS, QueryLogStore
+
+
+class StubSource:
+    """Serves query-log rows as they have arrived so far; rows can land late."""
+
+    def __init__(self):
+        self.rows = pd.DataFrame(columns=['Query ID', *QUERY_LOG_COLUMNS])
+        self.requests = []
+
+    def arrive(self, query_id, timestamp):
+        row = {'Query ID': query_id, 'Timestamp': timestamp, 'User': 'user_a',
+               'Data Model Queried': 'model_A', 'Query Type': 'SELECT'}
+        self.rows = pd.concat([self.rows, pd.DataFrame([row])], ignore_index=True)
+
+    def fetch_query_log_since(self, selected_schema, since):
+        self.requests.append(since)
+        rows = self.rows[pd.to_datetime(self.rows['Timestamp']) >= since].copy()
+        rows['Timestamp'] = pd.to_datetime(rows['Timestamp'])
+        return rows
+
+
+def test_late_rows_within_the_overlap_are_ingested_once(tmp_path):
+    now = datetime.now().replace(microsecond=0)
+    store = QueryLogStore(str(tmp_path), min_ingest_interval=0)
+    source = StubSource()
+    source.arrive('q1', now - timedelta(minutes=30))
+    source.arrive('q2', now - timedelta(minutes=10))
+    assert store.ingest(source, 'S') == 2
+
+    # Lands after the ingest, with the watermark's timestamp and an earlier one
+    source.arrive('q3', now - timedelta(minutes=10))
+    source.arrive('q4', now - timedelta(minutes=40))
+    assert store.ingest(source, 'S') == 2
+    assert store.ingest(source, 'S') == 0
+
+    assert source.requests[-1] == now - timedelta(minutes=10) - INGEST_OVERLAP
+    assert store.usage_totals('S')['Total Queries'][0] == 4
+
+
+def test_query_log_reads_keep_the_display_columns(tmp_path):
+    store = QueryLogStore(str(tmp_path), min_ingest_interval=0)
+    source = StubSource()
+    source.arrive('q1', datetime.now() - timedelta(minutes=5))
+    store.ingest(source, 'S')
+
+    assert list(store.query_log('S').columns) == QUERY_LOG_COLUMNS
+    assert list(store.usage_recent('S').columns) == QUERY_LOG_COLUMNS
+
+
+def test_store_without_query_ids_is_rebuilt(tmp_path):
+    now = datetime.now().replace(microsecond=0)
+    store = QueryLogStore(str(tmp_path), min_ingest_interval=0)
+    day_dir = tmp_path / "schema=S" / f"day={now:%Y-%m-%d}"
+    day_dir.mkdir(parents=True)
+    legacy = pd.DataFrame({'Timestamp': [now - timedelta(minutes=5)], 'User': ['user_a'],
+                           'Data Model Queried': ['model_A'], 'Query Type': ['SELECT']})
+    pq.write_table(pa.Table.from_pandas(legacy, preserve_index=False), day_dir / "part-0.parquet")
+    store._set_watermark('S', now - timedelta(minutes=5))
+
+    source = StubSource()
+    source.arrive('q1', now - timedelta(minutes=5))
+    assert store.ingest(source, 'S') == 1
+    assert store.usage_totals('S')['Total Queries'][0] == 1
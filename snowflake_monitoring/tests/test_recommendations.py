@@ -0,0 +1,108 @@
+import json
+
+import pandas as pd
+import pytest
+
+from recommendations import (
+    CREDITS_COLUMN, RULES, RULES_FILE_ENV, SEVERITIES, evaluate_rules, load_rules, validate_rule,
+)
+
+METRICS = pd.DataFrame({
+    'Data Model': ['a', 'b', 'c'],
+    CREDITS_COLUMN: [10.0, 0.0, 5.0],
+    'Query Count (7d)': [0, 3, 0],
+    'Owner': ['owner_a', 'owner_b', None],
+    'Has Documentation': [True, False, None],
+})
+
+
+def rule(rule_id, when, severity='medium', scope='model', impact=1.0):
+    return {
+        'id': rule_id, 'scope': scope, 'category': 'Cost', 'severity': severity,
+        'when': when, 'impact': impact, 'message': rule_id,
+    }
+
+
+def write_rules(tmp_path, rules):
+    path = tmp_path / 'rules.json'
+    path.write_text(json.dumps(rules))
+    return str(path)
+
+
+# --- Evaluation ---
+
+def test_rule_fires_only_where_all_conditions_hold():
+    rules = [rule('unused', [(CREDITS_COLUMN, '>', 0), ('Query Count (7d)', '==', 0)])]
+    fired = evaluate_rules(METRICS, rules)
+    assert sorted(fired['Data Model']) == ['a', 'c']
+    assert sorted(fired['Estimated Impact (Credits)']) == [5.0, 10.0]
+
+
+def test_rules_sharing_a_column_use_their_own_thresholds():
+    rules = [rule('over_1', [(CREDITS_COLUMN, '>', 1)]), rule('over_8', [(CREDITS_COLUMN, '>', 8)])]
+    fired = evaluate_rules(METRICS, rules)
+    assert sorted(zip(fired['Rule'], fired['Data Model'])) == [('over_1', 'a'), ('over_1', 'c'), ('over_8', 'a')]
+
+
+def test_text_columns_compare_without_float_conversion():
+    rules = [rule('is_a', [('Owner', '==', 'owner_a')]), rule('not_a', [('Owner', '!=', 'owner_a')])]
+    fired = evaluate_rules(METRICS, rules)
+    # A missing owner matches neither: it is unknown, not different
+    assert sorted(zip(fired['Rule'], fired['Data Model'])) == [('is_a', 'a'), ('not_a', 'b')]
+
+
+def test_isnull_and_boolean_conditions():
+    rules = [rule('no_owner', [('Owner', 'isnull')]), rule('undocumented', [('Has Documentation', '==', False)])]
+    fired = evaluate_rules(METRICS, rules)
+    assert sorted(zip(fired['Rule'], fired['Data Model'])) == [('no_owner', 'c'), ('undocumented', 'b')]
+
+
+def test_missing_columns_never_fire():
+    fired = evaluate_rules(METRICS[['Data Model', CREDITS_COLUMN]], [rule('unused', [('Query Count (7d)', '==', 0)])])
+    assert fired.empty
+
+
+def test_severity_is_an_ordered_category():
+    fired = evaluate_rules(METRICS, [rule('unused', [('Query Count (7d)', '==', 0)], severity='high')])
+    assert list(fired['Severity'].cat.categories) == SEVERITIES
+    assert fired['Severity'].notna().all()
+
+
+# --- Loading ---
+
+def test_built_in_rules_are_valid():
+    assert all(validate_rule(built_in) == [] for built_in in RULES)
+
+
+def test_rules_file_overrides_by_id_and_adds_rules(tmp_path, monkeypatch):
+    path = write_rules(tmp_path, [
+        {'id': 'slow_queries', 'when': [['Avg Query Duration (s)', '>', 60]]},
+        rule('owned_by_a', [['Owner', '==', 'owner_a']], severity='low'),
+    ])
+    monkeypatch.setenv(RULES_FILE_ENV, path)
+    rules = {loaded['id']: loaded for loaded in load_rules()}
+    assert rules['slow_queries']['when'] == [('Avg Query Duration (s)', '>', 60)]
+    assert rules['slow_queries']['severity'] == 'low'
+    assert rules['owned_by_a']['when'] == [('Owner', '==', 'owner_a')]
+    assert len(rules) == len(RULES) + 1
+
+
+@pytest.mark.parametrize('bad_rule, problem', [
+    (rule('bad', [[CREDITS_COLUMN, '>', 0]], severity='critical'), "severity 'critical'"),
+    (rule('bad', [[CREDITS_COLUMN, '>', 0]], scope='table'), "scope 'table'"),
+    (rule('bad', [[CREDITS_COLUMN, '~', 0]]), "operator '~'"),
+    (rule('bad', [['Owner', '>', 'owner_a']]), "operator '>' can't be used on text column 'Owner'"),
+    (rule('bad', [['Owner', '==', 1]]), "'Owner' == needs a text threshold"),
+    (rule('bad', [[CREDITS_COLUMN, '>', '10']]), "needs a number threshold"),
+    (rule('bad', [['Is Stale', '==', 1]]), "needs a bool threshold"),
+    (rule('bad', [['Credits', '>', 0]]), "unknown model column 'Credits'"),
+    (rule('bad', [['Documentation Coverage (%)', '<', 80]]), "unknown model column"),
+    (rule('bad', [['Owner', 'isnull', 'x']]), "takes no threshold"),
+    (rule('bad', []), "no conditions"),
+])
+def test_invalid_rules_are_reported_by_id(tmp_path, bad_rule, problem):
+    path = write_rules(tmp_path, [bad_rule])
+    with pytest.raises(ValueError, match="rule 'bad'") as error:
+        load_rules(path)
+    assert problem in str(error.value)
+    assert path in str(error.value)
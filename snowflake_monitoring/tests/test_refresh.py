@@ -0,0 +1,52 @@
+from datetime import datetime
+
+import pandas as pd
+
+from catalog import CATALOG_COLUMNS, CatalogIndex
+from refresh import current_schemas
+
+
+class StubCatalogSource:
+    def __init__(self):
+        self.tables = pd.DataFrame(columns=CATALOG_COLUMNS)
+        self.fail = False
+
+    def add_table(self, schema, name, database='ANALYTICS'):
+        row = {'Database': database, 'Schema': schema, 'Data Model': name, 'Comment': None,
+               'Owner': 'owner_a', 'Last Altered': pd.Timestamp(datetime.now()), 'Source System': 'source_X'}
+        self.tables = pd.concat([self.tables, pd.DataFrame([row])], ignore_index=True)
+
+    def fetch_catalog(self, since=None):
+        if self.fail:
+            raise ConnectionError("warehouse down")
+        if since is None:
+            return self.tables.copy()
+        return self.tables[self.tables['Last Altered'] > since].copy()
+
+
+def test_each_round_picks_up_new_schemas(tmp_path):
+    source = StubCatalogSource()
+    source.add_table('SALES_RAW', 'orders')
+    catalog = CatalogIndex(str(tmp_path), min_refresh_interval=0)
+    assert current_schemas(catalog, source, force=True) == ['ANALYTICS.SALES_RAW']
+
+    source.add_table('NEW_SCHEMA', 'events')
+    assert current_schemas(catalog, source) == ['ANALYTICS.NEW_SCHEMA', 'ANALYTICS.SALES_RAW']
+
+
+def test_failed_catalog_refresh_keeps_the_indexed_schemas(tmp_path):
+    source = StubCatalogSource()
+    source.add_table('SALES_RAW', 'orders')
+    catalog = CatalogIndex(str(tmp_path), min_refresh_interval=0)
+    current_schemas(catalog, source, force=True)
+
+    source.fail = True
+    assert current_schemas(catalog, source) == ['ANALYTICS.SALES_RAW']
+
+
+def test_requested_schemas_take_precedence(tmp_path):
+    source = StubCatalogSource()
+    source.add_table('SALES_RAW', 'orders')
+    catalog = CatalogIndex(str(tmp_path), min_refresh_interval=0)
+
+    assert current_schemas(catalog, source, ['ANALYTICS.HR_ANALYTICS']) == ['ANALYTICS.HR_ANALYTICS']
@@ -0,0 +1,113 @@
+import threading
+import time
+
+import pandas as pd
+
+from result_cache import ResultCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def frame(value):
+    return pd.DataFrame({'value': [value]})
+
+
+def test_entries_expire_after_their_dataset_ttl():
+    clock = FakeClock()
+    cache = ResultCache(ttls={'usage': 10, 'cost': 100}, clock=clock)
+    cache.get_or_load('usage', 'S', 'live', lambda: frame(1))
+    cache.get_or_load('cost', 'S', 'live', lambda: frame(1))
+
+    clock.now = 10
+    assert cache.get_or_load('usage', 'S', 'live', lambda: frame(2))['value'][0] == 2
+    assert cache.get_or_load('cost', 'S', 'live', lambda: frame(2))['value'][0] == 1
+
+
+def test_hits_do_not_extend_the_ttl():
+    clock = FakeClock()
+    cache = ResultCache(ttls={'usage': 10}, clock=clock)
+    cache.get_or_load('usage', 'S', 'live', lambda: frame(1))
+    clock.now = 9
+    cache.get_or_load('usage', 'S', 'live', lambda: frame(2))
+
+    clock.now = 10
+    assert cache.get_or_load('usage', 'S', 'live', lambda: frame(3))['value'][0] == 3
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = ResultCache(max_entries=2)
+    cache.get_or_load('a', 'S', 'live', lambda: frame('a'))
+    cache.get_or_load('b', 'S', 'live', lambda: frame('b'))
+    cache.get_or_load('a', 'S', 'live', lambda: frame('stale'))  # 'a' is now the most recent
+    cache.get_or_load('c', 'S', 'live', lambda: frame('c'))
+
+    assert cache.stats()['evictions'] == 1
+    assert cache.get_or_load('a', 'S', 'live', lambda: frame('reloaded'))['value'][0] == 'a'
+    assert cache.get_or_load('b', 'S', 'live', lambda: frame('reloaded'))['value'][0] == 'reloaded'
+
+
+def test_version_is_part_of_the_key():
+    cache = ResultCache()
+    cache.get_or_load('cost', 'S', 'live', lambda: frame('live'))
+
+    assert cache.get_or_load('cost', 'S', 'v2', lambda: frame('snapshot'))['value'][0] == 'snapshot'
+
+
+def test_invalidate_by_dataset_and_schema():
+    cache = ResultCache()
+    for dataset in ['cost', 'usage']:
+        for schema in ['A', 'B']:
+            cache.get_or_load(dataset, schema, 'live', lambda: frame(0))
+
+    assert cache.invalidate(dataset='cost', schema='A') == 1
+    assert cache.invalidate(schema='B') == 2
+    assert cache.stats()['entries'] == 1
+    assert cache.invalidate() == 1
+
+
+def test_callers_get_copies_of_cached_frames():
+    cache = ResultCache()
+    first = cache.get_or_load('cost', 'S', 'live', lambda: frame(1))
+    first.loc[0, 'value'] = 99
+
+    assert cache.get_or_load('cost', 'S', 'live', lambda: frame(2))['value'][0] == 1
+
+
+def test_uncopied_cache_returns_the_stored_value():
+    cache = ResultCache(copy=False)
+    first = cache.get_or_load('cost', 'S', 'live', lambda: frame(1))
+
+    assert cache.get_or_load('cost', 'S', 'live', lambda: frame(2)) is first
+
+
+def test_concurrent_misses_share_one_load():
+    cache = ResultCache()
+    calls = []
+    release = threading.Event()
+
+    def slow_load():
+        calls.append(1)
+        release.wait(5)
+        return frame(1)
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(cache.get_or_load('cost', 'S', 'live', slow_load)))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.1)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(calls) == 1
+    assert len(results) == 8
+    assert cache.stats() == {'hits': 7, 'misses': 1, 'evictions': 0, 'entries': 1}